@@ -0,0 +1,47 @@
+"""太阳系模拟器的统一入口
+
+导入本包不会加载 pygame、PyOpenGL 或 NumPy：各场景在注册表中只记录模块名，
+选中某个场景时才导入对应模块，窗口和 OpenGL 上下文也只在场景的 main() 中创建。
+场景模块本身也不在导入时加载 pygame/OpenGL，而是通过 solarsim.lazy 的代理在第一次调用时导入。
+
+在仓库根目录运行 python -m solarsim，或 pip install -e . 之后在任意目录运行 solarsim：
+
+    python -m solarsim --list
+    python -m solarsim relativity
+    python -m solarsim raytrace --size 960x540
+"""
+import importlib
+import sys
+
+# 场景名 → (模块, 入口函数, 说明)
+SCENES = {
+    'simulator': ('solarsim.solar_system_simulator', 'main', "交互式太阳系模拟器"),
+    'detailed': ('solarsim.detailed_solar_system', 'main', "详细版太阳系（固定管线）"),
+    'simple': ('solarsim.simple_solar_system', 'main', "简易太阳-地球示例"),
+    'relativity': ('solarsim.relativity_black_hole', 'main', "黑洞与相对论效应"),
+    'raytrace': ('solarsim.black_hole_raytracer', 'main', "离线黑洞光线追踪"),
+    'offscreen': ('solarsim.offscreen_render', 'main', "离屏渲染动画帧"),
+    'benchmark': ('solarsim.benchmark', 'main', "性能基准"),
+    'work-precision': ('solarsim.work_precision', 'main', "积分器精度-开销基准"),
+    'catalog': ('solarsim.scenario_catalog', 'main', "解析天体目录并建立缓存"),
+    'stream': ('solarsim.state_stream', 'main', "局域网状态广播（serve / view）"),
+    'shared': ('solarsim.shared_state', 'main', "物理与渲染分进程运行"),
+    'replay': ('solarsim.input_replay', 'main', "输入录制与确定性回放"),
+    'pm': ('solarsim.pm_gravity', 'main', "PM/P3M 引力与直接求和的比较"),
+}
+
+def load(scene):
+    """导入场景模块并返回其入口函数"""
+    module_name, function, _ = SCENES[scene]
+    return getattr(importlib.import_module(module_name), function)
+
+def run(scene, args=()):
+    """运行场景；args 作为该场景自己的命令行参数"""
+    entry = load(scene)
+    # 各场景的 main() 自己解析 sys.argv，运行期间临时替换，结束后恢复调用方的参数
+    saved = sys.argv
+    sys.argv = [scene, *args]
+    try:
+        return entry()
+    finally:
+        sys.argv = saved
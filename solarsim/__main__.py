@@ -0,0 +1,19 @@
+import argparse
+import sys
+
+from solarsim import SCENES, run
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m solarsim", description="太阳系模拟器统一入口")
+    parser.add_argument('scene', nargs='?', choices=list(SCENES), default='simulator')
+    parser.add_argument('--list', action='store_true', help="列出所有场景")
+    # 场景名之后的参数原样交给场景自己的命令行解析
+    args, rest = parser.parse_known_args()
+    if args.list:
+        for name, (module, _, description) in SCENES.items():
+            print(f"{name:<16}{description}（{module}）")
+        return 0
+    return run(args.scene, rest) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import nullcontext
+
+import numpy as np
+
+# -------------------- 分阶段内存分配跟踪 --------------------
+_NULL_PHASE = nullcontext()
+# 采样帧上已跟踪内存比上次快照时至少多出这么多才重新拍快照，限制快照次数
+PEAK_STEP = 64 * 1024
+
+class _AllocPhase:
+    __slots__ = ('tracker', 'row')
+
+    def __init__(self, tracker, row):
+        self.tracker = tracker
+        self.row = row
+
+    def __enter__(self):
+        self.tracker._enter(self.row)
+        return self
+
+    def __exit__(self, *exc):
+        self.tracker._exit()
+        return False
+
+class AllocationTracker:
+    """基于 tracemalloc 的逐帧分配统计，接口与 FrameProfiler 相同，可以直接替换
+
+    每个阶段记录两个量：
+        净增   阶段结束时仍存活的字节数，存活的容器对象会累积到 GC 的第 0 代计数，引发回收卡顿
+        瞬时   阶段内的分配峰值减去起点，反映临时数组和对象的周转量
+    每帧结束时拍一次快照并与上一帧比较，按源代码行累计净增最多的分配点。
+    帧内分配又释放的临时对象不会出现在帧间的差值里，因此每 peak_every 帧采样一次：
+    用 sys.setprofile 钩子在当前（最内层）阶段的已跟踪内存创新高时拍快照，帧结束时把各阶段的
+    峰值快照与上一帧的快照比较，得到各阶段峰值时刻存活的临时分配点。
+    gc.callbacks 记录每次垃圾回收的停顿时长、代数以及发生时所在的阶段。
+    跟踪本身开销很大（采样帧上每次函数返回都会调用钩子），只用于诊断，不要在正常运行时开启。
+    """
+    def __init__(self, phases, capacity=600, enabled=False, refresh=30, depth=1, top=10, peak_every=30):
+        self.phases = list(phases)
+        self.capacity = capacity
+        self.refresh = refresh
+        self.peak_every = peak_every
+        self.depth = depth
+        self.top = top
+        self.net = np.zeros((len(self.phases), capacity))
+        self.transient = np.zeros((len(self.phases), capacity))
+        self.counts = np.zeros(len(self.phases), dtype=np.int64)
+        self._contexts = {name: _AllocPhase(self, row) for row, name in enumerate(self.phases)}
+        self._filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                         tracemalloc.Filter(False, __file__)]
+        self.enabled = False
+        if enabled:
+            self.toggle()
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._contexts[name]
+
+    def toggle(self):
+        if self.enabled:
+            self.enabled = False
+            self._disarm()
+            gc.callbacks.remove(self._on_gc)
+            tracemalloc.stop()
+            return
+        tracemalloc.start(self.depth)
+        gc.callbacks.append(self._on_gc)
+        self.enabled = True
+        self.reset()
+
+    def reset(self):
+        self.counts[:] = 0
+        self.frames = 0
+        self.stack = []            # 嵌套阶段：[行号, 起点字节数, 峰值字节数]
+        self.sites = Counter()     # 分配点 → 累计净增字节数
+        self.site_blocks = Counter()
+        self.peak_sites = Counter()  # (阶段, 分配点) → 采样帧峰值时刻存活的字节数之和
+        self.peak_frames = 0
+        self.gc_pauses = []        # (代数, 停顿秒数, 所在阶段)
+        self._gc_start = None
+        self._collecting = False
+        self._summary = []
+        self._armed = False
+        gc.disable()
+        self.snapshot = self._take_snapshot()
+        gc.enable()
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    # tracemalloc 只有一个全局峰值，嵌套阶段进入和退出时把峰值传递给外层
+    def _enter(self, row):
+        current, peak = tracemalloc.get_traced_memory()
+        if self.stack:
+            self.stack[-1][2] = max(self.stack[-1][2], peak)
+        tracemalloc.reset_peak()
+        self.stack.append([row, current, current])
+
+    def _exit(self):
+        current, peak = tracemalloc.get_traced_memory()
+        row, start, outer_peak = self.stack.pop()
+        peak = max(peak, outer_peak)
+        slot = self.counts[row] % self.capacity
+        self.net[row, slot] = current - start
+        self.transient[row, slot] = peak - start
+        self.counts[row] += 1
+        if self.stack:
+            self.stack[-1][2] = max(self.stack[-1][2], peak)
+        tracemalloc.reset_peak()
+
+    # -------------------- 帧内峰值采样 --------------------
+    def _arm(self):
+        self._overhead = 0           # 持有的峰值快照本身占用的已跟踪内存，比较时扣除
+        self._peaks = {}             # 阶段行号 → [本帧峰值字节数, 峰值快照]
+        self._armed = True
+        sys.setprofile(self._on_profile)
+
+    def _disarm(self):
+        if self._armed:
+            sys.setprofile(None)
+            self._armed = False
+            self._peaks = {}
+
+    def _on_profile(self, frame, event, arg):
+        # 回收进行中不拍快照：GC 回调里 perf_counter 的返回也会触发本钩子，快照会被计入停顿
+        if not self.stack or self._collecting or (event != 'return' and event != 'c_return'):
+            return
+        current = tracemalloc.get_traced_memory()[0] - self._overhead
+        entry = self._peaks.get(self.stack[-1][0])
+        if entry is None:
+            # 阶段内第一次回调：以当前值为起点，只有继续增长才拍快照
+            self._peaks[self.stack[-1][0]] = [current, None]
+            return
+        if current < entry[0] + PEAK_STEP:
+            return
+        entry[0] = current
+        gc.disable()
+        try:
+            # 先释放该阶段的旧快照再拍新的，之后按实际占用重算要扣除的量
+            entry[1] = None
+            entry[1] = self._take_snapshot()
+            self._overhead = tracemalloc.get_traced_memory()[0] - current
+        finally:
+            gc.enable()
+
+    def _collect_peaks(self):
+        """各阶段峰值快照中比上一帧结束时多出的分配点，就是该阶段最大的临时占用"""
+        peaks = self._peaks
+        self._disarm()
+        self.peak_frames += 1
+        for row, (_, snapshot) in peaks.items():
+            if snapshot is None:
+                continue
+            for stat in snapshot.compare_to(self.snapshot, 'lineno'):
+                if stat.size_diff > 0:
+                    self.peak_sites[(self.phases[row], str(stat.traceback[0]))] += stat.size_diff
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            # 先置标志再取时间（属性赋值不会触发性能分析钩子）
+            self._collecting = True
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            # 峰值采样帧上持有的快照会拖慢回收，这些帧的停顿不计入统计
+            if not self._armed:
+                where = self.phases[self.stack[-1][0]] if self.stack else "-"
+                self.gc_pauses.append((info["generation"], time.perf_counter() - self._gc_start, where))
+            self._gc_start = None
+            self._collecting = False
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.frames += 1
+        # 快照本身会创建大量对象，比较期间关闭 GC，以免把跟踪器自己的回收算进统计
+        gc.disable()
+        try:
+            if self._armed:
+                self._collect_peaks()
+            snapshot = self._take_snapshot()
+            for stat in snapshot.compare_to(self.snapshot, 'lineno'):
+                if stat.size_diff > 0:
+                    site = str(stat.traceback[0])
+                    self.sites[site] += stat.size_diff
+                    self.site_blocks[site] += max(stat.count_diff, 0)
+            self.snapshot = snapshot
+        finally:
+            gc.enable()
+        # 下一帧是采样帧：基线为刚拍的帧末快照
+        if self.peak_every and self.frames % self.peak_every == 0:
+            self._arm()
+
+    def _samples(self, row):
+        count = min(self.counts[row], self.capacity)
+        return self.net[row, :count], self.transient[row, :count]
+
+    def stats(self):
+        """阶段名 → (每次净增中位数, 每次瞬时峰值中位数)，单位 KB"""
+        result = {}
+        for row, name in enumerate(self.phases):
+            net, transient = self._samples(row)
+            if len(net):
+                result[name] = (np.median(net) / 1024.0, np.median(transient) / 1024.0)
+        return result
+
+    def top_sites(self):
+        """每帧平均净增最多的分配点：[(位置, 字节/帧, 块/帧)]"""
+        frames = max(self.frames, 1)
+        return [(site, size / frames, self.site_blocks[site] / frames)
+                for site, size in self.sites.most_common(self.top)]
+
+    def top_peak_sites(self):
+        """采样帧峰值时刻平均占用最多的临时分配点：[(阶段, 位置, 字节/帧)]"""
+        frames = max(self.peak_frames, 1)
+        return [(where, site, size / frames)
+                for (where, site), size in self.peak_sites.most_common(self.top)]
+
+    def summary(self):
+        """供界面显示的统计行，每 refresh 帧重算一次"""
+        if not self._summary or self.frames % self.refresh == 0:
+            lines = [f"{name:<8}{net:7.1f}{transient:8.1f}"
+                     for name, (net, transient) in self.stats().items()]
+            pauses = [pause for _, pause, _ in self.gc_pauses]
+            if pauses:
+                lines.append(f"GC {len(pauses)} 次  最长 {max(pauses) * 1000:.1f}ms")
+            self._summary = ["阶段     净增KB  瞬时KB"] + lines
+        return self._summary
+
+    def report(self):
+        lines = [f"{self.frames} 帧的分配统计（KB/次，中位数）:"]
+        lines += [f"  {name:<8} 净增 {net:8.2f}  瞬时 {transient:8.2f}"
+                  for name, (net, transient) in self.stats().items()]
+        lines.append("每帧净增最多的分配点:")
+        lines += [f"  {size:10.0f} B/帧 {blocks:7.1f} 块/帧  {site}"
+                  for site, size, blocks in self.top_sites()]
+        lines.append(f"帧内峰值时刻占用最多的临时分配点（{self.peak_frames} 个采样帧的平均）:")
+        lines += [f"  {size:10.0f} B/帧  {where:<8} {site}"
+                  for where, site, size in self.top_peak_sites()]
+        for generation in range(3):
+            pauses = [pause for gen, pause, _ in self.gc_pauses if gen == generation]
+            if pauses:
+                lines.append(f"GC 第 {generation} 代: {len(pauses)} 次，"
+                             f"共 {sum(pauses) * 1000:.1f}ms，最长 {max(pauses) * 1000:.2f}ms")
+        return "\n".join(lines)
+
+    def dump(self, directory="."):
+        """保存统计到 JSON，返回文件路径"""
+        path = f"{directory}/{time.strftime('alloc_report_%Y%m%d_%H%M%S.json')}"
+        data = {
+            "frames": self.frames,
+            "phases": {name: {"net_kb": net, "transient_kb": transient}
+                       for name, (net, transient) in self.stats().items()},
+            "sites": [{"site": site, "bytes_per_frame": size, "blocks_per_frame": blocks}
+                      for site, size, blocks in self.top_sites()],
+            "peak_sites": [{"phase": where, "site": site, "bytes_per_frame": size}
+                           for where, site, size in self.top_peak_sites()],
+            "gc_pauses": [{"generation": gen, "ms": pause * 1000, "phase": where}
+                          for gen, pause, where in self.gc_pauses],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(self.report())
+        return path
@@ -0,0 +1,285 @@
+"""性能基准：物理步进、各渲染阶段，以及帧导出、输入记录和天体目录缓存的 I/O
+
+用法:
+    python -m solarsim benchmark --out results.json
+    python -m solarsim benchmark --baseline baseline.json --threshold 0.1   # 与基线比较，退化超过 10% 时返回 1
+    python -m solarsim benchmark --suite physics --save-baseline baseline.json
+
+渲染基准在离屏上下文中运行（默认 EGL，PYOPENGL_PLATFORM=osmesa 可改用纯软件的 OSMesa），
+只有选择 render 套件时才会导入 OpenGL 相关模块。
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# -------------------- 计时工具 --------------------
+def measure(func, repeat=5, min_time=0.05):
+    """返回单次调用耗时（秒）的中位数；每轮至少运行 min_time 秒以降低计时误差"""
+    func()  # 预热
+    samples = []
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        samples.append(elapsed / calls)
+    return float(np.median(samples))
+
+def result(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+# -------------------- 物理步进 --------------------
+def _python_bodies(count):
+    from solarsim.solar_system_simulator import CelestialBody
+    rng = np.random.default_rng(0)
+    return [CelestialBody(d, 1.0, 'GREY', 1.0, 0.01 * (150.0 / d) ** 1.5, i, "")
+            for d, i in zip(rng.uniform(50, 500, count), rng.normal(0, 3, count))]
+
+def _python_step(count):
+    bodies = _python_bodies(count)
+    def step():
+        for body in bodies:
+            body.update_position(1.0)
+    return step
+
+def _numpy_step(count):
+    from solarsim.solar_system_simulator import AsteroidBelt
+    belt = AsteroidBelt(count)
+    return lambda: belt.update(1.0)
+
+def _pm_step(count):
+    """自引力粒子云的一步（PM 引力 + 半隐式欧拉），与上面两种固定轨道更新不同，包含全部粒子间的引力"""
+    from solarsim.pm_gravity import ParticleMesh, uniform_cloud
+    positions, masses = uniform_cloud(count, radius=250.0)
+    velocities = np.zeros_like(positions)
+    mesh = ParticleMesh(600.0, 64, G=1.0, softening=1.0)
+    def step():
+        velocities[:] += mesh.accelerations(positions, masses)
+        positions[:] += velocities
+    return step
+
+# 后端名 → (构造一步更新函数, 最多测试的天体数)
+PHYSICS_BACKENDS = {
+    'python': (_python_step, 10_000),
+    'numpy': (_numpy_step, 1_000_000),
+    'pm': (_pm_step, 1_000_000),
+}
+
+def bench_physics(counts):
+    results = {}
+    for name, (make_step, limit) in PHYSICS_BACKENDS.items():
+        for count in counts:
+            if count > limit:
+                continue
+            seconds = measure(make_step(count))
+            results[f"physics.{name}.{count}"] = result(1.0 / seconds, "steps/s", True)
+            print(f"  物理 {name:>6} {count:>8} 个天体: {1.0 / seconds:10.1f} 步/秒")
+    return results
+
+# -------------------- 渲染阶段 --------------------
+def bench_render(width, height, belt_count):
+    from solarsim import offscreen_render
+    from OpenGL.GL import glFinish, glClear, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, glGetString, GL_RENDERER
+    from solarsim.solar_system_simulator import Config
+
+    Config.WIDTH, Config.HEIGHT = width, height
+    Config.BELT_COUNT = belt_count
+    simulator = offscreen_render.OffscreenSimulator()
+    solar_system, camera = simulator.solar_system, simulator.camera
+    for _ in range(120):
+        simulator._update()
+    camera.apply()
+    solar_system.cull(camera)
+    scales = solar_system._pixels_per_unit(camera)
+
+    def trails():
+        for planet, scale in zip(solar_system.planets, scales):
+            planet.draw(with_body=False, quality=solar_system.quality, pixels_per_unit=scale)
+
+    def spheres():
+        if simulator.renderer:
+            simulator.renderer.draw(solar_system.instance_data(), camera.view_matrix(),
+                                    camera.projection_matrix())
+        else:
+            for body in solar_system.bodies:
+                body.draw(quality=solar_system.quality)
+            solar_system.belt.draw_points()
+
+    passes = {
+        'stars': simulator._draw_stars,
+        'orbits': solar_system._draw_orbits,
+        'trails': trails,
+        'spheres': spheres,
+        'labels': lambda: simulator.ui.render(solar_system, camera, simulator.dt, False),
+        'frame': simulator._render,
+    }
+    results = {}
+    renderer = glGetString(GL_RENDERER).decode()
+    for name, draw in passes.items():
+        def run():
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            camera.apply()
+            draw()
+            glFinish()
+        seconds = measure(run)
+        results[f"render.{name}"] = result(seconds * 1000.0, "ms", False)
+        print(f"  渲染 {name:>8}: {seconds * 1000.0:8.2f} ms")
+    simulator.context.destroy()
+    return results, renderer
+
+# -------------------- I/O --------------------
+def _io_frame(width, height):
+    rng = np.random.default_rng(0)
+    # 带噪声的渐变，压缩率接近真实画面
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    return np.clip(gradient + rng.normal(0, 8, (height, width, 3)), 0, 255).astype(np.uint8)
+
+def _write_session(path, frames):
+    """合成一段输入记录：每次迭代一个鼠标拖拽事件，每 4 次迭代按住一个方向键"""
+    import pygame
+    from solarsim.input_replay import InputRecorder, encode_event
+    from solarsim.solar_system_simulator import Config
+    recorder = InputRecorder(path, Config)
+    for frame in range(frames):
+        event = pygame.event.Event(pygame.MOUSEMOTION, pos=(frame % 1000, 400), rel=(1, 0),
+                                   buttons=(1, 0, 0))
+        record = {"frame": frame, "t": round(frame / 60.0, 6), "events": [encode_event(event)]}
+        if frame % 4 == 0:
+            record["keys"] = [pygame.K_LEFT]
+        recorder.write(record)
+    recorder.close()
+
+def _replay_session(path):
+    from solarsim.input_replay import ReplayInput
+    source = ReplayInput(path)
+    for _ in source.records:
+        source.poll(block=False)
+
+def _write_catalog(path, rows):
+    rng = np.random.default_rng(0)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("name,distance,speed,radius,color,mass,inclination,phase\n")
+        for i, (distance, inclination, phase) in enumerate(zip(rng.uniform(225, 260, rows),
+                                                               rng.normal(0, 3, rows),
+                                                               rng.uniform(0, 360, rows))):
+            f.write(f"小行星{i},{distance:.4f},{0.01 * (150.0 / distance) ** 1.5:.6g},1.0,GREY,"
+                    f"1e15,{inclination:.3f},{phase:.3f}\n")
+
+def bench_io(width, height, session_frames=3600, catalog_rows=200_000):
+    from solarsim.image_io import encode_png
+    from solarsim import scenario_catalog
+    frame = _io_frame(width, height)
+    megabytes = frame.nbytes / 1e6
+    results = {}
+
+    seconds = measure(lambda: encode_png(frame), repeat=3)
+    results["io.png_encode"] = result(megabytes / seconds, "MB/s", True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "frame.rgb")
+        def write_raw():
+            with open(path, 'wb') as f:
+                f.write(frame.tobytes())
+        seconds = measure(write_raw, repeat=3)
+        results["io.raw_write"] = result(megabytes / seconds, "MB/s", True)
+
+        # 输入记录（input_replay.py）：录制写入和回放解析
+        session = os.path.join(directory, "session.jsonl")
+        seconds = measure(lambda: _write_session(session, session_frames), repeat=3)
+        megabytes = os.path.getsize(session) / 1e6
+        results["io.recording_write"] = result(megabytes / seconds, "MB/s", True)
+        seconds = measure(lambda: _replay_session(session), repeat=3)
+        results["io.recording_replay"] = result(megabytes / seconds, "MB/s", True)
+
+        # 天体目录（scenario_catalog.py）：首次解析并写入 .npy 缓存，之后内存映射加载
+        source = os.path.join(directory, "catalog.csv")
+        _write_catalog(source, catalog_rows)
+        cache_dir = os.path.join(directory, "cache")
+        def parse():
+            if os.path.isdir(cache_dir):
+                shutil.rmtree(cache_dir)
+            scenario_catalog.load_catalog(source, cache_dir)
+        seconds = measure(parse, repeat=3)
+        results["io.catalog_parse"] = result(os.path.getsize(source) / 1e6 / seconds, "MB/s", True)
+        catalog = scenario_catalog.load_catalog(source, cache_dir)
+        megabytes = catalog.nbytes / 1e6
+        del catalog
+        # 加载后读一遍所有行，计入从页缓存读取映射的开销
+        seconds = measure(lambda: scenario_catalog.load_catalog(source, cache_dir)['distance'].sum(),
+                          repeat=3)
+        results["io.catalog_cache_load"] = result(megabytes / seconds, "MB/s", True)
+    for name, entry in results.items():
+        print(f"  I/O {name:>22}: {entry['value']:8.1f} MB/s")
+    return results
+
+# -------------------- 基线比较 --------------------
+def compare(results, baseline, threshold):
+    """返回退化超过 threshold（相对比例）的指标列表"""
+    regressions = []
+    print(f"\n{'指标':<28}{'基线':>12}{'当前':>12}{'变化':>9}")
+    for name, entry in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None or reference["value"] == 0:
+            continue
+        change = entry["value"] / reference["value"] - 1.0
+        worse = -change if entry["higher_is_better"] else change
+        flag = "  退化" if worse > threshold else ""
+        print(f"{name:<28}{reference['value']:>12.2f}{entry['value']:>12.2f}{change:>+9.1%}{flag}")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="太阳系模拟器性能基准")
+    parser.add_argument('--suite', nargs='+', choices=('physics', 'render', 'io'),
+                        default=['physics', 'render', 'io'])
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000, 10_000, 100_000])
+    parser.add_argument('--size', default='1000x800', help="渲染和 I/O 使用的分辨率")
+    parser.add_argument('--belt', type=int, default=1500, help="渲染基准中的小行星数量")
+    parser.add_argument('--out', help="结果 JSON 路径")
+    parser.add_argument('--baseline', help="用于比较的基线 JSON")
+    parser.add_argument('--save-baseline', help="把本次结果另存为基线")
+    parser.add_argument('--threshold', type=float, default=0.1, help="判定退化的相对阈值")
+    args = parser.parse_args()
+    width, height = map(int, args.size.lower().split('x'))
+
+    meta = {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    results = {}
+    if 'physics' in args.suite:
+        print("物理步进:")
+        results.update(bench_physics(args.counts))
+    if 'render' in args.suite:
+        print("渲染阶段:")
+        render_results, meta["gl_renderer"] = bench_render(width, height, args.belt)
+        results.update(render_results)
+    if 'io' in args.suite:
+        print("I/O（帧导出、输入记录、天体目录）:")
+        results.update(bench_io(width, height))
+
+    report = {"meta": meta, "results": results}
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} 项指标退化超过 {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""离线黑洞光线追踪：逐像素积分史瓦西度规下的零测地线，输出星空和吸积盘的引力透镜图像
+
+用法:
+    python -m solarsim raytrace --size 1920x1080 --inclination 10 --out black_hole.png
+
+场景与 relativity_black_hole.py 一致：事件视界半径 30，吸积盘从视界延伸到
+4 倍视界半径，摄像机距离 750。每条光线位于过黑洞中心的平面内，满足比奈方程
+    d²u/dφ² = -u + 1.5 · rs · u²      (u = 1/r)
+一块图块内的所有光线以 NumPy 数组同步做 RK4 积分，图块由进程池调度。
+不会靠近吸积盘的光线直接查偏折角表，表按 (rs, 观察者距离) 缓存到磁盘，多帧之间复用。
+"""
+import argparse
+import hashlib
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from solarsim.image_io import encode_png
+from solarsim.paths import CACHE_DIR
+
+# -------------------- 场景参数 --------------------
+class Scene:
+    def __init__(self, width=1920, height=1080, rs=30.0, disk_inner=30.0, disk_outer=120.0,
+                 camera_distance=750.0, inclination=10.0, fov=45.0, star_count=20000, seed=7):
+        self.width, self.height = width, height
+        self.rs = rs                          # 史瓦西半径（即场景中黑洞的半径）
+        self.disk_inner = disk_inner
+        self.disk_outer = disk_outer
+        self.camera_distance = camera_distance
+        self.inclination = inclination        # 摄像机高出吸积盘平面的角度（度）
+        self.fov = fov
+        self.star_count = star_count
+        self.seed = seed
+
+    def camera(self):
+        """摄像机位置和朝向基 (右, 上, 前)；吸积盘位于 y = 0 平面"""
+        tilt = math.radians(self.inclination)
+        position = self.camera_distance * np.array([0.0, math.sin(tilt), math.cos(tilt)])
+        forward = -position / np.linalg.norm(position)
+        right = np.cross(forward, [0.0, 1.0, 0.0])
+        right /= np.linalg.norm(right)
+        up = np.cross(right, forward)
+        return position, right, up, forward
+
+    def ray_directions(self, x0, y0, x1, y1):
+        """图块 [x0, x1) × [y0, y1) 内每个像素中心的单位射线方向，形状 (h*w, 3)"""
+        _, right, up, forward = self.camera()
+        scale = math.tan(math.radians(self.fov) / 2)
+        aspect = self.width / self.height
+        px = (2.0 * (np.arange(x0, x1) + 0.5) / self.width - 1.0) * scale * aspect
+        py = (1.0 - 2.0 * (np.arange(y0, y1) + 0.5) / self.height) * scale
+        gx, gy = np.meshgrid(px, py)
+        directions = forward + gx.reshape(-1, 1) * right + gy.reshape(-1, 1) * up
+        return directions / np.linalg.norm(directions, axis=1, keepdims=True)
+
+# -------------------- 测地线积分 --------------------
+def rk4_step(u, du, h, rs):
+    """比奈方程的一步 RK4，u 和 du 为同形状数组"""
+    k = 1.5 * rs
+    a1, b1 = du, k * u * u - u
+    u2, d2 = u + 0.5 * h * a1, du + 0.5 * h * b1
+    a2, b2 = d2, k * u2 * u2 - u2
+    u3, d3 = u + 0.5 * h * a2, du + 0.5 * h * b2
+    a3, b3 = d3, k * u3 * u3 - u3
+    u4, d4 = u + h * a3, du + h * b3
+    a4, b4 = d4, k * u4 * u4 - u4
+    return (u + h / 6.0 * (a1 + 2 * a2 + 2 * a3 + a4),
+            du + h / 6.0 * (b1 + 2 * b2 + 2 * b3 + b4))
+
+def impact_parameter(observer_distance, sin_angle, rs):
+    """静止观察者看到的光线与径向夹角 → 冲击参数 b"""
+    return observer_distance * sin_angle / math.sqrt(1.0 - rs / observer_distance)
+
+def initial_slope(u0, b, rs):
+    """射向黑洞（u 增大）的光线在起点的 du/dφ"""
+    return np.sqrt(np.maximum(1.0 / (b * b) - u0 * u0 * (1.0 - rs * u0), 0.0))
+
+def periapsis(b, rs):
+    """冲击参数 b 对应的近心距：r³ - b²r + b²rs = 0 的最大实根（b 小于临界值时为 nan）"""
+    b = np.asarray(b, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        angle = np.arccos(1.5 * math.sqrt(3.0) * rs / b)
+    return 2.0 * b / math.sqrt(3.0) * np.cos(angle / 3.0)
+
+# -------------------- 偏折角表 --------------------
+class DeflectionTable:
+    """从观察者出发、射向黑洞的光线：冲击参数 b → 到近心点扫过的角度、近心点到无穷远扫过的角度
+
+    所有样本一起做向量化积分；结果按 (rs, 观察者距离, 采样数, 步长) 的哈希缓存为 .npz。
+    b 小于临界值 1.5√3·rs 的光线会落入黑洞，不在表内。
+    """
+    def __init__(self, rs, observer_distance, samples=2048, step=0.002, data=None):
+        self.rs = rs
+        self.observer_distance = observer_distance
+        self.critical = 1.5 * math.sqrt(3.0) * rs
+        if data is None:
+            data = self._compute(samples, step)
+        self.b, self.phi_periapsis, self.phi_infinity = data
+
+    @classmethod
+    def cached(cls, rs, observer_distance, samples=2048, step=0.002, cache_dir=CACHE_DIR):
+        key = hashlib.sha256(repr((round(rs, 9), round(observer_distance, 9),
+                                   samples, step)).encode()).hexdigest()[:16]
+        path = os.path.join(cache_dir, f"deflection_{key}.npz")
+        if os.path.exists(path):
+            with np.load(path) as f:
+                return cls(rs, observer_distance, data=(f['b'], f['phi_periapsis'], f['phi_infinity']))
+        table = cls(rs, observer_distance, samples, step)
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, b=table.b, phi_periapsis=table.phi_periapsis, phi_infinity=table.phi_infinity)
+        return table
+
+    def _compute(self, samples, step):
+        rs, r0 = self.rs, self.observer_distance
+        b_max = impact_parameter(r0, 1.0, rs)
+        # 靠近临界值时偏折角按对数发散，用几何间距加密采样
+        b = self.critical + np.geomspace(1e-6 * rs, b_max - self.critical, samples)
+        u0 = np.full(samples, 1.0 / r0)
+        u, du = u0.copy(), initial_slope(u0, b, rs)
+        phi_periapsis = np.full(samples, np.nan)
+        phi_infinity = np.full(samples, np.nan)
+        active = np.arange(samples)
+        phi = 0.0
+        while len(active):
+            new_u, new_du = rk4_step(u, du, step, rs)
+            # 近心点：du 由正变负，线性插值
+            turned = (du > 0) & (new_du <= 0)
+            phi_periapsis[active[turned]] = phi + step * du[turned] / (du[turned] - new_du[turned])
+            # 无穷远：u 穿过 0
+            escaped = new_u <= 0
+            phi_infinity[active[escaped]] = phi + step * u[escaped] / (u[escaped] - new_u[escaped])
+            phi += step
+            keep = ~escaped
+            active, u, du = active[keep], new_u[keep], new_du[keep]
+        # 保存近心点之后的那段角度，出射方向的光线可以直接复用
+        return b, phi_periapsis, phi_infinity - phi_periapsis
+
+    def lookup(self, b):
+        """返回 (到近心点的角度, 近心点到无穷远的角度)"""
+        return (np.interp(b, self.b, self.phi_periapsis),
+                np.interp(b, self.b, self.phi_infinity))
+
+# -------------------- 背景星空和吸积盘 --------------------
+def starfield(count, seed, width=4096):
+    """等距柱状投影的星空贴图，亮度按幂律分布"""
+    rng = np.random.default_rng(seed)
+    height = width // 2
+    sky = np.zeros((height, width, 3), dtype=np.float32)
+    lon = rng.uniform(-math.pi, math.pi, count)
+    lat = np.arcsin(rng.uniform(-1.0, 1.0, count))
+    brightness = rng.pareto(2.5, count) * 0.4 + 0.3
+    tint = rng.uniform(0.8, 1.0, (count, 3))
+    cols = ((lon + math.pi) / (2 * math.pi) * (width - 1)).astype(int)
+    rows = ((math.pi / 2 - lat) / math.pi * (height - 1)).astype(int)
+    np.add.at(sky, (rows, cols), np.minimum(brightness, 3.0)[:, None] * tint)
+    return sky
+
+def sample_sky(sky, directions):
+    height, width, _ = sky.shape
+    lon = np.arctan2(directions[:, 0], -directions[:, 2])
+    lat = np.arcsin(np.clip(directions[:, 1], -1.0, 1.0))
+    cols = ((lon + math.pi) / (2 * math.pi) * (width - 1)).astype(int)
+    rows = ((math.pi / 2 - lat) / math.pi * (height - 1)).astype(int)
+    return sky[rows, cols]
+
+def disk_color(radius, angle, scene):
+    """与场景中 AccretionDisk 相同的温度配色：内圈偏红、外圈偏蓝，返回 (颜色, 不透明度)"""
+    t = ((radius - scene.disk_inner) / (scene.disk_outer - scene.disk_inner))[:, None]
+    inner_color = np.array([1.0, 0.0, 0.1, 0.8])
+    outer_color = np.array([0.0, 0.2, 1.0, 0.7])
+    colors = (1 - t) * inner_color + t * outer_color
+    brightness = 0.85 + 0.15 * np.cos(6 * angle + 20 * t[:, 0])
+    # 引力红移使靠近视界的部分变暗
+    brightness *= np.sqrt(np.maximum(1.0 - scene.rs / radius, 0.0))
+    return np.clip(colors[:, :3] * brightness[:, None], 0.0, 1.0), colors[:, 3]
+
+# -------------------- 图块追踪 --------------------
+class Tracer:
+    def __init__(self, scene, table, step=0.004, max_phi=6 * math.pi):
+        self.scene = scene
+        self.table = table
+        self.step = step
+        self.max_phi = max_phi
+        self.sky = starfield(scene.star_count, scene.seed)
+
+    def trace_tile(self, x0, y0, x1, y1):
+        """返回图块的 (h, w, 3) float32 颜色"""
+        scene = self.scene
+        origin = scene.camera()[0]
+        directions = scene.ray_directions(x0, y0, x1, y1)
+        count = len(directions)
+
+        # 每条光线所在平面的正交基：e1 指向观察者，e2 沿光线的切向分量
+        r0 = np.linalg.norm(origin)
+        e1 = origin / r0
+        radial = directions @ e1
+        tangential = directions - radial[:, None] * e1
+        sin_angle = np.linalg.norm(tangential, axis=1)
+        # 正对黑洞中心的光线切向为 0，任取一个垂直方向即可
+        fallback = np.cross(e1, [1.0, 0.0, 0.0])
+        e2 = np.where(sin_angle[:, None] > 1e-12,
+                      tangential / np.maximum(sin_angle, 1e-12)[:, None],
+                      fallback / np.linalg.norm(fallback))
+        b = impact_parameter(r0, sin_angle, scene.rs)
+
+        color = np.zeros((count, 3))
+        alpha = np.zeros(count)
+        # 出射方向的光线或近心距在吸积盘之外的光线：查表
+        inward = radial < 0
+        r_min = periapsis(b, scene.rs)
+        far = ~inward | ((b > self.table.critical) & (r_min > scene.disk_outer * 1.05))
+        phi_periapsis, phi_infinity = self.table.lookup(b[far])
+        phi_far = np.where(inward[far], phi_periapsis + phi_infinity, phi_infinity - phi_periapsis)
+        self._escape(color, alpha, np.flatnonzero(far), phi_far, e1, e2)
+
+        near = np.flatnonzero(~far)
+        if len(near):
+            self._integrate(color, alpha, near, b[near], e1, e2[near])
+        return color.reshape(y1 - y0, x1 - x0, 3).astype(np.float32)
+
+    def _escape(self, color, alpha, index, phi, e1, e2):
+        """逃逸到无穷远的光线：渐近方向为 φ∞ 处的径向"""
+        directions = np.cos(phi)[:, None] * e1 + np.sin(phi)[:, None] * e2[index]
+        color[index] += (1.0 - alpha[index])[:, None] * sample_sky(self.sky, directions)
+        alpha[index] = 1.0
+
+    def _integrate(self, color, alpha, index, b, e1, e2):
+        scene, h = self.scene, self.step
+        u = np.full(len(index), 1.0 / scene.camera_distance)
+        du = initial_slope(u, b, scene.rs)
+        e2y = e2[:, 1]
+        phi = 0.0
+        height = e1[1] * np.ones(len(index))  # 位置方向的 y 分量（未乘半径）
+        while len(index) and phi < self.max_phi:
+            new_u, new_du = rk4_step(u, du, h, scene.rs)
+            new_phi = phi + h
+            new_height = e1[1] * math.cos(new_phi) + e2y * math.sin(new_phi)
+
+            # 穿过吸积盘平面：插值得到交点半径和方位角
+            crossed = (height * new_height <= 0) & (new_u > 0)
+            if np.any(crossed):
+                s = height[crossed] / (height[crossed] - new_height[crossed])
+                radius = 1.0 / (u[crossed] + s * (new_u[crossed] - u[crossed]))
+                on_disk = (radius >= scene.disk_inner) & (radius <= scene.disk_outer)
+                if np.any(on_disk):
+                    hit = np.flatnonzero(crossed)[on_disk]
+                    at = phi + s[on_disk] * h
+                    point = (np.cos(at)[:, None] * e1 + np.sin(at)[:, None] * e2[hit]) * radius[on_disk, None]
+                    rgb, opacity = disk_color(radius[on_disk], np.arctan2(point[:, 2], point[:, 0]), scene)
+                    ray = index[hit]
+                    color[ray] += ((1.0 - alpha[ray]) * opacity)[:, None] * rgb
+                    alpha[ray] += (1.0 - alpha[ray]) * opacity
+
+            # 落入视界的光线为黑色；逃逸的光线采样星空
+            captured = new_u >= 1.0 / scene.rs
+            escaped = new_u <= 0
+            if np.any(escaped):
+                at = phi + h * u[escaped] / (u[escaped] - new_u[escaped])
+                directions = np.cos(at)[:, None] * e1 + np.sin(at)[:, None] * e2[escaped]
+                ray = index[escaped]
+                color[ray] += (1.0 - alpha[ray])[:, None] * sample_sky(self.sky, directions)
+                alpha[ray] = 1.0
+
+            keep = ~(captured | escaped) & (alpha[index] < 0.99)
+            index, u, du, e2, e2y, height = (index[keep], new_u[keep], new_du[keep],
+                                             e2[keep], e2y[keep], new_height[keep])
+            phi = new_phi
+
+# -------------------- 进程池调度 --------------------
+_tracer = None
+
+def _init_worker(scene, table):
+    global _tracer
+    _tracer = Tracer(scene, table)
+
+def _trace(tile):
+    return tile, _tracer.trace_tile(*tile)
+
+def tiles(width, height, size):
+    return [(x, y, min(x + size, width), min(y + size, height))
+            for y in range(0, height, size) for x in range(0, width, size)]
+
+def render(scene, workers=None, tile_size=64, progress=True):
+    """返回 (H, W, 3) uint8 图像"""
+    table = DeflectionTable.cached(scene.rs, scene.camera_distance)
+    image = np.zeros((scene.height, scene.width, 3), dtype=np.float32)
+    jobs = tiles(scene.width, scene.height, tile_size)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(scene, table)) as pool:
+        futures = [pool.submit(_trace, tile) for tile in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            (x0, y0, x1, y1), block = future.result()
+            image[y0:y1, x0:x1] = block
+            if progress:
+                elapsed = time.perf_counter() - start
+                remaining = elapsed / done * (len(jobs) - done)
+                print(f"\r{done}/{len(jobs)} 块 ({100 * done / len(jobs):.0f}%) "
+                      f"已用 {elapsed:.0f}s 预计剩余 {remaining:.0f}s", end='', file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+    return (np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+
+def main():
+    parser = argparse.ArgumentParser(description="离线渲染黑洞引力透镜图像")
+    parser.add_argument('--out', default='black_hole.png')
+    parser.add_argument('--size', default='1920x1080', help="分辨率，如 1920x1080")
+    parser.add_argument('--inclination', type=float, default=10.0, help="摄像机高出吸积盘的角度（度）")
+    parser.add_argument('--distance', type=float, default=750.0, help="摄像机到黑洞的距离")
+    parser.add_argument('--fov', type=float, default=45.0)
+    parser.add_argument('--stars', type=int, default=20000)
+    parser.add_argument('--workers', type=int, help="进程数，默认等于 CPU 核数")
+    parser.add_argument('--tile', type=int, default=64, help="图块边长（像素）")
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.lower().split('x'))
+    scene = Scene(width, height, camera_distance=args.distance, inclination=args.inclination,
+                  fov=args.fov, star_count=args.stars)
+    start = time.perf_counter()
+    image = render(scene, args.workers, args.tile)
+    with open(args.out, 'wb') as f:
+        f.write(encode_png(image))
+    print(f"{width}x{height} 用时 {time.perf_counter() - start:.1f}s，输出到 {args.out}")
+
+if __name__ == "__main__":
+    sys.exit(main())
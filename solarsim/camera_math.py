@@ -0,0 +1,87 @@
+import math
+import numpy as np
+
+# -------------------- 摄像机矩阵工具 --------------------
+# 与固定管线的 glTranslatef/glRotatef/gluPerspective 保持完全一致，
+# 矩阵按"列向量"约定存放（p' = M @ p），上传给 GL 时需要转置。
+
+def translation(x, y, z):
+    m = np.identity(4)
+    m[:3, 3] = (x, y, z)
+    return m
+
+def rotation(angle_deg, x, y, z):
+    """与 glRotatef 相同的绕任意轴旋转矩阵"""
+    axis = np.array([x, y, z], dtype=np.float64)
+    axis /= np.linalg.norm(axis)
+    x, y, z = axis
+    a = math.radians(angle_deg)
+    c, s = math.cos(a), math.sin(a)
+    m = np.identity(4)
+    m[:3, :3] = [
+        [x*x*(1-c) + c,   x*y*(1-c) - z*s, x*z*(1-c) + y*s],
+        [y*x*(1-c) + z*s, y*y*(1-c) + c,   y*z*(1-c) - x*s],
+        [x*z*(1-c) - y*s, y*z*(1-c) + x*s, z*z*(1-c) + c],
+    ]
+    return m
+
+def perspective(fovy, aspect, near, far):
+    """与 gluPerspective 相同的透视投影矩阵"""
+    f = 1.0 / math.tan(math.radians(fovy) / 2)
+    m = np.zeros((4, 4))
+    m[0, 0] = f / aspect
+    m[1, 1] = f
+    m[2, 2] = (far + near) / (near - far)
+    m[2, 3] = 2 * far * near / (near - far)
+    m[3, 2] = -1.0
+    return m
+
+def project_points(points, view_proj, width, height):
+    """批量版 gluProject：一次矩阵乘法把所有点投影到窗口坐标
+
+    返回 (N, 3) 窗口坐标（原点在左下角，z 为 0~1 深度）和"在摄像机前方"的布尔掩码。
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    clip = points @ view_proj[:3, :3].T + view_proj[:3, 3]
+    w = points @ view_proj[3, :3] + view_proj[3, 3]
+    in_front = w > 1e-9
+    ndc = clip / np.where(in_front, w, 1.0)[:, None]
+    window = (ndc + 1.0) * 0.5 * (width, height, 1.0)
+    return window, in_front
+
+def unproject_ray(x, y, view_proj, width, height):
+    """gluUnProject 的逆向射线版：窗口坐标（原点在左下角）→ 世界空间射线 (起点, 单位方向)"""
+    inverse = np.linalg.inv(view_proj)
+    ndc_x = 2.0 * x / width - 1.0
+    ndc_y = 2.0 * y / height - 1.0
+    near = inverse @ (ndc_x, ndc_y, -1.0, 1.0)
+    far = inverse @ (ndc_x, ndc_y, 1.0, 1.0)
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    direction = far - near
+    return near, direction / np.linalg.norm(direction)
+
+# -------------------- 视锥体裁剪 --------------------
+def frustum_planes(view_proj):
+    """从 投影@视图 矩阵提取 6 个归一化裁剪平面 (a, b, c, d)，法线指向视锥体内部"""
+    m = np.asarray(view_proj, dtype=np.float64)
+    planes = np.array([m[3] + m[0], m[3] - m[0],    # 左、右
+                       m[3] + m[1], m[3] - m[1],    # 下、上
+                       m[3] + m[2], m[3] - m[2]])   # 近、远
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+def spheres_in_frustum(planes, centers, radii):
+    """一次向量化判断所有包围球是否与视锥体相交，返回布尔掩码"""
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(distances >= -np.asarray(radii, dtype=np.float64).reshape(-1, 1), axis=1)
+
+def boxes_in_frustum(planes, mins, maxs):
+    """轴对齐包围盒测试：对每个平面取最靠内的顶点 (p-vertex)，返回布尔掩码"""
+    mins = np.asarray(mins, dtype=np.float64).reshape(-1, 3)
+    maxs = np.asarray(maxs, dtype=np.float64).reshape(-1, 3)
+    positive = planes[:, :3] >= 0
+    # (N, 6, 3)：每个包围盒在每个平面法线方向上最远的顶点
+    p_vertex = np.where(positive, maxs[:, None, :], mins[:, None, :])
+    distances = np.einsum('npk,pk->np', p_vertex, planes[:, :3]) + planes[:, 3]
+    return np.all(distances >= 0, axis=1)
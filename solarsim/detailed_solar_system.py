@@ -1,16 +1,16 @@
-import pygame
-from pygame.locals import *
-from OpenGL.GL import *
-from OpenGL.GLU import *
+from solarsim.lazy import pygame, GL, GLU
 import math
 import numpy as np
 import os
 import sys
+from solarsim.camera_math import translation, rotation, perspective, project_points
+from solarsim.fonts import load_font
 
 # 常量定义
 WIDTH, HEIGHT = 1000, 800
 FPS = 60
 MAX_TRAIL_LENGTH = 300  # 减少轨迹点数量提高性能
+SEED = None  # 星空的随机种子，None 表示每次运行不同
 
 # 颜色定义 (R, G, B) - 增强颜色对比度
 YELLOW = (1.0, 1.0, 0.0)       # 太阳
@@ -39,12 +39,25 @@ class Camera:
         
     def apply(self):
         """应用摄像机视角"""
-        glLoadIdentity()
-        glTranslatef(*self.position)
-        glTranslatef(0, 0, 200 * (1 - self.zoom_level))  # 缩放效果
-        glRotatef(self.rotation[0], 1, 0, 0)
-        glRotatef(self.rotation[1], 0, 1, 0)
-        glRotatef(self.rotation[2], 0, 0, 1)
+        GL.glLoadIdentity()
+        GL.glTranslatef(*self.position)
+        GL.glTranslatef(0, 0, 200 * (1 - self.zoom_level))  # 缩放效果
+        GL.glRotatef(self.rotation[0], 1, 0, 0)
+        GL.glRotatef(self.rotation[1], 0, 1, 0)
+        GL.glRotatef(self.rotation[2], 0, 0, 1)
+    
+    def view_matrix(self):
+        """与 apply() 等价的模型视图矩阵（NumPy）"""
+        return (translation(*self.position)
+                @ translation(0, 0, 200 * (1 - self.zoom_level))
+                @ rotation(self.rotation[0], 1, 0, 0)
+                @ rotation(self.rotation[1], 0, 1, 0)
+                @ rotation(self.rotation[2], 0, 0, 1))
+    
+    @staticmethod
+    def projection_matrix():
+        """与 main() 中 gluPerspective 相同的投影矩阵"""
+        return perspective(45, WIDTH / HEIGHT, 1.0, 5000.0)
     
     def rotate(self, x=0, y=0, z=0):
         """旋转摄像机"""
@@ -93,8 +106,8 @@ class CelestialBody:
         self.trail_index = 0
         self.trail_count = 0
         self.max_trail_length = MAX_TRAIL_LENGTH
-        self.quadratic = gluNewQuadric()
-        gluQuadricNormals(self.quadratic, GLU_SMOOTH)
+        self.quadratic = GLU.gluNewQuadric()
+        GLU.gluQuadricNormals(self.quadratic, GLU.GLU_SMOOTH)
         # 添加自转属性
         self.rotation_angle = 0
 
@@ -119,39 +132,39 @@ class CelestialBody:
 
     def draw(self, show_names=True, font=None, surface=None):
         """绘制天体"""
-        glPushMatrix()
+        GL.glPushMatrix()
         
         # 移动到天体位置
-        glTranslatef(self.x, self.y, self.z)
+        GL.glTranslatef(self.x, self.y, self.z)
         
         # 添加自转
-        glRotatef(self.rotation_angle, 0, 1, 0)  # 添加绕Y轴自转
+        GL.glRotatef(self.rotation_angle, 0, 1, 0)  # 添加绕Y轴自转
         
         # 设置颜色 - 增加颜色强度
         r, g, b = self.color
-        glColor3f(min(1.0, r*1.5), min(1.0, g*1.5), min(1.0, b*1.5))  # 提高亮度
+        GL.glColor3f(min(1.0, r*1.5), min(1.0, g*1.5), min(1.0, b*1.5))  # 提高亮度
         
         # 绘制天体 - 增加细分数
-        gluSphere(self.quadratic, self.radius, 24, 24)
+        GLU.gluSphere(self.quadratic, self.radius, 24, 24)
         
-        glPopMatrix()
+        GL.glPopMatrix()
         
         # 绘制轨道轨迹 - 使用更亮的颜色
         if len(self.trail) > 2:
-            glDisable(GL_LIGHTING)  # 轨迹不需要光照效果
-            glLineWidth(2.0)  # 增加线宽
-            glBegin(GL_LINE_STRIP)
+            GL.glDisable(GL.GL_LIGHTING)  # 轨迹不需要光照效果
+            GL.glLineWidth(2.0)  # 增加线宽
+            GL.glBegin(GL.GL_LINE_STRIP)
             for i, pos in enumerate(self.trail):
                 alpha = i / len(self.trail)
                 # 更亮的轨迹颜色
-                glColor4f(min(1.0, self.color[0]*1.5), 
+                GL.glColor4f(min(1.0, self.color[0]*1.5), 
                          min(1.0, self.color[1]*1.5), 
                          min(1.0, self.color[2]*1.5), 
                          alpha)
-                glVertex3f(*pos)
-            glEnd()
-            glLineWidth(1.0)
-            glEnable(GL_LIGHTING)  # 恢复光照
+                GL.glVertex3f(*pos)
+            GL.glEnd()
+            GL.glLineWidth(1.0)
+            GL.glEnable(GL.GL_LIGHTING)  # 恢复光照
 
 class SolarSystem:
     """太阳系类，管理所有天体"""
@@ -200,7 +213,7 @@ class SolarSystem:
         """绘制太阳系"""
         # 设置光源位置（在太阳位置）
         light_position = [0.0, 0.0, 0.0, 1.0]
-        glLightfv(GL_LIGHT0, GL_POSITION, light_position)
+        GL.glLightfv(GL.GL_LIGHT0, GL.GL_POSITION, light_position)
         
         # 绘制太阳
         self.sun.draw(self.show_names, font, surface)
@@ -215,31 +228,31 @@ class SolarSystem:
     
     def draw_orbit_lines(self):
         """绘制轨道线"""
-        glDisable(GL_LIGHTING)  # 轨道线不需要光照
-        glEnable(GL_LINE_SMOOTH)
-        glLineWidth(1.0)
+        GL.glDisable(GL.GL_LIGHTING)  # 轨道线不需要光照
+        GL.glEnable(GL.GL_LINE_SMOOTH)
+        GL.glLineWidth(1.0)
         
         for planet in self.planets:
-            glBegin(GL_LINE_LOOP)
+            GL.glBegin(GL.GL_LINE_LOOP)
             for i in range(100):
                 angle = 2.0 * math.pi * i / 100
                 # 使用与天体实际位置相同的计算逻辑，考虑轨道倾角
                 x = planet.distance * math.cos(angle)
                 y = planet.distance * math.sin(angle) * math.cos(planet.inclination)
                 z = planet.distance * math.sin(angle) * math.sin(planet.inclination)
-                glVertex3f(x, y, z)
-            glEnd()
+                GL.glVertex3f(x, y, z)
+            GL.glEnd()
         
-        glDisable(GL_LINE_SMOOTH)
-        glEnable(GL_LIGHTING)  # 恢复光照设置
+        GL.glDisable(GL.GL_LINE_SMOOTH)
+        GL.glEnable(GL.GL_LIGHTING)  # 恢复光照设置
 
 class UserInterface:
     """用户界面类，处理UI渲染"""
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        self.font = pygame.font.SysFont(None, 24)
-        self.large_font = pygame.font.SysFont(None, 36)
+        self.font = load_font(None, 24)
+        self.large_font = load_font(None, 36)
         
     def draw_text(self, surface, text, x, y, color=(255, 255, 255)):
         """绘制文本"""
@@ -288,55 +301,45 @@ class UserInterface:
     
     def render_planet_names(self, surface, solar_system, camera):
         """渲染行星名称"""
-        # 需要切换回2D模式
-        self.setup_2d_mode()
-        
-        # 获取当前视图和投影矩阵
-        modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
-        projection = glGetDoublev(GL_PROJECTION_MATRIX)
-        viewport = glGetIntegerv(GL_VIEWPORT)
+        bodies = [solar_system.sun] + solar_system.planets
         
-        # 绘制太阳名称
-        self.draw_planet_name(surface, solar_system.sun, modelview, projection, viewport)
+        # 用摄像机矩阵一次性投影所有天体，无需读回GL状态
+        window, in_front = project_points(
+            [(body.x, body.y, body.z) for body in bodies],
+            camera.projection_matrix() @ camera.view_matrix(),
+            self.width, self.height)
         
-        # 绘制行星名称
-        for planet in solar_system.planets:
-            self.draw_planet_name(surface, planet, modelview, projection, viewport)
-        
-        # 恢复3D模式
-        self.restore_3d_mode()
-    
-    def draw_planet_name(self, surface, planet, modelview, projection, viewport):
-        """在行星上方绘制名称"""
-        # 将3D坐标转换为屏幕坐标
-        win_coords = gluProject(planet.x, planet.y, planet.z, modelview, projection, viewport)
+        # 需要切换回2D模式
+        self.setup_2d_mode()
         
-        if win_coords:
-            x, y, z = win_coords
+        for planet, (x, y, z), front in zip(bodies, window, in_front):
             # 只有当z值在0-1范围内（在视野内）时才绘制
-            if 0.0 <= z <= 1.0 and 0 <= x <= self.width and 0 <= y <= self.height:
+            if front and 0.0 <= z <= 1.0 and 0 <= x <= self.width and 0 <= y <= self.height:
                 # 计算适当的偏移量，使文本出现在行星上方
                 offset = planet.radius * 15 / max(1, z)
                 self.draw_text(surface, planet.name, int(x) - 20, int(self.height - y) - offset)
+        
+        # 恢复3D模式
+        self.restore_3d_mode()
     
     def setup_2d_mode(self):
         """切换到2D模式"""
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0, self.width, self.height, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        glDisable(GL_DEPTH_TEST)
+        GL.glMatrixMode(GL.GL_PROJECTION)
+        GL.glPushMatrix()
+        GL.glLoadIdentity()
+        GL.glOrtho(0, self.width, self.height, 0, -1, 1)
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        GL.glPushMatrix()
+        GL.glLoadIdentity()
+        GL.glDisable(GL.GL_DEPTH_TEST)
     
     def restore_3d_mode(self):
         """恢复3D模式"""
-        glEnable(GL_DEPTH_TEST)
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        glPopMatrix()
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glMatrixMode(GL.GL_PROJECTION)
+        GL.glPopMatrix()
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        GL.glPopMatrix()
     
     def render_help_screen(self, surface):
         """渲染帮助屏幕"""
@@ -380,22 +383,22 @@ class UserInterface:
 
 def draw_starfield(stars, frame_count):
     """绘制星空背景，并随时间缓慢旋转"""
-    glDisable(GL_LIGHTING)
-    glPushMatrix()
+    GL.glDisable(GL.GL_LIGHTING)
+    GL.glPushMatrix()
     
     # 使星空随时间缓慢旋转
-    glRotatef(frame_count * 0.01, 0, 1, 0)  # 绕Y轴缓慢旋转
+    GL.glRotatef(frame_count * 0.01, 0, 1, 0)  # 绕Y轴缓慢旋转
     
-    glColor3f(1.0, 1.0, 1.0)  # 纯白色
-    glPointSize(2.0)  # 增加点大小
+    GL.glColor3f(1.0, 1.0, 1.0)  # 纯白色
+    GL.glPointSize(2.0)  # 增加点大小
     
-    glBegin(GL_POINTS)
+    GL.glBegin(GL.GL_POINTS)
     for x, y, z in stars:
-        glVertex3f(x, y, z)
-    glEnd()
+        GL.glVertex3f(x, y, z)
+    GL.glEnd()
     
-    glPopMatrix()
-    glEnable(GL_LIGHTING)
+    GL.glPopMatrix()
+    GL.glEnable(GL.GL_LIGHTING)
 
 def main():
     """主函数"""
@@ -407,30 +410,35 @@ def main():
     pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLESAMPLES, 4)
     pygame.display.gl_set_attribute(pygame.GL_DEPTH_SIZE, 24)
     
-    display = pygame.display.set_mode((WIDTH, HEIGHT), DOUBLEBUF | OPENGL)
+    try:
+        pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.OPENGL)
+    except pygame.error as e:
+        print("OpenGL初始化失败:", e)
+        pygame.quit()
+        sys.exit(1)
     pygame.display.set_caption("太阳系模拟 - 3D增强版")
     
     # 设置视角 - 增加远裁剪面和近裁剪面
-    gluPerspective(45, (WIDTH / HEIGHT), 1.0, 5000.0)  # 远裁剪面从2000.0改为5000.0
-    glEnable(GL_DEPTH_TEST)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    GLU.gluPerspective(45, (WIDTH / HEIGHT), 1.0, 5000.0)  # 远裁剪面从2000.0改为5000.0
+    GL.glEnable(GL.GL_DEPTH_TEST)
+    GL.glEnable(GL.GL_BLEND)
+    GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
     
     # 关闭纹理（确保不会尝试使用不存在的纹理）
-    glDisable(GL_TEXTURE_2D)
+    GL.glDisable(GL.GL_TEXTURE_2D)
     
     # 增强光照设置
-    glEnable(GL_LIGHTING)
-    glEnable(GL_LIGHT0)
+    GL.glEnable(GL.GL_LIGHTING)
+    GL.glEnable(GL.GL_LIGHT0)
     light_ambient = [0.6, 0.6, 0.6, 1.0]  # 进一步增强环境光
     light_diffuse = [1.0, 1.0, 1.0, 1.0]  # 最亮的漫反射光
     light_specular = [1.0, 1.0, 1.0, 1.0]
     light_position = [0.0, 0.0, 0.0, 1.0]  # 光源位置在太阳处
     
-    glLightfv(GL_LIGHT0, GL_AMBIENT, light_ambient)
-    glLightfv(GL_LIGHT0, GL_DIFFUSE, light_diffuse)
-    glLightfv(GL_LIGHT0, GL_SPECULAR, light_specular)
-    glLightfv(GL_LIGHT0, GL_POSITION, light_position)
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_AMBIENT, light_ambient)
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_DIFFUSE, light_diffuse)
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_SPECULAR, light_specular)
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_POSITION, light_position)
     
     print("初始化OpenGL完成")
     
@@ -449,10 +457,11 @@ def main():
     
     # 生成星星数据（只生成一次）
     stars = []
+    rng = np.random.default_rng(SEED)
     for _ in range(2000):  # 增加星星数量
         distance = 900
-        theta = 2 * math.pi * np.random.random()
-        phi = math.acos(2 * np.random.random() - 1)
+        theta = 2 * math.pi * rng.random()
+        phi = math.acos(2 * rng.random() - 1)
         x = distance * math.sin(phi) * math.cos(theta)
         y = distance * math.sin(phi) * math.sin(theta)
         z = distance * math.cos(phi)
@@ -519,8 +528,8 @@ def main():
             camera.rotate(z=-1)
 
         # 清空缓冲区
-        glClearColor(0.0, 0.0, 0.05, 1.0)  # 深蓝色背景
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        GL.glClearColor(0.0, 0.0, 0.05, 1.0)  # 深蓝色背景
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
         
         # 应用摄像机
         camera.apply()
@@ -554,14 +563,5 @@ def main():
     pygame.quit()
 
 
-try:
-    display = pygame.display.set_mode((WIDTH, HEIGHT), DOUBLEBUF | OPENGL)
-except pygame.error as e:
-    print("OpenGL初始化失败:", e)
-    pygame.quit()
-    sys.exit(1)
-
-
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
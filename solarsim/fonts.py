@@ -0,0 +1,55 @@
+import json
+import os
+
+from solarsim.paths import CACHE_DIR
+
+# -------------------- 字体查找缓存 --------------------
+# pygame.font.SysFont 每次启动都会枚举系统字体（Linux 上调用 fc-list，Windows 上读注册表），
+# 这里把 "字体名 → 文件路径" 的结果缓存到磁盘，之后直接用 pygame.font.Font(路径) 加载。
+CACHE_PATH = os.path.join(CACHE_DIR, 'fonts.json')
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=1)
+    except OSError:
+        pass
+
+def font_path(names, refresh=False):
+    """按顺序查找第一个可用的字体，返回文件路径；都找不到时返回 None（pygame 默认字体）
+
+    未找到的结果也会缓存，安装新字体后用 refresh=True 或删除缓存文件重新查找。
+    """
+    key = ",".join(names)
+    cache = _load_cache()
+    if not refresh and key in cache:
+        path = cache[key]
+        if path is None or os.path.exists(path):
+            return path
+
+    import pygame.font
+    path = None
+    for name in names:
+        path = pygame.font.match_font(name)
+        if path:
+            break
+    cache[key] = path
+    _save_cache(cache)
+    return path
+
+def load_font(names, size):
+    """names: 候选字体名（字符串或元组）；None 表示 pygame 默认字体，不需要枚举系统字体"""
+    import pygame
+    if names is None:
+        return pygame.font.Font(None, size)
+    if isinstance(names, str):
+        names = (names,)
+    return pygame.font.Font(font_path(names), size)
@@ -0,0 +1,113 @@
+import json
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+# -------------------- 分阶段帧剖析器 --------------------
+_NULL_PHASE = nullcontext()
+
+class _Phase:
+    """可复用的计时上下文，每个阶段一个，进入时不分配新对象"""
+    __slots__ = ('profiler', 'row', 'start')
+
+    def __init__(self, profiler, row):
+        self.profiler = profiler
+        self.row = row
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.row, self.start, time.perf_counter())
+        return False
+
+class FrameProfiler:
+    """记录每帧各阶段的耗时
+
+    每个阶段一个固定容量的环形缓冲（开始时间和耗时），只保留最近 capacity 次采样，
+    内存不随运行时间增长。关闭时 phase() 直接返回共享的空上下文，不计时也不写缓冲。
+
+    用法:
+        with profiler.phase('update'):
+            ...
+    """
+    def __init__(self, phases, capacity=600, enabled=False, refresh=30):
+        self.phases = list(phases)
+        self.capacity = capacity
+        self.enabled = enabled
+        self.refresh = refresh          # 统计结果每隔多少帧重新计算一次
+        self.origin = time.perf_counter()
+        self.starts = np.zeros((len(self.phases), capacity))
+        self.durations = np.zeros((len(self.phases), capacity))
+        self.counts = np.zeros(len(self.phases), dtype=np.int64)
+        self._contexts = {name: _Phase(self, row) for row, name in enumerate(self.phases)}
+        self.frames = 0
+        self._summary = []
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._contexts[name]
+
+    def _record(self, row, start, end):
+        slot = self.counts[row] % self.capacity
+        self.starts[row, slot] = start - self.origin
+        self.durations[row, slot] = end - start
+        self.counts[row] += 1
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+
+    def reset(self):
+        self.counts[:] = 0
+        self.frames = 0
+        self._summary = []
+
+    def end_frame(self):
+        if self.enabled:
+            self.frames += 1
+
+    def _samples(self, row):
+        count = min(self.counts[row], self.capacity)
+        return self.starts[row, :count], self.durations[row, :count]
+
+    def percentiles(self, q=(50, 95, 99)):
+        """阶段名 → 各分位的耗时（毫秒），没有采样的阶段不出现"""
+        result = {}
+        for row, name in enumerate(self.phases):
+            _, durations = self._samples(row)
+            if len(durations):
+                result[name] = np.percentile(durations, q) * 1000.0
+        return result
+
+    def summary(self):
+        """供界面显示的统计行；每 refresh 帧才重算一次，面板纹理不必每帧重建"""
+        if not self._summary or self.frames % self.refresh == 0:
+            self._summary = ["阶段      p50   p95   p99 (ms)"] + [
+                f"{name:<8}{p50:6.1f}{p95:6.1f}{p99:6.1f}"
+                for name, (p50, p95, p99) in self.percentiles().items()]
+        return self._summary
+
+    def chrome_trace(self, path):
+        """以 Chrome Trace Event 格式保存缓冲中的采样，可在 chrome://tracing 或 Perfetto 中打开"""
+        events = []
+        for row, name in enumerate(self.phases):
+            starts, durations = self._samples(row)
+            events += [{"name": name, "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                        "ts": round(start * 1e6, 3), "dur": round(duration * 1e6, 3)}
+                       for start, duration in zip(starts.tolist(), durations.tolist())]
+        events.sort(key=lambda event: event["ts"])
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def dump(self, directory="."):
+        """保存 Chrome 跟踪文件，返回文件路径"""
+        path = f"{directory}/{time.strftime('frame_trace_%Y%m%d_%H%M%S.json')}"
+        self.chrome_trace(path)
+        return path
@@ -0,0 +1,21 @@
+import struct
+import zlib
+import numpy as np
+
+# -------------------- PNG 编码 --------------------
+def encode_png(frame):
+    """frame: (H, W, 3) uint8，自上而下的行顺序"""
+    height, width, _ = frame.shape
+    # 每行前加过滤类型字节 0
+    raw = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = frame.reshape(height, -1)
+
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data
+                + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw.tobytes(), 6))
+            + chunk(b'IEND', b''))
@@ -0,0 +1,214 @@
+"""输入录制与确定性回放：把一次交互会话变成可重复的基准和回归测试
+
+用法:
+    python -m solarsim replay record session.jsonl                      # 正常操作模拟器，退出时保存
+    python -m solarsim replay replay session.jsonl --headless --fps 0   # 无窗口、不限帧率回放
+    python -m solarsim replay replay session.jsonl --realtime           # 窗口中按原始节奏回放
+
+记录文件为 JSON Lines：第一行是随机种子和影响场景的 Config 项，之后每次主循环迭代一行
+（迭代序号、相对时间、事件、Camera.handle_input 读取的持续按键），最后一行是结束时模拟状态的摘要。
+模拟器每次迭代只依赖事件、按键和固定的时间步长，回放时把同样的输入按迭代序号送入主循环，
+最终状态逐位相同；摘要不一致时返回 1。回放关闭自适应画质（它依赖墙钟时间），并开启帧剖析输出分位数。
+"""
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import time
+
+import numpy as np
+from solarsim.lazy import pygame
+
+RECORD_VERSION = 1
+# 决定场景内容的 Config 项，回放前恢复
+RECORDED_CONFIG = ('WIDTH', 'HEIGHT', 'SEED', 'SCENARIO', 'SCENARIO_PLANETS', 'BELT_COUNT', 'STAR_COUNT',
+                   'TRAIL_MODE', 'MAX_TRAIL_LENGTH', 'RENDERER', 'LABEL_BUDGET',
+                   'DEFAULT_SHOW_NAMES', 'DEFAULT_SHOW_ORBITS')
+# Camera.handle_input 每帧读取的持续按键（pygame 常量名，导入本模块时 pygame 尚未加载）
+HELD_KEYS = ('K_LEFT', 'K_RIGHT', 'K_UP', 'K_DOWN', 'K_LCTRL', 'K_RCTRL', 'K_q', 'K_e')
+# 事件中保存的属性（其余属性如窗口对象无法序列化，模拟器也不使用）
+EVENT_FIELDS = ('pos', 'rel', 'button', 'buttons', 'key', 'mod', 'unicode', 'scancode', 'x', 'y', 'w', 'h')
+
+# -------------------- 输入源 --------------------
+class LiveInput:
+    """实时输入：直接读取 pygame 事件队列和按键状态"""
+    def poll(self, block):
+        if block:
+            return [pygame.event.wait()] + pygame.event.get()
+        return pygame.event.get()
+
+    def pressed(self):
+        return pygame.key.get_pressed()
+
+class HeldKeys:
+    """按下的键码集合，可以像 pygame.key.get_pressed() 的结果一样按键码取值"""
+    __slots__ = ('keys',)
+
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+def encode_event(event):
+    return [event.type, {name: value for name, value in event.dict.items() if name in EVENT_FIELDS}]
+
+def decode_event(record):
+    event_type, attrs = record
+    return pygame.event.Event(event_type, {name: tuple(value) if isinstance(value, list) else value
+                                           for name, value in attrs.items()})
+
+class InputRecorder(LiveInput):
+    """读取实时输入的同时逐迭代写入记录文件"""
+    def __init__(self, path, config):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.frame = 0
+        self.held = HeldKeys()
+        self.start = time.perf_counter()
+        header = {"version": RECORD_VERSION,
+                  "config": {name: getattr(config, name) for name in RECORDED_CONFIG}}
+        self.write(header)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+    def poll(self, block):
+        events = super().poll(block)
+        keys = super().pressed()
+        # 本次迭代内看到的按键状态与记录的完全一致，回放时才能得到同样的摄像机运动
+        held = (getattr(pygame, name) for name in HELD_KEYS)
+        self.held = HeldKeys(key for key in held if keys[key])
+        record = {"frame": self.frame, "t": round(time.perf_counter() - self.start, 6)}
+        if events:
+            record["events"] = [encode_event(event) for event in events]
+        if self.held.keys:
+            record["keys"] = sorted(self.held.keys)
+        self.write(record)
+        self.frame += 1
+        return events
+
+    def pressed(self):
+        return self.held
+
+    def close(self, simulator=None):
+        # 不给模拟器时只关闭文件：没有结束记录，回放时不做摘要校验
+        if simulator is not None:
+            self.write({"end": self.frame, "digest": state_digest(simulator)})
+        self.file.close()
+
+class ReplayInput:
+    """按迭代序号送出记录的事件和按键；记录结束后送出 QUIT"""
+    def __init__(self, path, realtime=False):
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        header = lines[0]
+        if header.get("version") != RECORD_VERSION:
+            raise ValueError(f"不支持的记录版本: {header.get('version')}")
+        self.config = header["config"]
+        self.trailer = lines[-1] if "digest" in lines[-1] else None
+        self.records = [line for line in lines[1:] if "frame" in line]
+        self.realtime = realtime
+        self.frame = 0
+        self.held = HeldKeys()
+        self.start = None
+
+    def apply_config(self, config):
+        for name, value in self.config.items():
+            setattr(config, name, value)
+
+    def poll(self, block):
+        if self.frame >= len(self.records):
+            return [pygame.event.Event(pygame.QUIT)]
+        record = self.records[self.frame]
+        self.frame += 1
+        if self.realtime:
+            if self.start is None:
+                self.start = time.perf_counter() - record["t"]
+            delay = self.start + record["t"] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.held = HeldKeys(record.get("keys", ()))
+        return [decode_event(event) for event in record.get("events", ())]
+
+    def pressed(self):
+        return self.held
+
+def state_digest(simulator):
+    """模拟状态（天体位置、小行星带、摄像机、时间步长）的摘要，用于比较两次运行是否逐位相同"""
+    solar_system = simulator.solar_system
+    digest = hashlib.sha256()
+    for planet in solar_system.planets:
+        digest.update(struct.pack('<3d', planet.x, planet.y, planet.z))
+    digest.update(np.ascontiguousarray(solar_system.belt.instances).tobytes())
+    digest.update(repr((simulator.camera.state(), simulator.dt, simulator.paused,
+                        simulator.selection)).encode())
+    return digest.hexdigest()[:16]
+
+# -------------------- 命令行 --------------------
+def record(args):
+    from solarsim.solar_system_simulator import Config, SolarSystemSimulator
+    if args.seed is not None:
+        Config.SEED = args.seed
+    elif Config.SEED is None:
+        Config.SEED = int(np.random.SeedSequence().entropy % (1 << 32))
+    recorder = InputRecorder(args.path, Config)
+    simulator = SolarSystemSimulator()
+    simulator.input = recorder
+    simulator.run()
+    recorder.close(simulator)
+    print(f"已录制 {recorder.frame} 次迭代（种子 {Config.SEED}）到 {args.path}")
+    return 0
+
+def replay(args):
+    if args.headless:
+        # 必须在导入 PyOpenGL 之前选择离屏平台
+        from solarsim.offscreen_render import OffscreenSimulator as Simulator
+    else:
+        from solarsim.solar_system_simulator import SolarSystemSimulator as Simulator
+    from solarsim.solar_system_simulator import Config
+    source = ReplayInput(args.path, args.realtime)
+    source.apply_config(Config)
+    Config.ADAPTIVE_QUALITY = False
+    Config.PROFILE = True
+    if args.fps is not None:
+        Config.FPS = args.fps
+    simulator = Simulator()
+    simulator.input = source
+    start = time.perf_counter()
+    simulator.run()
+    elapsed = time.perf_counter() - start
+    print(f"回放 {source.frame} 次迭代，用时 {elapsed:.2f}s")
+    for line in simulator.profiler.summary():
+        print("  " + line)
+    if args.trace:
+        print(f"帧剖析已保存到 {simulator.profiler.dump(args.trace)}")
+    if hasattr(simulator, 'context'):
+        simulator.context.destroy()
+    digest = state_digest(simulator)
+    if source.trailer is None:
+        print(f"状态摘要 {digest}（记录中没有摘要，无法比较）")
+        return 0
+    if digest != source.trailer["digest"]:
+        print(f"状态摘要不一致: 回放 {digest}，记录 {source.trailer['digest']}")
+        return 1
+    print(f"状态摘要一致 {digest}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="输入录制与确定性回放")
+    sub = parser.add_subparsers(dest='mode', required=True)
+    rec = sub.add_parser('record', help="录制一次交互会话")
+    rec.add_argument('path')
+    rec.add_argument('--seed', type=int, help="随机种子，默认随机选定并写入记录")
+    rep = sub.add_parser('replay', help="回放记录文件")
+    rep.add_argument('path')
+    rep.add_argument('--headless', action='store_true', help="离屏渲染，不打开窗口")
+    rep.add_argument('--realtime', action='store_true', help="按录制时的节奏回放")
+    rep.add_argument('--fps', type=float, help="帧率上限，0 表示不限")
+    rep.add_argument('--trace', metavar='DIR', help="保存帧剖析结果的目录")
+    args = parser.parse_args()
+    return record(args) if args.mode == 'record' else replay(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
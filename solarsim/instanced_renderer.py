@@ -0,0 +1,196 @@
+from solarsim.lazy import GL, shaders
+import ctypes
+import numpy as np
+
+# -------------------- 着色器 --------------------
+# 仅使用 core profile 功能（VAO/VBO/GLSL 330），在 Mesa llvmpipe 上同样可用
+VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec4 a_instance;   // xyz = 位置, w = 半径（负值表示自发光）
+layout(location = 2) in vec4 a_color;      // rgb = 颜色, a = 自转角(度)
+
+uniform mat4 u_view_proj;
+
+out vec3 v_normal;
+out vec3 v_world;
+out vec3 v_color;
+flat out float v_emissive;
+
+void main() {
+    float spin = radians(a_color.a);
+    float c = cos(spin), s = sin(spin);
+    // 绕 Y 轴自转，与 glRotatef(angle, 0, 1, 0) 一致
+    vec3 p = vec3(c * a_position.x + s * a_position.z,
+                  a_position.y,
+                  -s * a_position.x + c * a_position.z);
+    v_normal = p;
+    v_world = a_instance.xyz + p * abs(a_instance.w);
+    v_color = a_color.rgb;
+    v_emissive = a_instance.w < 0.0 ? 1.0 : 0.0;
+    gl_Position = u_view_proj * vec4(v_world, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330 core
+in vec3 v_normal;
+in vec3 v_world;
+in vec3 v_color;
+flat in float v_emissive;
+
+uniform vec3 u_light_pos;
+uniform float u_ambient;
+
+out vec4 frag_color;
+
+void main() {
+    vec3 n = normalize(v_normal);
+    vec3 l = normalize(u_light_pos - v_world);
+    float diffuse = max(dot(n, l), 0.0);
+    // 自发光天体（太阳）包着光源，不参与光照，直接输出本色
+    float light = mix(u_ambient + diffuse, 1.0, v_emissive);
+    frag_color = vec4(min(v_color * light, 1.0), 1.0);
+}
+"""
+
+# 每个实例 8 个 float32: x, y, z, 半径, r, g, b, 自转角
+# 半径取负值表示自发光（不受光照），不必为一个标志再加一列
+INSTANCE_STRIDE = 8
+
+def sphere_mesh(slices, stacks):
+    """生成单位球的顶点（同时作为法线）和三角形索引"""
+    theta = np.linspace(0, np.pi, stacks + 1)
+    phi = np.linspace(0, 2*np.pi, slices + 1)
+    t, p = np.meshgrid(theta, phi, indexing='ij')
+    vertices = np.stack([np.sin(t)*np.cos(p), np.cos(t), np.sin(t)*np.sin(p)], axis=-1)
+
+    rows = np.arange(stacks)[:, None] * (slices + 1)
+    cols = np.arange(slices)[None, :]
+    a = (rows + cols).ravel()
+    b = a + slices + 1
+    indices = np.stack([a, b, a + 1, a + 1, b, b + 1], axis=-1)
+    return (np.ascontiguousarray(vertices.reshape(-1, 3), dtype=np.float32),
+            np.ascontiguousarray(indices.ravel(), dtype=np.uint32))
+
+# -------------------- 实例化渲染器 --------------------
+class InstancedRenderer:
+    """用一次实例化绘制调用渲染所有天体；每个 LOD 级别一次调用"""
+    # (经度细分, 纬度细分, 屏幕半径像素阈值)：屏幕上越小的天体使用越粗的网格，
+    # 最低一级是八面体，用于不足几个像素的小天体
+    LODS = [(32, 16, 24), (12, 6, 4), (4, 2, 0)]
+
+    def __init__(self, viewport_height, fovy):
+        self.program = shaders.compileProgram(
+            shaders.compileShader(VERTEX_SHADER, GL.GL_VERTEX_SHADER),
+            shaders.compileShader(FRAGMENT_SHADER, GL.GL_FRAGMENT_SHADER),
+            validate=False)  # core profile 下未绑定 VAO 时校验会误报
+        self.u_view_proj = GL.glGetUniformLocation(self.program, "u_view_proj")
+        self.u_light_pos = GL.glGetUniformLocation(self.program, "u_light_pos")
+        self.u_ambient = GL.glGetUniformLocation(self.program, "u_ambient")
+        # 像素/世界单位 在距离 1 处的换算系数，用于估计屏幕半径
+        self.pixel_scale = viewport_height / (2 * np.tan(np.radians(fovy) / 2))
+        self.lod_bias = 1.0
+
+        self.instance_vbo = GL.glGenBuffers(1)
+        self.instance_capacity = 0
+        # 上一帧的 LOD 分配和对应的排列，分配不变时直接复用
+        self.levels = None
+        self.order = None
+        self.bounds = None
+        self.sorted = np.zeros((0, INSTANCE_STRIDE), dtype=np.float32)
+        self.meshes = [self._create_mesh(slices, stacks) for slices, stacks, _ in self.LODS]
+
+    @classmethod
+    def create(cls, viewport_height, fovy):
+        """创建渲染器；驱动不支持 GLSL 330 时返回 None，调用方回退到固定管线"""
+        try:
+            return cls(viewport_height, fovy)
+        except Exception as e:
+            print("实例化渲染器不可用，回退到固定管线:", e)
+            return None
+
+    def _create_mesh(self, slices, stacks):
+        vertices, indices = sphere_mesh(slices, stacks)
+        vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(vao)
+
+        vbo, ibo = GL.glGenBuffers(2)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_STATIC_DRAW)
+        GL.glEnableVertexAttribArray(0)
+        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, None)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, ibo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL.GL_STATIC_DRAW)
+
+        # 所有网格共享同一个实例缓冲，指针偏移在绘制时设置
+        for location in (1, 2):
+            GL.glEnableVertexAttribArray(location)
+            GL.glVertexAttribDivisor(location, 1)
+
+        GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        return vao, len(indices)
+
+    def _point_instances(self, first):
+        """把实例属性指向缓冲中的第 first 个实例（GL 3.3 没有 BaseInstance）"""
+        stride = INSTANCE_STRIDE * 4
+        offset = first * stride
+        GL.glVertexAttribPointer(1, 4, GL.GL_FLOAT, GL.GL_FALSE, stride, ctypes.c_void_p(offset))
+        GL.glVertexAttribPointer(2, 4, GL.GL_FLOAT, GL.GL_FALSE, stride, ctypes.c_void_p(offset + 16))
+
+    def _upload(self, instances):
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.instance_vbo)
+        if len(instances) > self.instance_capacity:
+            self.instance_capacity = max(len(instances), 2 * self.instance_capacity)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, self.instance_capacity * INSTANCE_STRIDE * 4,
+                            None, GL.GL_STREAM_DRAW)
+        GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, instances.nbytes, instances)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def _sort_by_lod(self, instances, eye):
+        """按屏幕半径把实例分到各 LOD 区段，返回排序后的数组和各区段边界
+
+        只有 LOD 分配变化时才重新分区（计数分区，各级别内保持原顺序），
+        排序结果写入复用的缓冲区
+        """
+        distance = np.linalg.norm(instances[:, :3] - eye, axis=1)
+        screen_radius = np.abs(instances[:, 3]) * self.pixel_scale * self.lod_bias / np.maximum(distance, 1e-6)
+        level = np.zeros(len(instances), dtype=np.intp)
+        for *_, threshold in self.LODS[:-1]:
+            level += screen_radius < threshold
+        if self.levels is None or not np.array_equal(level, self.levels):
+            self.levels = level
+            self.order = np.concatenate([np.flatnonzero(level == k) for k in range(len(self.LODS))])
+            counts = np.bincount(level, minlength=len(self.LODS))
+            self.bounds = np.concatenate([[0], np.cumsum(counts)])
+        if len(self.sorted) < len(instances):
+            self.sorted = np.zeros((max(len(instances), 2 * len(self.sorted)), INSTANCE_STRIDE),
+                                   dtype=np.float32)
+        ordered = self.sorted[:len(instances)]
+        np.take(instances, self.order, axis=0, out=ordered)
+        return ordered, self.bounds
+
+    def draw(self, instances, view, projection, light_pos=(0.0, 0.0, 0.0), ambient=0.6):
+        """instances: (N, 8) float32 数组，每行 x, y, z, 半径, r, g, b, 自转角；半径为负表示自发光"""
+        if len(instances) == 0:
+            return
+        eye = np.linalg.inv(view)[:3, 3]
+        instances, bounds = self._sort_by_lod(np.asarray(instances, dtype=np.float32), eye)
+        self._upload(instances)
+
+        GL.glUseProgram(self.program)
+        GL.glUniformMatrix4fv(self.u_view_proj, 1, GL.GL_TRUE,
+                              (projection @ view).astype(np.float32))
+        GL.glUniform3f(self.u_light_pos, *light_pos)
+        GL.glUniform1f(self.u_ambient, ambient)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.instance_vbo)
+        for (vao, index_count), start, end in zip(self.meshes, bounds[:-1], bounds[1:]):
+            if end > start:
+                GL.glBindVertexArray(vao)
+                self._point_instances(int(start))
+                GL.glDrawElementsInstanced(GL.GL_TRIANGLES, index_count, GL.GL_UNSIGNED_INT,
+                                           None, int(end - start))
+        GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glUseProgram(0)
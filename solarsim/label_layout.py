@@ -0,0 +1,67 @@
+import numpy as np
+
+# -------------------- 标签排布 --------------------
+class LabelPlacer:
+    """屏幕空间标签去重叠
+
+    按优先级从高到低贪心放置标签矩形，用均匀网格分桶只检查同一格子里的已放置标签。
+    候选先用 argpartition 截断为 budget * oversample 个，因此每帧开销只与预算有关，
+    与天体总数无关。
+    """
+    def __init__(self, width, height, cell_size=64, budget=50, oversample=4):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.budget = budget
+        self.oversample = oversample
+        self.cols = int(np.ceil(width / cell_size))
+        self.rows = int(np.ceil(height / cell_size))
+
+    def candidates(self, priority):
+        """返回按优先级降序排列、数量有上限的候选下标"""
+        priority = np.asarray(priority)
+        limit = self.budget * self.oversample
+        if len(priority) > limit:
+            top = np.argpartition(-priority, limit)[:limit]
+        else:
+            top = np.arange(len(priority))
+        return top[np.argsort(-priority[top], kind='stable')]
+
+    def place(self, rects, order):
+        """rects: (N, 4) 的 x0, y0, x1, y1；order: 候选下标（已按优先级排序）
+
+        返回互不重叠、最多 budget 个的下标列表。
+        """
+        grid = {}
+        placed = []
+        for i in order:
+            if len(placed) >= self.budget:
+                break
+            x0, y0, x1, y1 = rects[i]
+            if x1 < 0 or y1 < 0 or x0 > self.width or y0 > self.height:
+                continue
+            cells = self._cells(x0, y0, x1, y1)
+            if any(self._overlaps(rects[j], x0, y0, x1, y1)
+                   for cell in cells for j in grid.get(cell, ())):
+                continue
+            for cell in cells:
+                grid.setdefault(cell, []).append(i)
+            placed.append(i)
+        return placed
+
+    def _cells(self, x0, y0, x1, y1):
+        c0 = max(0, int(x0 // self.cell_size))
+        c1 = min(self.cols - 1, int(x1 // self.cell_size))
+        r0 = max(0, int(y0 // self.cell_size))
+        r1 = min(self.rows - 1, int(y1 // self.cell_size))
+        # 格子编号用整数 r * cols + c，不为每个格子创建元组
+        return [r * self.cols + c for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)]
+
+    @staticmethod
+    def _overlaps(rect, x0, y0, x1, y1):
+        return not (rect[2] <= x0 or x1 <= rect[0] or rect[3] <= y0 or y1 <= rect[1])
+
+def label_priority(masses, radii, distances):
+    """质量越大、看起来越大（半径/距离）的天体优先显示标签"""
+    return (np.log10(np.maximum(masses, 1.0))
+            + 2.0 * np.log10(np.maximum(radii, 1e-6) / np.maximum(distances, 1e-6)))
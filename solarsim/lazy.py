@@ -0,0 +1,19 @@
+import importlib
+import types
+
+# -------------------- 延迟导入 --------------------
+# pygame 和 PyOpenGL 的导入合计约 0.4 秒，而且 PyOpenGL 在导入时就选定了平台（EGL/GLX/OSMesa）。
+# 各模块通过这里的代理访问它们：导入模块本身不加载 pygame/OpenGL，第一次访问属性
+# （通常是 main() 里的 pygame.init() 或第一条 GL 调用）时才真正导入。
+class LazyModule(types.ModuleType):
+    """第一次访问属性时才导入的模块代理"""
+    def __getattr__(self, attr):
+        # 只在普通属性查找失败时调用：导入后把模块的属性复制过来，之后的访问与普通模块相同
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+pygame = LazyModule('pygame')
+GL = LazyModule('OpenGL.GL')
+GLU = LazyModule('OpenGL.GLU')
+shaders = LazyModule('OpenGL.GL.shaders')
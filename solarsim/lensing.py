@@ -0,0 +1,142 @@
+"""背景星空的实时引力透镜
+
+星体在无穷远处，真实方向固定。观察者看到的方向由偏折角表一次向量化插值得到，
+每帧的开销只与星体数量成线性关系，不做任何测地线积分。
+"""
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from solarsim.black_hole_raytracer import periapsis, rk4_step
+from solarsim.paths import CACHE_DIR
+
+# -------------------- 归一化偏折曲线 --------------------
+class DeflectionCurve:
+    """来自无穷远的光线：x = b / rs → 从近心点到无穷远扫过的角度 φ∞(x)
+
+    比奈方程以 rs 为单位归一化后与黑洞质量无关，因此曲线只需积分一次并缓存到磁盘；
+    质量变化时只需按新的 rs 换算冲击参数，相当于对表做一次缩放。
+    """
+    CRITICAL = 1.5 * math.sqrt(3.0)
+
+    def __init__(self, samples=2048, x_max=1e4, step=0.002, data=None):
+        if data is None:
+            data = self._compute(samples, x_max, step)
+        self.x, self.phi = data
+
+    @classmethod
+    def cached(cls, samples=2048, x_max=1e4, step=0.002, cache_dir=CACHE_DIR):
+        key = hashlib.sha256(repr(('curve', samples, x_max, step)).encode()).hexdigest()[:16]
+        path = os.path.join(cache_dir, f"deflection_curve_{key}.npz")
+        if os.path.exists(path):
+            with np.load(path) as f:
+                return cls(data=(f['x'], f['phi']))
+        curve = cls(samples, x_max, step)
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, x=curve.x, phi=curve.phi)
+        return curve
+
+    def _compute(self, samples, x_max, step):
+        # 靠近临界冲击参数时绕行角按对数发散，用几何间距加密采样
+        x = self.CRITICAL + np.geomspace(1e-6, x_max - self.CRITICAL, samples)
+        # 从近心点 (du = 0) 出发向外积分，直到 u 穿过 0
+        u, du = 1.0 / periapsis(x, 1.0), np.zeros(samples)
+        phi = np.full(samples, np.nan)
+        active = np.arange(samples)
+        swept = 0.0
+        while len(active):
+            new_u, new_du = rk4_step(u, du, step, 1.0)
+            escaped = new_u <= 0
+            phi[active[escaped]] = swept + step * u[escaped] / (u[escaped] - new_u[escaped])
+            swept += step
+            keep = ~escaped
+            active, u, du = active[keep], new_u[keep], new_du[keep]
+        return x, phi
+
+    def phi_infinity(self, x):
+        """超出表范围的远场用弱场近似 π/2 + 1/x（总偏折角 2rs/b 的一半）"""
+        x = np.asarray(x, dtype=np.float64)
+        return np.where(x > self.x[-1], math.pi / 2 + 1.0 / np.maximum(x, 1.0),
+                        np.interp(x, self.x, self.phi))
+
+# -------------------- 星空透镜 --------------------
+class StarfieldLens:
+    """把星体的真实方向映射为观察者看到的方向
+
+    θ 为像与"指向黑洞方向"的夹角，β 为星体真实方向与该方向的夹角。主像位于星体同侧，
+    θ₁ = θ(β)；次像位于黑洞另一侧，θ₂ = θ(-β)。像方向可以写成
+        A(β) · 视轴 + B(β) · 星体方向
+    set_rs 在均匀的 β 网格上预先算好 A、B 和亮度，每帧每颗星只需一次 arccos 和几次查表。
+    """
+    def __init__(self, directions, observer_distance, rs, curve=None, samples=4096, resolution=65536):
+        directions = np.asarray(directions, dtype=np.float32)
+        self.directions = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+        self.observer_distance = observer_distance
+        self.samples = samples
+        self.resolution = resolution
+        self.curve = curve or DeflectionCurve.cached()
+        self.set_rs(rs)
+
+    def set_rs(self, rs):
+        """黑洞质量变化后刷新查找表：只对归一化曲线做插值，不重新积分"""
+        self.rs = rs
+        theta, beta, magnification = self._image_table(rs)
+
+        # 均匀 β 网格（取格子中心，避开 β = 0 和 π 处的奇点）
+        grid = (np.arange(self.resolution) + 0.5) * (math.pi / self.resolution)
+        sin_b, cos_b = np.sin(grid), np.cos(grid)
+        tables = []
+        for sign in (1.0, -1.0):
+            t = np.interp(sign * grid, beta, theta)
+            brightness = np.interp(sign * grid, beta, magnification)
+            if sign < 0:
+                # 次像只存在于表覆盖的范围内
+                brightness = np.where(-grid >= beta[0], brightness, 0.0)
+            sin_t, cos_t = np.sin(t), np.cos(t)
+            tables += [cos_t - sign * sin_t * cos_b / sin_b,   # A
+                       sign * sin_t / sin_b,                   # B
+                       np.clip(brightness, 0.0, 4.0)]
+        self.tables = [np.asarray(table, dtype=np.float32) for table in tables]
+
+    def _image_table(self, rs):
+        """在 θ 上采样，返回单调的 (θ, β(θ), 放大率)"""
+        D = self.observer_distance
+        redshift = math.sqrt(1.0 - rs / D)
+        # 临界冲击参数对应的像角即黑洞阴影的边缘
+        shadow = math.asin(min(DeflectionCurve.CRITICAL * rs * redshift / D, 1.0))
+        theta = shadow + np.geomspace(1e-7, math.pi - shadow, self.samples)
+        sin_t, cos_t = np.sin(theta), np.cos(theta)
+        b = D * sin_t / redshift
+        # 观察者到无穷远这一段扫过的角度（一阶弱场近似，rs/D 很小时足够精确）
+        tail = np.arcsin(np.minimum(sin_t, 1.0)) + rs / b * (1.0 - np.abs(cos_t))
+        # 射向黑洞的光线先经过近心点，背离黑洞的光线直接逃逸
+        swept = np.where(cos_t > 0, 2.0 * self.curve.phi_infinity(b / rs) - tail, tail)
+        beta = math.pi - swept
+        # 只保留绕行不超过一圈的像，并保证 β 单调以便插值
+        keep = beta >= -math.pi
+        theta, beta = theta[keep], np.maximum.accumulate(beta[keep])
+        # 放大率 μ = (sinθ / sinβ) · dθ/dβ，决定像的亮度
+        slope = np.gradient(theta, beta)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            magnification = np.abs(np.sin(theta) / np.sin(beta) * slope)
+        return theta, beta, np.nan_to_num(magnification, nan=1.0, posinf=4.0)
+
+    def apparent(self, observer):
+        """observer: 观察者在世界坐标中的位置（黑洞位于原点）
+
+        返回 (主像方向, 主像亮度, 次像方向, 次像亮度)，方向为 (N, 3) float32 单位向量。
+        """
+        axis = -np.asarray(observer, dtype=np.float32)
+        axis /= np.linalg.norm(axis)
+        cos_beta = np.clip(self.directions @ axis, -1.0, 1.0)
+        index = np.arccos(cos_beta) * np.float32(self.resolution / math.pi)
+        index = np.minimum(index.astype(np.int32), self.resolution - 1)
+
+        images = []
+        for a, b, brightness in (self.tables[:3], self.tables[3:]):
+            direction = b[index][:, None] * self.directions
+            direction += a[index][:, None] * axis
+            images += [direction, brightness[index]]
+        return tuple(images)
@@ -0,0 +1,210 @@
+"""无窗口离屏渲染：按脚本化的摄像机路径以固定分辨率和帧率导出图像序列
+
+用法:
+    python -m solarsim offscreen --frames 600 --fps 30 --size 1920x1080 --out frames
+
+默认使用 EGL 软件/硬件上下文；设置环境变量 PYOPENGL_PLATFORM=osmesa 可改用 OSMesa。
+渲染不受实时时钟限制，帧读回直接写入预分配的 NumPy 数组，
+PNG/原始数据编码和写盘在线程池中完成，GL 线程不会等待磁盘。
+"""
+import os
+
+# 必须在导入 PyOpenGL / pygame 之前选择平台
+PLATFORM = os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+if PLATFORM == 'egl':
+    os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import argparse
+import ctypes
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from solarsim.image_io import encode_png
+from solarsim.lazy import GL
+from solarsim.solar_system_simulator import Config, SolarSystemSimulator
+
+# -------------------- 离屏上下文 --------------------
+class EGLContext:
+    def __init__(self, width, height):
+        from OpenGL import EGL
+        self.egl = EGL
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        if not EGL.eglInitialize(self.display, None, None):
+            raise RuntimeError("eglInitialize 失败")
+        config_attrs = (EGL.EGLint * 13)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE)
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        EGL.eglChooseConfig(self.display, config_attrs, ctypes.pointer(config), 1, ctypes.pointer(count))
+        if count.value == 0:
+            raise RuntimeError("没有可用的 EGL 配置")
+        surface_attrs = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, surface_attrs)
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context):
+            raise RuntimeError("eglMakeCurrent 失败")
+
+    def destroy(self):
+        EGL = self.egl
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglTerminate(self.display)
+
+class OSMesaContext:
+    def __init__(self, width, height):
+        from OpenGL import osmesa
+        self.osmesa = osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context:
+            raise RuntimeError("OSMesaCreateContextExt 失败")
+        self.buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL.GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("OSMesaMakeCurrent 失败")
+
+    def destroy(self):
+        self.osmesa.OSMesaDestroyContext(self.context)
+
+def create_context(width, height):
+    if PLATFORM == 'osmesa':
+        return OSMesaContext(width, height)
+    return EGLContext(width, height)
+
+# -------------------- 帧读回和编码 --------------------
+class FrameExporter:
+    """GL 线程把像素读进空闲缓冲后立即返回，编码和写盘交给线程池"""
+    def __init__(self, width, height, out_dir, fmt='png', workers=None):
+        self.width, self.height = width, height
+        self.out_dir = out_dir
+        self.fmt = fmt
+        workers = workers or os.cpu_count()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        # 编码比渲染慢时缓冲数量不再增长，GL 线程等待最早提交的一帧写完
+        self.max_buffers = 2 * workers
+        self.allocated = 0
+        self.free_buffers = []
+        self.pending = deque()  # (future, 缓冲)，按提交顺序
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _reclaim(self, block):
+        while self.pending and (block or self.pending[0][0].done()):
+            future, frame = self.pending.popleft()
+            future.result()
+            self.free_buffers.append(frame)
+            block = False
+
+    def _acquire(self):
+        self._reclaim(block=False)
+        if not self.free_buffers:
+            if self.allocated < self.max_buffers:
+                self.allocated += 1
+                return np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._reclaim(block=True)
+        return self.free_buffers.pop()
+
+    def capture(self, index):
+        frame = self._acquire()
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        # 直接读入 NumPy 缓冲，不经过中间 bytes 对象
+        GL.glReadPixels(0, 0, self.width, self.height, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, frame.ctypes.data)
+        self.pending.append((self.pool.submit(self._write, frame, index), frame))
+
+    def _write(self, frame, index):
+        # GL 的行顺序是自下而上，翻转为视图，不复制
+        image = frame[::-1]
+        if self.fmt == 'png':
+            path = os.path.join(self.out_dir, f"frame_{index:06d}.png")
+            data = encode_png(image)
+        else:
+            path = os.path.join(self.out_dir, f"frame_{index:06d}.rgb")
+            data = np.ascontiguousarray(image).tobytes()
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self._reclaim(block=False)
+
+# -------------------- 摄像机路径 --------------------
+class CameraPath:
+    """按时间对摄像机旋转和缩放做线性插值的关键帧路径"""
+    DEFAULT_KEYFRAMES = [
+        {"time": 0.0, "rotation": [30.0, 0.0, 0.0], "zoom": 1.0},
+        {"time": 10.0, "rotation": [45.0, 180.0, 0.0], "zoom": 0.6},
+        {"time": 20.0, "rotation": [30.0, 360.0, 0.0], "zoom": 1.0},
+    ]
+
+    def __init__(self, keyframes=None):
+        keyframes = sorted(keyframes or self.DEFAULT_KEYFRAMES, key=lambda k: k["time"])
+        self.times = np.array([k["time"] for k in keyframes])
+        self.rotations = np.array([k["rotation"] for k in keyframes])
+        self.zooms = np.array([k["zoom"] for k in keyframes])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    def apply(self, camera, t):
+        camera.rotation = [float(np.interp(t, self.times, self.rotations[:, i])) for i in range(3)]
+        camera.zoom_level = float(np.interp(t, self.times, self.zooms))
+
+# -------------------- 离屏模拟器 --------------------
+class OffscreenSimulator(SolarSystemSimulator):
+    def _init_opengl(self):
+        self.context = create_context(Config.WIDTH, Config.HEIGHT)
+        self._init_gl_state()
+
+    def _present(self):
+        # 没有窗口可交换，等待渲染完成，使帧计时与窗口模式可比
+        GL.glFinish()
+
+    def render_frames(self, path, exporter, frame_count, fps):
+        for index in range(frame_count):
+            path.apply(self.camera, index / fps)
+            self._update()
+            self._render()
+            exporter.capture(index)
+
+def main():
+    parser = argparse.ArgumentParser(description="离屏渲染太阳系动画帧")
+    parser.add_argument('--out', default='frames', help="输出目录")
+    parser.add_argument('--size', default=f"{Config.WIDTH}x{Config.HEIGHT}", help="分辨率，如 1920x1080")
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--frames', type=int, help="帧数，默认覆盖整条摄像机路径")
+    parser.add_argument('--path', help="摄像机关键帧 JSON 文件")
+    parser.add_argument('--format', choices=('png', 'raw'), default='png')
+    parser.add_argument('--workers', type=int, help="编码线程数")
+    args = parser.parse_args()
+
+    Config.WIDTH, Config.HEIGHT = map(int, args.size.lower().split('x'))
+    path = CameraPath.load(args.path) if args.path else CameraPath()
+    frame_count = args.frames or int(path.duration * args.fps) + 1
+
+    simulator = OffscreenSimulator()
+    exporter = FrameExporter(Config.WIDTH, Config.HEIGHT, args.out, args.format, args.workers)
+    start = time.perf_counter()
+    simulator.render_frames(path, exporter, frame_count, args.fps)
+    exporter.close()
+    elapsed = time.perf_counter() - start
+    print(f"{frame_count} 帧 ({Config.WIDTH}x{Config.HEIGHT}) 用时 {elapsed:.1f}s，"
+          f"{frame_count / elapsed:.1f} 帧/秒，输出到 {args.out}")
+    simulator.context.destroy()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+
+# -------------------- 磁盘缓存位置 --------------------
+# 偏折角表、透镜表、天体目录和字体查找结果都缓存在这个目录下
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', '3d-solar-system')
@@ -0,0 +1,125 @@
+import math
+import numpy as np
+
+# -------------------- 包围体层次结构 --------------------
+class SphereBVH:
+    """球体集合上的 BVH，用于鼠标射线拾取
+
+    先按 Morton 码排序，再把连续的 leaf_size 个球分为一片叶子，叶子之上是隐式的
+    完全 branching 叉树（每层一个数组，节点 i 的子节点为 i*B ... i*B+B-1），
+    构建和重新拟合都是逐层的 NumPy 归约，没有 Python 级的逐节点循环。
+    天体移动后只需 refit 更新包围盒；包围盒膨胀过多时才重新排序构建。
+    """
+    def __init__(self, centers, radii, leaf_size=16, branching=8, rebuild_factor=2.0):
+        self.leaf_size = leaf_size
+        self.branching = branching
+        self.rebuild_factor = rebuild_factor
+        self.build(centers, radii)
+
+    def build(self, centers, radii):
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        self.count = len(centers)
+        depth = max(1, round(math.log(max(self.count / self.leaf_size, 1), self.branching)))
+        leaves = self.branching ** depth
+        per_leaf = max(1, math.ceil(self.count / leaves))
+
+        # 叶子成员表，空位指向哨兵下标 count（包围盒为空，永远不会命中）
+        order = np.argsort(self._morton_codes(centers), kind='stable')
+        members = np.full(leaves * per_leaf, self.count, dtype=np.int64)
+        members[:self.count] = order
+        self.members = members.reshape(leaves, per_leaf)
+        self.depth = depth
+        self.refit(centers, radii, allow_rebuild=False)
+        self.built_extent = self._mean_leaf_extent()
+
+    @staticmethod
+    def _morton_codes(centers):
+        # 每轴 10 位量化后交错成 30 位 Morton 码，空间上相近的球排在一起
+        low, high = centers.min(axis=0), centers.max(axis=0)
+        grid = ((centers - low) / np.maximum(high - low, 1e-12) * 1023).astype(np.uint32)
+        codes = np.zeros(len(centers), dtype=np.uint32)
+        for bit in range(10):
+            for axis in range(3):
+                codes |= ((grid[:, axis] >> bit) & 1) << (3 * bit + axis)
+        return codes
+
+    def refit(self, centers, radii, allow_rebuild=True):
+        """按新位置自底向上更新所有包围盒"""
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centers),))
+        if len(centers) != self.count:
+            self.build(centers, radii)
+            return
+        # 按叶子顺序重排球心和半径，查询时每片叶子的数据是连续的；
+        # 末尾的哨兵半径为 -1，不会命中，也不参与包围盒
+        self.leaf_centers = np.vstack([centers, np.zeros((1, 3))])[self.members]
+        self.leaf_radii = np.append(radii, -1.0)[self.members]
+        padding = (self.leaf_radii < 0)[:, :, None]
+        extent = np.abs(self.leaf_radii)[:, :, None]
+        lower = np.where(padding, np.inf, self.leaf_centers - extent).min(axis=1)
+        upper = np.where(padding, -np.inf, self.leaf_centers + extent).max(axis=1)
+
+        # 每层一个 (节点数, 2, 3) 数组：[下界, 上界]
+        self.bounds = [None] * (self.depth + 1)
+        self.bounds[-1] = np.stack([lower, upper], axis=1)
+        for level in range(self.depth - 1, -1, -1):
+            grouped = self.bounds[level + 1].reshape(-1, self.branching, 2, 3)
+            self.bounds[level] = np.stack([grouped[:, :, 0].min(axis=1),
+                                           grouped[:, :, 1].max(axis=1)], axis=1)
+
+        if allow_rebuild and self._mean_leaf_extent() > self.rebuild_factor * self.built_extent:
+            self.build(centers, radii)
+
+    def _mean_leaf_extent(self):
+        extent = self.bounds[-1][:, 1] - self.bounds[-1][:, 0]
+        extent = extent[np.all(np.isfinite(extent), axis=1)]
+        return np.linalg.norm(extent, axis=1).mean() if len(extent) else 0.0
+
+    def intersect(self, origin, direction):
+        """返回射线最先命中的球的下标和距离，没有命中时返回 (None, inf)
+
+        逐层保留包围盒与射线相交的节点（slab 测试），最后对候选叶子中的球做向量化求交。
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+        # 分量为 0 时用极小值代替，避免 0 * inf 产生 NaN
+        inverse = 1.0 / np.where(np.abs(direction) < 1e-12, 1e-12, direction)
+
+        nodes = np.zeros(1, dtype=np.int64)
+        children = np.arange(self.branching)
+        for level in range(self.depth + 1):
+            if level > 0:
+                nodes = (nodes[:, None] * self.branching + children).ravel()
+            nodes = nodes[self._hit_boxes(self.bounds[level][nodes], origin, inverse)]
+            if len(nodes) == 0:
+                return None, math.inf
+
+        t = self._hit_spheres(self.leaf_centers[nodes].reshape(-1, 3),
+                              self.leaf_radii[nodes].ravel(), origin, direction)
+        best = np.argmin(t)
+        if not np.isfinite(t[best]):
+            return None, math.inf
+        return int(self.members[nodes].flat[best]), float(t[best])
+
+    @staticmethod
+    def _hit_boxes(bounds, origin, inverse):
+        # 小数组上沿轴归约很慢，这里全部展开成逐元素运算
+        t = (bounds - origin) * inverse
+        low = np.minimum(t[:, 0], t[:, 1])
+        high = np.maximum(t[:, 0], t[:, 1])
+        t_near = np.maximum(np.maximum(low[:, 0], low[:, 1]), low[:, 2])
+        t_far = np.minimum(np.minimum(high[:, 0], high[:, 1]), high[:, 2])
+        # 只含哨兵的节点包围盒为 (inf, -inf)，slab 测试会误判为相交，按下界不大于上界排除
+        return (t_near <= t_far) & (t_far >= 0) & (bounds[:, 0, 0] <= bounds[:, 1, 0])
+
+    @staticmethod
+    def _hit_spheres(centers, radii, origin, direction):
+        offset = centers - origin
+        along = offset @ direction
+        miss2 = np.einsum('ij,ij->i', offset, offset) - along * along
+        half_chord2 = radii * radii - miss2
+        half_chord = np.sqrt(np.maximum(half_chord2, 0.0))
+        # 射线起点在球内时取出射点
+        t = np.where(along - half_chord >= 0, along - half_chord, along + half_chord)
+        return np.where((half_chord2 >= 0) & (t >= 0) & (radii >= 0), t, np.inf)
@@ -0,0 +1,71 @@
+# -------------------- 画质等级 --------------------
+class QualitySettings:
+    def __init__(self, name, trail_stride, lod_bias, star_fraction, label_budget, orbit_segments):
+        self.name = name
+        self.trail_stride = trail_stride      # 轨迹每隔几个采样点绘制一个
+        self.lod_bias = lod_bias              # 球体细分倍率（<1 更早切换到粗网格）
+        self.star_fraction = star_fraction    # 绘制的星空背景比例
+        self.label_budget = label_budget      # 每帧最多显示的名称标签
+        self.orbit_segments = orbit_segments  # 轨道线的分段数
+
+QUALITY_LEVELS = [
+    QualitySettings("高", 1, 1.0, 1.0, 50, 100),
+    QualitySettings("中", 2, 0.6, 0.6, 25, 64),
+    QualitySettings("低", 4, 0.35, 0.3, 12, 32),
+    QualitySettings("最低", 8, 0.2, 0.1, 5, 16),
+]
+
+# -------------------- 画质调节器 --------------------
+class QualityGovernor:
+    """根据帧耗时与 FPS 预算自动升降画质
+
+    帧耗时取指数滑动平均；连续 down_frames 帧超出预算 down_ratio 倍时降一级，
+    连续 up_frames 帧低于预算 up_ratio 倍时升一级。升级需要的帧数远多于降级，
+    且每次切换后计数清零，避免在两个等级之间来回抖动。
+    """
+    def __init__(self, fps, levels=QUALITY_LEVELS, smoothing=0.1,
+                 down_ratio=1.1, up_ratio=0.7, down_frames=15, up_frames=180, refresh=30):
+        self.budget = 1.0 / fps
+        self.levels = levels
+        self.smoothing = smoothing
+        self.down_ratio = down_ratio
+        self.up_ratio = up_ratio
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.level = 0
+        self.frame_time = self.budget * up_ratio
+        self.slow_count = 0
+        self.fast_count = 0
+        self.refresh = refresh                  # 界面显示的帧耗时每隔多少帧更新一次
+        self.frames = 0
+        self.shown_frame_time = self.frame_time
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def record(self, frame_time):
+        """记录一帧的耗时（秒），画质等级变化时返回 True"""
+        self.frame_time += self.smoothing * (frame_time - self.frame_time)
+        self.frames += 1
+        if self.frames % self.refresh == 0:
+            self.shown_frame_time = self.frame_time
+        if self.frame_time > self.budget * self.down_ratio:
+            self.slow_count += 1
+            self.fast_count = 0
+        elif self.frame_time < self.budget * self.up_ratio:
+            self.fast_count += 1
+            self.slow_count = 0
+        else:
+            self.slow_count = self.fast_count = 0
+
+        if self.slow_count >= self.down_frames and self.level < len(self.levels) - 1:
+            return self._set_level(self.level + 1)
+        if self.fast_count >= self.up_frames and self.level > 0:
+            return self._set_level(self.level - 1)
+        return False
+
+    def _set_level(self, level):
+        self.level = level
+        self.slow_count = self.fast_count = 0
+        return True
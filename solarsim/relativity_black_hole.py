@@ -0,0 +1,756 @@
+from solarsim.lazy import pygame, GL, GLU, shaders
+import math
+import numpy as np
+
+from solarsim.camera_math import translation, rotation
+from solarsim.lensing import StarfieldLens
+from solarsim.trail_store import AdaptiveTrail
+from solarsim.fonts import load_font
+from solarsim.text_cache import TextCache, begin_overlay, end_overlay
+from solarsim.pm_gravity import ParticleMesh
+
+# 设置显示尺寸
+WIDTH, HEIGHT = 1000, 800
+
+# 设置视角
+CAMERA_DISTANCE = 750
+# 黑洞所在平面上一个像素对应的世界尺寸
+PIXEL_SIZE = 2 * CAMERA_DISTANCE * math.tan(math.radians(45 / 2)) / HEIGHT
+STAR_COUNT = 100000
+SEED = None  # 随机种子（星空和光子扰动），None 表示每次运行不同
+DEBRIS_COUNT = 20000  # 碎屑盘粒子数（按 D 键开启）
+DEBRIS_CELLS = 32     # 碎屑盘 PM 网格每边的单元数
+
+# 颜色定义 (R, G, B, A)
+YELLOW = (1.0, 1.0, 0.0, 1.0)
+BLUE = (0.0, 0.2, 1.0, 1.0)
+RED = (1.0, 0.0, 0.0, 1.0)
+ORANGE = (1.0, 0.65, 0.0, 1.0)
+GREY = (0.5, 0.5, 0.5, 1.0)
+WHITE = (1.0, 1.0, 1.0, 1.0)
+BLACK_HOLE = (0.0, 0.0, 0.0, 1.0)
+
+# 初始化Pygame和OpenGL（导入本模块时不创建窗口，由 main() 调用）
+def init_display():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.OPENGL)
+    pygame.display.set_caption("相对论太阳系模拟 - 黑洞效应")
+    GLU.gluPerspective(45, (WIDTH / HEIGHT), 0.1, 2000.0)
+    GL.glTranslatef(0.0, 0.0, -CAMERA_DISTANCE)
+    GL.glEnable(GL.GL_DEPTH_TEST)
+    GL.glEnable(GL.GL_BLEND)
+    GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+
+# 创建球体
+def create_sphere(radius, slices, stacks):
+    quad = GLU.gluNewQuadric()
+    GLU.gluQuadricTexture(quad, GL.GL_TRUE)
+    GLU.gluSphere(quad, radius, slices, stacks)
+    return quad
+
+# 时空网格
+SPACETIME_GRID_VERTEX_SHADER = """
+#version 120
+attribute vec2 a_xz;           // 固定的网格平面坐标
+attribute float a_height;      // 随时空弯曲变化的高度
+varying vec4 v_color;
+void main() {
+    v_color = gl_Color;
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(a_xz.x, a_height, a_xz.y, 1.0);
+}
+"""
+
+SPACETIME_GRID_FRAGMENT_SHADER = """
+#version 120
+varying vec4 v_color;
+void main() {
+    gl_FragColor = v_color;
+}
+"""
+
+def spacetime_heights(x, z, center_mass=0):
+    """网格高度（向量化）；没有中心质量时为扁平网格"""
+    if center_mass <= 0:
+        return np.zeros_like(x)
+    # 计算到中心的距离，避免除以零
+    distance = np.maximum(np.hypot(x, z), 1.0)
+    # 计算引力势能 (应用Schwarzschild度规的简化形式)
+    schwarzschild_radius = 2 * G * center_mass / (c * c) * 1e10  # 缩放以便可见
+    # 时空弯曲公式：y = -k * M / r；黑洞内部锁定为固定深度，表示事件视界
+    return np.where(distance > schwarzschild_radius,
+                    -schwarzschild_radius * 10 / distance, -10.0)
+
+class SpacetimeGrid:
+    """时空网格：平面坐标和线段索引只上传一次，整个网格用一次 glDrawElements 绘制；
+    网格弯曲时只重新上传高度缓冲。"""
+    def __init__(self, size, divisions):
+        coords = size * (2.0 * np.arange(divisions + 1) / divisions - 1.0)
+        x, z = np.meshgrid(coords, coords, indexing='ij')
+        self.x, self.z = x.ravel(), z.ravel()
+        
+        # 经线 (沿 j) 和纬线 (沿 i) 的线段端点索引
+        idx = np.arange((divisions + 1) ** 2, dtype=np.uint32).reshape(divisions + 1, divisions + 1)
+        segments = np.concatenate([
+            np.stack([idx[:, :-1], idx[:, 1:]], axis=-1).reshape(-1, 2),
+            np.stack([idx[:-1, :], idx[1:, :]], axis=-1).reshape(-1, 2)])
+        self.index_count = segments.size
+        
+        self.xz_vbo, self.height_vbo, self.index_vbo = GL.glGenBuffers(3)
+        xz = np.ascontiguousarray(np.stack([self.x, self.z], axis=-1), dtype=np.float32)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.xz_vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, xz.nbytes, xz, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.height_vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, len(self.x) * 4, None, GL.GL_DYNAMIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.index_vbo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, segments.nbytes, np.ascontiguousarray(segments),
+                        GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+        
+        self.program = shaders.compileProgram(
+            shaders.compileShader(SPACETIME_GRID_VERTEX_SHADER, GL.GL_VERTEX_SHADER),
+            shaders.compileShader(SPACETIME_GRID_FRAGMENT_SHADER, GL.GL_FRAGMENT_SHADER))
+        self.a_xz = GL.glGetAttribLocation(self.program, "a_xz")
+        self.a_height = GL.glGetAttribLocation(self.program, "a_height")
+        self.set_mass(0)
+    
+    def set_mass(self, center_mass):
+        """重新计算并只上传高度"""
+        self.set_heights(spacetime_heights(self.x, self.z, center_mass))
+    
+    def set_heights(self, heights):
+        heights = np.ascontiguousarray(heights, dtype=np.float32)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.height_vbo)
+        GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, heights.nbytes, heights)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+    
+    def draw(self):
+        GL.glColor4f(0.3, 0.3, 0.8, 0.3)  # 半透明蓝色
+        GL.glLineWidth(1.0)
+        GL.glUseProgram(self.program)
+        
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.xz_vbo)
+        GL.glEnableVertexAttribArray(self.a_xz)
+        GL.glVertexAttribPointer(self.a_xz, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.height_vbo)
+        GL.glEnableVertexAttribArray(self.a_height)
+        GL.glVertexAttribPointer(self.a_height, 1, GL.GL_FLOAT, GL.GL_FALSE, 0, None)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.index_vbo)
+        GL.glDrawElements(GL.GL_LINES, self.index_count, GL.GL_UNSIGNED_INT, None)
+        
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glDisableVertexAttribArray(self.a_height)
+        GL.glDisableVertexAttribArray(self.a_xz)
+        GL.glUseProgram(0)
+
+# 黑洞吸积盘：预先生成的网格
+ACCRETION_DISK_VERTEX_SHADER = """
+#version 120
+attribute vec2 a_polar;        // x = 半径, y = 初始角度
+uniform float u_time;
+uniform float u_inner_radius;
+uniform float u_inner_speed;
+uniform float u_height;
+varying vec4 v_color;
+void main() {
+    // 开普勒差速转动：角速度 ∝ r^-1.5，内圈最快
+    float omega = u_inner_speed * pow(u_inner_radius / a_polar.x, 1.5);
+    float angle = a_polar.y + omega * u_time;
+    v_color = gl_Color;
+    gl_Position = gl_ModelViewProjectionMatrix *
+                  vec4(a_polar.x * cos(angle), u_height, a_polar.x * sin(angle), 1.0);
+}
+"""
+
+ACCRETION_DISK_FRAGMENT_SHADER = """
+#version 120
+varying vec4 v_color;
+void main() {
+    gl_FragColor = v_color;
+}
+"""
+
+class AccretionDisk:
+    """吸积盘网格只生成并上传一次（每个顶点的半径、初始角度、颜色和三角形索引），
+    转动由顶点着色器根据 u_time 计算，每帧只需更新一个 uniform。"""
+    def __init__(self, radius, inner_radius, height, loops=60, slices=160, inner_speed=0.05):
+        self.inner_radius = inner_radius
+        self.outer_radius = radius
+        self.height = height / 2.0
+        self.inner_speed = inner_speed
+        self.time = 0.0
+        
+        r = np.linspace(inner_radius, radius, loops + 1)
+        angle = np.linspace(0, 2.0 * math.pi, slices + 1)
+        polar = np.stack(np.meshgrid(r, angle, indexing='ij'), axis=-1).reshape(-1, 2)
+        colors = self._temperature_colors(polar[:, 0], polar[:, 1])
+        
+        ring = np.arange(loops)[:, None] * (slices + 1) + np.arange(slices)[None, :]
+        quads = np.stack([ring, ring + slices + 1, ring + 1,
+                          ring + 1, ring + slices + 1, ring + slices + 2], axis=-1)
+        indices = quads.astype(np.uint32).ravel()
+        self.index_count = len(indices)
+        
+        self.polar_vbo, self.color_vbo, self.index_vbo = GL.glGenBuffers(3)
+        self._upload(GL.GL_ARRAY_BUFFER, self.polar_vbo, polar.astype(np.float32))
+        self._upload(GL.GL_ARRAY_BUFFER, self.color_vbo, colors)
+        self._upload(GL.GL_ELEMENT_ARRAY_BUFFER, self.index_vbo, indices)
+        
+        self.program = shaders.compileProgram(
+            shaders.compileShader(ACCRETION_DISK_VERTEX_SHADER, GL.GL_VERTEX_SHADER),
+            shaders.compileShader(ACCRETION_DISK_FRAGMENT_SHADER, GL.GL_FRAGMENT_SHADER))
+        self.a_polar = GL.glGetAttribLocation(self.program, "a_polar")
+        self.uniforms = {name: GL.glGetUniformLocation(self.program, name)
+                         for name in ("u_time", "u_inner_radius", "u_inner_speed", "u_height")}
+    
+    @staticmethod
+    def _upload(target, buffer, data):
+        GL.glBindBuffer(target, buffer)
+        GL.glBufferData(target, data.nbytes, np.ascontiguousarray(data), GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(target, 0)
+    
+    def _temperature_colors(self, radius, base_angle):
+        # 内部偏红（高温），外部偏蓝；沿角度的亮度起伏随物质一起转动，
+        # 因此动画不需要更新颜色
+        t = ((radius - self.inner_radius) / (self.outer_radius - self.inner_radius))[:, None]
+        inner_color = np.array([1.0, 0.0, 0.1, 0.8])
+        outer_color = np.array([0.0, 0.2, 1.0, 0.7])
+        colors = (1 - t) * inner_color + t * outer_color
+        brightness = 0.85 + 0.15 * np.cos(6 * base_angle + 20 * t[:, 0])
+        colors[:, :3] *= brightness[:, None]
+        return np.ascontiguousarray(np.clip(colors, 0.0, 1.0), dtype=np.float32)
+    
+    def update(self, simulation_time):
+        self.time = simulation_time
+    
+    def draw(self):
+        GL.glUseProgram(self.program)
+        GL.glUniform1f(self.uniforms["u_time"], self.time)
+        GL.glUniform1f(self.uniforms["u_inner_radius"], self.inner_radius)
+        GL.glUniform1f(self.uniforms["u_inner_speed"], self.inner_speed)
+        GL.glUniform1f(self.uniforms["u_height"], self.height)
+        
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.polar_vbo)
+        GL.glEnableVertexAttribArray(self.a_polar)
+        GL.glVertexAttribPointer(self.a_polar, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.color_vbo)
+        GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+        GL.glColorPointer(4, GL.GL_FLOAT, 0, None)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.index_vbo)
+        GL.glDrawElements(GL.GL_TRIANGLES, self.index_count, GL.GL_UNSIGNED_INT, None)
+        
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+        GL.glDisableVertexAttribArray(self.a_polar)
+        GL.glUseProgram(0)
+
+# 背景星空：星体的真实方向固定，显示位置按黑洞的引力透镜偏折
+class LensedStarfield:
+    """每颗星绘制主像和位于黑洞另一侧的次像；只有摄像机或黑洞质量变化时才重新计算"""
+    def __init__(self, count, radius, observer_distance, black_hole, rng):
+        self.radius = radius
+        self.reference_mass = black_hole.mass
+        self.reference_rs = black_hole.radius
+        self.lens = StarfieldLens(rng.normal(size=(count, 3)), observer_distance, black_hole.radius)
+        self.vertices = np.zeros((2 * count, 3), dtype=np.float32)
+        self.colors = np.ones((2 * count, 4), dtype=np.float32)
+        self.enabled = True
+        self.draw_count = count
+        self.key = None
+    
+    def set_mass(self, mass):
+        # 偏折曲线按 rs 归一化，质量变化只需换算 rs，不重新积分
+        self.lens.set_rs(self.reference_rs * mass / self.reference_mass)
+        self.key = None
+    
+    def update(self, observer):
+        key = (tuple(observer), self.lens.rs, self.enabled)
+        if key == self.key:
+            return
+        self.key = key
+        count = len(self.lens.directions)
+        if not self.enabled:
+            self.vertices[:count] = observer + self.lens.directions * self.radius
+            self.colors[:count, 3] = 0.8
+            self.draw_count = count
+            return
+        primary, primary_brightness, secondary, secondary_brightness = self.lens.apparent(observer)
+        self.vertices[:count] = observer + primary * self.radius
+        self.vertices[count:] = observer + secondary * self.radius
+        np.minimum(primary_brightness * 0.8, 1.0, out=self.colors[:count, 3])
+        np.minimum(secondary_brightness * 0.8, 1.0, out=self.colors[count:, 3])
+        self.draw_count = 2 * count
+    
+    def draw(self):
+        GL.glDepthMask(GL.GL_FALSE)
+        GL.glPointSize(1.5)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+        GL.glVertexPointer(3, GL.GL_FLOAT, 0, self.vertices)
+        GL.glColorPointer(4, GL.GL_FLOAT, 0, self.colors)
+        GL.glDrawArrays(GL.GL_POINTS, 0, self.draw_count)
+        GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glDepthMask(GL.GL_TRUE)
+
+class DebrisDisk:
+    """环绕黑洞的碎屑盘：黑洞引力按点质量解析计算，盘的自引力由 PM 网格求解
+
+    与 work_precision 的黑洞场景一样使用自洽的单位（GM 由水星的圆轨道速度定出），
+    不使用 calculate_gravity 中的缩放常数。每步只求解一次网格，
+    得到的引力势同时用于弯曲时空网格（heights）。
+    """
+    GM = 2.0 ** 2 * 120.0
+    DISK_MASS = 0.05  # 盘的总质量（黑洞质量的倍数）
+
+    def __init__(self, count, inner, outer, grid_size, rng, cells=DEBRIS_CELLS):
+        self.inner, self.outer = inner, outer
+        self.rng = rng
+        self.positions = np.zeros((count, 3))
+        self.velocities = np.zeros((count, 3))
+        self._spawn(np.arange(count))
+        self.masses = np.full(count, self.DISK_MASS * self.GM / count)
+        # 网格覆盖整个时空网格，网格势才能为每个网格顶点取样
+        self.mesh = ParticleMesh(2.0 * grid_size, cells, softening=2.0)
+        self.accel = self._accelerations()
+        self.vertices = np.zeros((count, 3), dtype=np.float32)
+        self.height_scale = None
+
+    def _spawn(self, index):
+        """在盘内按均匀面密度放置粒子，初速为绕黑洞的圆轨道速度"""
+        count = len(index)
+        r = np.sqrt(self.rng.uniform(self.inner ** 2, self.outer ** 2, count))
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        speed = np.sqrt(self.GM / r)
+        self.positions[index] = np.stack([r * np.cos(angle), self.rng.normal(0, 2.0, count),
+                                          r * np.sin(angle)], axis=-1)
+        self.velocities[index] = np.stack([-speed * np.sin(angle), np.zeros(count),
+                                           speed * np.cos(angle)], axis=-1)
+
+    def _accelerations(self):
+        r2 = np.einsum('ij,ij->i', self.positions, self.positions) + 1.0
+        central = -self.GM * self.positions * (r2 ** -1.5)[:, None]
+        return central + self.mesh.accelerations(self.positions, self.masses)
+
+    def update(self, dt, horizon):
+        # KDK 蛙跳，每步一次引力求解
+        self.velocities += 0.5 * dt * self.accel
+        self.positions += dt * self.velocities
+        # 落入视界或被抛出的粒子在外缘重新生成，粒子数保持不变
+        r2 = np.einsum('ij,ij->i', self.positions, self.positions)
+        lost = np.flatnonzero((r2 < horizon ** 2) | (r2 > (2 * self.outer) ** 2))
+        if len(lost):
+            self._spawn(lost)
+        self.accel = self._accelerations()
+        self.velocities += 0.5 * dt * self.accel
+
+    def heights(self, x, z):
+        """盘的引力势在 y = 0 平面上对应的网格高度，最深处与黑洞的视界深度相当"""
+        potential = self.mesh.plane_heights(x, z, 1.0)
+        if self.height_scale is None:
+            self.height_scale = 10.0 / max(-potential.min(), 1e-12)
+        return potential * self.height_scale
+
+    def draw(self):
+        self.vertices[:] = self.positions
+        GL.glColor4f(1.0, 0.8, 0.5, 0.6)
+        GL.glPointSize(1.5)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glVertexPointer(3, GL.GL_FLOAT, 0, self.vertices)
+        GL.glDrawArrays(GL.GL_POINTS, 0, len(self.vertices))
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+
+def observer_position(rotation_x, rotation_y, rotation_z):
+    """与主循环中的 glTranslatef/glRotatef 相同的变换，求摄像机在世界坐标中的位置"""
+    view = (translation(0.0, 0.0, -CAMERA_DISTANCE) @ rotation(rotation_x, 1, 0, 0)
+            @ rotation(rotation_y, 0, 1, 0) @ rotation(rotation_z, 0, 0, 1))
+    return np.linalg.inv(view)[:3, 3]
+
+# 天体类
+class CelestialBody:
+    def __init__(self, distance_from_center, radius, color, mass=1.0, 
+                 initial_velocity=(0,0,0), name=""):
+        self.distance = distance_from_center
+        self.radius = radius
+        self.color = color
+        self.mass = mass
+        self.name = name
+        self.angle = 0
+        
+        # 位置和速度变量
+        self.x = distance_from_center
+        self.y = 0.0
+        self.z = 0.0
+        self.vx, self.vy, self.vz = initial_velocity
+        
+        # 轨迹：只保留偏离直线超过角度容差的采样点，可以容纳上千圈的进动轨迹
+        self.trail = AdaptiveTrail(capacity=8192)
+        self.quadratic = create_sphere(radius, 32, 32)
+        
+        # 相对论效应 - 水星近日点进动效应
+        self.perihelion_shift = 0
+        # 黑洞的吸积盘，随黑洞一起绘制
+        self.accretion_disk = None
+        
+    def calculate_gravity(self, other_body, dt):
+        dx = other_body.x - self.x
+        dy = other_body.y - self.y
+        dz = other_body.z - self.z
+        
+        # 距离
+        distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+        
+        # 避免零距离
+        if distance < 0.1:
+            return 0, 0, 0
+            
+        # 牛顿引力
+        force = G * self.mass * other_body.mass / (distance * distance)
+        
+        # 如果是黑洞，添加相对论修正
+        if other_body.name == "黑洞":
+            # 广义相对论修正：在强引力场下引力增强
+            schwarzschild_radius = 2 * G * other_body.mass / (c * c)
+            relativistic_factor = 1 + 3 * schwarzschild_radius / distance
+            force *= relativistic_factor
+            
+            # 记录水星的近日点进动（仅适用于接近黑洞的天体）
+            if distance < 1.5 * other_body.radius and self.name != "光子":
+                # 近日点进动效应，随着距离黑洞更近而增加
+                self.perihelion_shift += 0.01 * dt / distance
+        
+        # 计算力的方向
+        fx = force * dx / distance
+        fy = force * dy / distance
+        fz = force * dz / distance
+        
+        return fx, fy, fz
+    
+    def update_velocity(self, fx, fy, fz, dt):
+        # 牛顿第二定律：F = ma，所以 a = F/m
+        ax = fx / self.mass
+        ay = fy / self.mass
+        az = fz / self.mass
+        
+        # 更新速度
+        self.vx += ax * dt
+        self.vy += ay * dt
+        self.vz += az * dt
+    
+    def update_position(self, dt):
+        # 更新位置
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.z += self.vz * dt
+        
+        # 记录轨迹
+        self.trail.append((self.x, self.y, self.z))
+    
+    def draw(self):
+        GL.glPushMatrix()
+        
+        # 移动到天体位置
+        GL.glTranslatef(self.x, self.y, self.z)
+        
+        # 设置颜色并绘制天体
+        GL.glColor4f(*self.color)
+        
+        # 如果是黑洞，绘制特殊效果
+        if self.name == "黑洞":
+            # 黑洞事件视界
+            GLU.gluSphere(self.quadratic, self.radius, 32, 32)
+            
+            # 吸积盘（仅在黑洞周围）
+            GL.glPopMatrix()  # 退出当前矩阵
+            if self.accretion_disk:
+                self.accretion_disk.draw()
+        else:
+            # 普通天体
+            GLU.gluSphere(self.quadratic, self.radius, 32, 32)
+            GL.glPopMatrix()
+        
+        # 绘制轨道轨迹
+        if len(self.trail) > 2:
+            # 按屏幕像素大小选择轨迹分辨率：弦高误差不超过一个像素
+            curvature_radius = math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+            vertices = self.trail.vertices(self.trail.level_for(PIXEL_SIZE, curvature_radius))
+            GL.glColor4f(*self.color)
+            GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+            GL.glVertexPointer(3, GL.GL_FLOAT, 0, vertices)
+            GL.glDrawArrays(GL.GL_LINE_STRIP, 0, len(vertices))
+            GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+
+# 物理常量
+G = 6.67e-11 * 1e8  # 引力常数（缩放）
+c = 3e8 / 1e6  # 光速（缩放）
+
+# 添加一些光子以展示光线弯曲
+def create_photons(rng):
+    photons = []
+    for i in range(15):
+        angle = i * math.pi / 7
+        dist = 400
+        px = dist * math.cos(angle)
+        pz = dist * math.sin(angle)
+        
+        # 光子的初始速度指向黑洞（接近但不是完全指向，以展示弯曲效果）
+        vx = -px / 100
+        vz = -pz / 100
+        
+        # 添加一点随机性
+        vx += rng.uniform(-0.1, 0.1)
+        vz += rng.uniform(-0.1, 0.1)
+        
+        photon = CelestialBody(0, 1, WHITE, mass=1e-10, 
+                            initial_velocity=(vx, 0, vz), name="光子")
+        photon.x = px
+        photon.z = pz
+        photons.append(photon)
+    return photons
+
+def main():
+    init_display()
+    rng = np.random.default_rng(SEED)
+
+    # 创建中心黑洞和行星
+    black_hole = CelestialBody(0, 30, BLACK_HOLE, mass=1e31, name="黑洞")
+    accretion_disk = AccretionDisk(black_hole.radius * 4, black_hole.radius, 5)
+    black_hole.accretion_disk = accretion_disk
+    starfield = LensedStarfield(STAR_COUNT, 1200, CAMERA_DISTANCE, black_hole, rng)
+
+    planets = [
+        # 水星: 距离、半径、颜色、质量、初始速度、名称
+        CelestialBody(120, 4, GREY, mass=3.3e23, initial_velocity=(0, 0, 2.0), name="水星"),
+        # 金星
+        CelestialBody(180, 8, ORANGE, mass=4.87e24, initial_velocity=(0, 0, 1.6), name="金星"),
+        # 地球
+        CelestialBody(250, 9, BLUE, mass=5.97e24, initial_velocity=(0, 0, 1.3), name="地球"),
+        # 火星
+        CelestialBody(320, 6, RED, mass=6.42e23, initial_velocity=(0, 0, 1.1), name="火星"),
+    ]
+
+    photons = create_photons(rng)
+
+    # 旋转变量
+    rotation_x = 0
+    rotation_y = 0
+    rotation_z = 0
+
+    # 游戏主循环
+    clock = pygame.time.Clock()
+    dt = 0.5
+    paused = False
+    show_info = True
+    font = load_font(None, 24)
+    # 文字渲染成纹理后用 GL 绘制（OpenGL 窗口的表面不能直接 blit）
+    text_cache = TextCache()
+
+    # 生成时空网格（初始扁平）
+    grid_size = 400
+    grid_divisions = 20
+    spacetime_grid = SpacetimeGrid(grid_size, grid_divisions)
+
+    running = True
+    show_grid = True
+    warp_spacetime = False
+    simulation_time = 0
+    debris = None
+
+    def update_grid():
+        """黑洞的解析弯曲加上碎屑盘网格势（来自本步的 PM 求解）"""
+        if not warp_spacetime:
+            spacetime_grid.set_mass(0)
+            return
+        heights = spacetime_heights(spacetime_grid.x, spacetime_grid.z, black_hole.mass)
+        if debris is not None:
+            heights = heights + debris.heights(spacetime_grid.x, spacetime_grid.z)
+        spacetime_grid.set_heights(heights)
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_i:
+                    show_info = not show_info
+                elif event.key == pygame.K_g:
+                    show_grid = not show_grid
+                elif event.key == pygame.K_w:
+                    warp_spacetime = not warp_spacetime
+                    # 扭曲或恢复平坦的时空网格，只更新高度
+                    update_grid()
+                elif event.key == pygame.K_d:
+                    debris = None if debris else DebrisDisk(DEBRIS_COUNT, 45, 220, grid_size, rng)
+                    update_grid()
+                elif event.key == pygame.K_l:
+                    starfield.enabled = not starfield.enabled
+                elif event.key == pygame.K_UP:
+                    dt *= 1.2
+                elif event.key == pygame.K_DOWN:
+                    dt /= 1.2
+                elif event.key == pygame.K_r:
+                    # 重置光子
+                    photons = create_photons(rng)
+
+        # 处理连续按键
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT]:
+            rotation_y -= 1
+        if keys[pygame.K_RIGHT]:
+            rotation_y += 1
+        if keys[pygame.K_UP] and (keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL]):
+            rotation_x -= 1
+        if keys[pygame.K_DOWN] and (keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL]):
+            rotation_x += 1
+        if keys[pygame.K_q]:
+            rotation_z += 1
+        if keys[pygame.K_e]:
+            rotation_z -= 1
+
+        # 清空缓冲区
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+
+        # 重置模型视图矩阵
+        GL.glLoadIdentity()
+        GL.glTranslatef(0.0, 0.0, -CAMERA_DISTANCE)
+
+        # 应用旋转
+        GL.glRotatef(rotation_x, 1, 0, 0)
+        GL.glRotatef(rotation_y, 0, 1, 0)
+        GL.glRotatef(rotation_z, 0, 0, 1)
+
+        # 更新天体位置
+        if not paused:
+            simulation_time += dt
+            accretion_disk.update(simulation_time)
+
+            if debris is not None:
+                debris.update(dt, black_hole.radius)
+                if warp_spacetime:
+                    update_grid()
+
+            # 更新行星
+            for planet in planets[:]:  # 使用副本迭代，以便安全删除
+                # 计算黑洞对行星的引力
+                fx, fy, fz = planet.calculate_gravity(black_hole, dt)
+
+                # 更新行星速度
+                planet.update_velocity(fx, fy, fz, dt)
+
+                # 更新行星位置
+                planet.update_position(dt)
+
+                # 检查是否被黑洞捕获
+                distance_to_black_hole = math.sqrt(
+                    (planet.x - black_hole.x)**2 + 
+                    (planet.y - black_hole.y)**2 + 
+                    (planet.z - black_hole.z)**2)
+
+                # 如果距离小于黑洞半径，行星被吞噬
+                if distance_to_black_hole < black_hole.radius:
+                    # 增加黑洞质量
+                    black_hole.mass += planet.mass
+                    planets.remove(planet)
+                    starfield.set_mass(black_hole.mass)
+                    update_grid()
+
+            # 更新光子（光线弯曲效应）
+            for photon in photons[:]:  # 使用副本迭代，以便安全删除
+                # 计算黑洞对光子的引力（光也受引力影响）
+                fx, fy, fz = photon.calculate_gravity(black_hole, dt)
+
+                # 更新光子速度
+                photon.update_velocity(fx, fy, fz, dt)
+
+                # 更新光子位置
+                photon.update_position(dt)
+
+                # 检查是否被黑洞捕获
+                distance_to_black_hole = math.sqrt(
+                    (photon.x - black_hole.x)**2 + 
+                    (photon.y - black_hole.y)**2 + 
+                    (photon.z - black_hole.z)**2)
+
+                # 如果距离小于黑洞半径，光子被吞噬
+                if distance_to_black_hole < black_hole.radius:
+                    photons.remove(photon)
+
+                # 如果光子飞得太远，移除它
+                elif abs(photon.x) > 1000 or abs(photon.z) > 1000:
+                    photons.remove(photon)
+
+        # 绘制透镜后的背景星空
+        starfield.update(observer_position(rotation_x, rotation_y, rotation_z))
+        starfield.draw()
+
+        # 绘制时空网格
+        if show_grid:
+            spacetime_grid.draw()
+
+        # 绘制黑洞
+        black_hole.draw()
+
+        # 绘制行星
+        for planet in planets:
+            planet.draw()
+
+        # 绘制光子
+        for photon in photons:
+            photon.draw()
+
+        if debris is not None:
+            debris.draw()
+
+        # 渲染UI层
+        if show_info:
+            # 切换回2D模式绘制文本，绘制前保存状态
+            begin_overlay(WIDTH, HEIGHT)
+
+            # 绘制2D覆盖层
+            info_text = [
+                f"相对论太阳系模拟 - 黑洞效应",
+                f"时间步长: {dt:.2f}",
+                f"模拟时间: {simulation_time:.1f} 单位",
+                f"黑洞质量: {black_hole.mass:.1e}",
+                f"行星数量: {len(planets)}",
+                "空格: 暂停/继续",
+                "i: 显示/隐藏信息",
+                "g: 显示/隐藏时空网格",
+                "w: 切换时空弯曲",
+                "l: 切换星空引力透镜",
+                "d: 切换碎屑盘（PM 网格引力）",
+                "r: 重置光子",
+                "方向键: 旋转视图",
+                "Ctrl+上下: 上下旋转",
+                "Q/E: Z轴旋转",
+                f"状态: {'暂停' if paused else '运行'}"
+            ]
+
+            # 模拟时间和进动角每帧都在变，逐字符绘制，纹理缓存只随字符集增长
+            for i, text in enumerate(info_text):
+                text_cache.draw_glyphs(text, font, 10, 10 + i * 25)
+
+            # 对每个行星显示近日点进动
+            y_offset = 405
+            text_cache.draw_glyphs("近日点进动:", font, 10, y_offset)
+            y_offset += 25
+            for planet in planets:
+                text_cache.draw_glyphs(f"{planet.name}: {planet.perihelion_shift:.5f} 弧度", font,
+                                       10, y_offset)
+                y_offset += 25
+
+            # 恢复状态
+            end_overlay()
+
+        # 更新显示
+        pygame.display.flip()
+        clock.tick(60)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""天体目录加载：CSV / JSON Lines → NumPy 结构化数组，首次解析后缓存为可内存映射的 .npy
+
+目录分两种，按表头自动识别：
+    轨道根数  distance, speed 必需；name, radius, color, mass, inclination, node, phase 可选
+    状态向量  x, y, z, vx, vy, vz 必需；name, radius, mass 可选
+状态向量以太阳为原点，速度的单位是世界单位/模拟步；模拟器只有圆轨道，
+加载时由 elements_from_state 换算为与当前位置和角动量一致的圆轨道根数。
+CSV 第一行为表头；JSON Lines 每行一个对象（.json 文件为对象数组，一次读入，只适合小目录）。
+解析按块进行（每块 chunk_rows 行），边解析边写入缓存文件，内存占用与目录大小无关。
+缓存以源文件内容的 SHA-256 为键；源文件的大小和修改时间未变时直接复用记录的哈希，
+再次加载只需打开内存映射，百万行目录也在毫秒级完成。
+
+用法:
+    python -m solarsim catalog belt.csv            # 解析（或命中缓存）并打印统计
+"""
+import csv
+import hashlib
+import io
+import itertools
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from solarsim.paths import CACHE_DIR
+
+# -------------------- 目录格式 --------------------
+ELEMENTS_DTYPE = np.dtype([
+    ('name', 'S32'),
+    ('distance', 'f8'),     # 轨道半径
+    ('radius', 'f4'),
+    ('color', 'S16'),       # Config.COLORS 中的颜色名
+    ('mass', 'f8'),
+    ('speed', 'f8'),        # 角速度（弧度/步）
+    ('inclination', 'f4'),  # 轨道倾角（度）
+    ('node', 'f4'),         # 升交点经度（度）：轨道平面绕 z 轴的转角
+    ('phase', 'f8'),        # 初始角度（度），缺省为 NaN，由使用方随机分布
+])
+
+STATE_DTYPE = np.dtype([
+    ('name', 'S32'),
+    ('x', 'f8'), ('y', 'f8'), ('z', 'f8'),
+    ('vx', 'f8'), ('vy', 'f8'), ('vz', 'f8'),
+    ('radius', 'f4'),
+    ('mass', 'f8'),
+])
+
+KINDS = {
+    'elements': (ELEMENTS_DTYPE, ('distance', 'speed')),
+    'state': (STATE_DTYPE, ('x', 'y', 'z', 'vx', 'vy', 'vz')),
+}
+
+DEFAULTS = {'name': b'', 'radius': 1.0, 'color': b'GREY', 'mass': 0.0,
+            'inclination': 0.0, 'node': 0.0, 'phase': math.nan}
+
+FORMAT_VERSION = 4  # 解析规则变化时递增，旧缓存自动失效
+
+def detect_kind(columns):
+    for kind, (_, required) in KINDS.items():
+        if all(column in columns for column in required):
+            return kind
+    raise ValueError(f"无法识别的目录表头: {', '.join(columns)}")
+
+def _check_columns(columns, dtype):
+    """拼错或多余的列不能被静默丢弃，否则该列的数据全部变成缺省值"""
+    unknown = [column for column in columns if column not in dtype.names]
+    if unknown:
+        raise ValueError(f"未知的目录列: {', '.join(unknown)}（可用列: {', '.join(dtype.names)}）")
+
+# -------------------- 流式解析 --------------------
+def _csv_chunks(f, chunk_rows):
+    header = next(csv.reader([f.readline()]))
+    columns = [column.strip() for column in header]
+    kind = detect_kind(columns)
+    dtype = KINDS[kind][0]
+    _check_columns(columns, dtype)
+    used = list(range(len(columns)))
+    # 字符串列先按 Unicode 解析（名称可能是中文），写入目录时再编码为 UTF-8
+    chunk_dtype = np.dtype([(columns[i], 'U32' if dtype[columns[i]].kind == 'S' else dtype[columns[i]])
+                            for i in used])
+    # 可选数值列的空单元格取缺省值；转换函数逐格调用 Python，只在块中确有空单元格时使用
+    converters = {i: _optional_number(DEFAULTS[columns[i]]) for i in used
+                  if columns[i] in DEFAULTS and dtype[columns[i]].kind == 'f'}
+
+    def chunks():
+        with f:
+            while True:
+                lines = list(itertools.islice(f, chunk_rows))
+                if not lines:
+                    return
+                # numpy 的 C 实现解析器，比逐行 csv.reader 快一个数量级
+                try:
+                    rows = np.loadtxt(lines, delimiter=',', dtype=chunk_dtype, usecols=used,
+                                      quotechar='"', ndmin=1)
+                except ValueError:
+                    rows = np.loadtxt(lines, delimiter=',', dtype=chunk_dtype, usecols=used,
+                                      quotechar='"', ndmin=1, converters=converters)
+                yield _fill(rows, dtype)
+    return kind, chunks()
+
+def _json_chunks(f, chunk_rows, lines=True):
+    if lines:
+        records = (json.loads(line) for line in f if line.strip())
+    else:
+        records = iter(json.load(f))
+    first = next(records, None)
+    if first is None:
+        raise ValueError("目录为空")
+    kind = detect_kind(list(first))
+    dtype = KINDS[kind][0]
+    records = itertools.chain([first], records)
+
+    def chunks():
+        with f:
+            while True:
+                batch = list(itertools.islice(records, chunk_rows))
+                if not batch:
+                    return
+                # JSON 各行的键可以不同，逐块检查全部出现过的键
+                _check_columns(set().union(*batch), dtype)
+                rows = np.zeros(len(batch), dtype=dtype)
+                for name in dtype.names:
+                    default = DEFAULTS.get(name, 0.0)
+                    values = [record.get(name, default) for record in batch]
+                    if dtype[name].kind == 'S':
+                        values = [_truncate_utf8(value if isinstance(value, bytes)
+                                                 else str(value).encode('utf-8'), dtype[name].itemsize)
+                                  for value in values]
+                    rows[name] = values
+                yield rows
+    return kind, chunks()
+
+def _optional_number(default):
+    def convert(text):
+        text = text.strip()
+        return float(text) if text else default
+    return convert
+
+def _truncate_utf8(value, size):
+    """截断到 size 字节以内，不留下半个多字节字符"""
+    if len(value) <= size:
+        return value
+    return value[:size].decode('utf-8', 'ignore').encode('utf-8')
+
+def _encode(values, size):
+    """Unicode 数组 → UTF-8 字节串数组；超出字段宽度的少数值按字符边界截断"""
+    encoded = np.char.encode(values, 'utf-8')
+    for i in np.flatnonzero(np.char.str_len(encoded) > size):
+        encoded[i] = _truncate_utf8(encoded[i], size)
+    return encoded.astype(f'S{size}')
+
+def _fill(rows, dtype):
+    """把只含部分列的块补全为完整的目录格式"""
+    full = np.zeros(len(rows), dtype=dtype)
+    for name in dtype.names:
+        if name in rows.dtype.names:
+            values = rows[name]
+            full[name] = _encode(values, dtype[name].itemsize) if values.dtype.kind == 'U' else values
+        else:
+            full[name] = DEFAULTS.get(name, 0.0)
+    return full
+
+def iter_chunks(path, chunk_rows=1 << 16):
+    """返回 (目录类型, 结构化数组块的迭代器)"""
+    # utf-8-sig 去掉 Excel 等 Windows 工具写入的 BOM，否则第一列的表头会变成 '\ufeffname'
+    f = io.open(path, encoding='utf-8-sig', newline='')
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return _csv_chunks(f, chunk_rows)
+    if ext in ('.jsonl', '.ndjson'):
+        return _json_chunks(f, chunk_rows)
+    if ext == '.json':
+        return _json_chunks(f, chunk_rows, lines=False)
+    raise ValueError(f"不支持的目录格式: {ext}")
+
+# -------------------- 状态向量 → 轨道根数 --------------------
+def elements_from_state(states):
+    """把状态向量目录换算为轨道根数目录（密切圆轨道）
+
+    模拟器中的轨道为 Rz(node) · (d cos a, d sin a cos i, d sin a sin i)。半径取当前距离，
+    轨道平面由角动量 h = r × v 确定，角速度取 |h| / r²；径向速度被舍去。
+    角动量为零（静止或纯径向运动）的天体角速度为 0，停在当前位置。
+    """
+    position = np.stack([states['x'], states['y'], states['z']], axis=-1)
+    velocity = np.stack([states['vx'], states['vy'], states['vz']], axis=-1)
+    distance = np.linalg.norm(position, axis=1)
+    momentum = np.cross(position, velocity)
+    h = np.linalg.norm(momentum, axis=1)
+    moving = h > 0
+    # 轨道法向 n = (sin i sin Ω, -sin i cos Ω, cos i)
+    normal = np.where(moving[:, None], momentum / np.where(moving, h, 1.0)[:, None], (0.0, 0.0, 1.0))
+    inclination = np.arccos(np.clip(normal[:, 2], -1.0, 1.0))
+    # 轨道平面与参考平面重合时升交点不确定，取 0
+    node = np.where(np.hypot(normal[:, 0], normal[:, 1]) > 1e-12,
+                    np.arctan2(normal[:, 0], -normal[:, 1]), 0.0)
+    # 把位置转回 node = 0 的坐标系后求轨道内的角度
+    cos_node, sin_node = np.cos(node), np.sin(node)
+    qx = position[:, 0] * cos_node + position[:, 1] * sin_node
+    qy = -position[:, 0] * sin_node + position[:, 1] * cos_node
+    phase = np.arctan2(qy * np.cos(inclination) + position[:, 2] * np.sin(inclination), qx)
+
+    elements = np.zeros(len(states), dtype=ELEMENTS_DTYPE)
+    for name in ('name', 'radius', 'mass'):
+        elements[name] = states[name]
+    elements['color'] = DEFAULTS['color']
+    elements['distance'] = distance
+    elements['speed'] = np.where(distance > 0, h / np.maximum(distance, 1e-300) ** 2, 0.0)
+    elements['inclination'] = np.degrees(inclination)
+    elements['node'] = np.degrees(node)
+    elements['phase'] = np.degrees(phase)
+    return elements
+
+# -------------------- 二进制缓存 --------------------
+def source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _index_path(cache_dir):
+    return os.path.join(cache_dir, 'catalogs', 'index.json')
+
+def _cached_hash(path, cache_dir):
+    """大小和修改时间未变时复用记录的哈希，否则重新计算并记录"""
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    index_path = _index_path(cache_dir)
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    entry = index.get(key)
+    if entry and entry["stamp"] == stamp:
+        return entry["sha256"]
+    digest = source_hash(path)
+    index[key] = {"stamp": stamp, "sha256": digest}
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    return digest
+
+def _npy_header(dtype, rows, size=None):
+    """.npy 1.0 格式的文件头；size 指定时用空格补齐到固定长度，便于写完数据后回填行数"""
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                   'shape': (rows,)})
+    total = size or (len(header) + 10 + 1 + 20 + 63) // 64 * 64
+    header = header.ljust(total - 10 - 1) + '\n'
+    return b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+def _write_cache(chunks, dtype, path):
+    """边解析边写入 .npy：先写占位文件头，结束后回填实际行数，最后原子替换"""
+    temp = f"{path}.{os.getpid()}.tmp"
+    header_size = len(_npy_header(dtype, 0))
+    rows = 0
+    try:
+        with open(temp, 'wb') as f:
+            f.write(_npy_header(dtype, 0, header_size))
+            for chunk in chunks:
+                f.write(chunk.tobytes())
+                rows += len(chunk)
+            f.seek(0)
+            f.write(_npy_header(dtype, rows, header_size))
+    except BaseException:
+        # 解析中途出错（如后面的行出现未知列）时不留下半个缓存文件
+        os.remove(temp)
+        raise
+    os.replace(temp, path)
+
+def load_catalog(path, cache_dir=CACHE_DIR, chunk_rows=1 << 16):
+    """加载目录，返回只读内存映射的结构化数组（目录类型可由 detect_kind(array.dtype.names) 得到）"""
+    digest = _cached_hash(path, cache_dir)
+    cache_path = os.path.join(cache_dir, 'catalogs', f"{digest[:24]}_v{FORMAT_VERSION}.npy")
+    if not os.path.exists(cache_path):
+        kind, chunks = iter_chunks(path, chunk_rows)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _write_cache(chunks, KINDS[kind][0], cache_path)
+    return np.load(cache_path, mmap_mode='r')
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        return 1
+    start = time.perf_counter()
+    catalog = load_catalog(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    print(f"{len(catalog)} 行（{detect_kind(catalog.dtype.names)}），"
+          f"{catalog.nbytes / 1e6:.1f} MB，用时 {elapsed * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
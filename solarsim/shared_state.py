@@ -0,0 +1,247 @@
+"""双进程模式：物理进程和渲染进程通过共享内存三缓冲交换状态
+
+用法:
+    python -m solarsim shared --rate 240                     # 物理每秒步进 240 次，渲染按显示器刷新
+    python -m solarsim shared --scenario belt.csv --rate 0   # 物理不限速
+
+共享内存中有三个槽位，每个槽位包含一帧完整的状态：小行星带实例行 (x, y, z, 半径, r, g, b, 自转角)、
+行星的位置和轨迹参数、记录模式下的轨迹采样。物理进程每步写入一个既不是"最新"也不被渲染进程占用的槽位，
+写完后发布为最新；渲染进程每帧占用最新槽位，小行星带直接以共享内存视图作为实例数组，
+由渲染器上传到顶点缓冲，不经过 pickle 或中间复制。
+每个槽位带一个序号（seqlock）：写入期间为奇数，渲染进程释放槽位时若发现序号变化则记为撕裂帧。
+正常情况下占用标记保证不会发生撕裂，序号校验只用于发现弱内存序下的竞争。
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from solarsim.solar_system_simulator import Config, SolarSystem, SolarSystemSimulator
+
+# -------------------- 共享内存布局 --------------------
+SLOTS = 3
+# 整数头部：最新槽位、渲染占用的槽位、三个槽位的序号、已写入步数、停止标志
+LATEST, READING, SEQUENCE, WRITTEN, STOP = 0, 1, 2, 2 + SLOTS, 3 + SLOTS
+HEADER_WORDS = 8
+# 渲染进程 → 物理进程的控制量：时间步长、是否暂停
+DT, PAUSED = range(2)
+# 行星每行：x, y, z, 轨道角, 自转角, 解析轨迹弧长, 轨迹写入位置, 轨迹采样数
+PLANET_FIELDS = 8
+
+def _aligned(size, alignment=64):
+    return (size + alignment - 1) // alignment * alignment
+
+class SharedState:
+    """在一块共享内存上建立头部、控制量和三个槽位的 NumPy 视图"""
+    def __init__(self, planets, belt, trail_length, name=None):
+        self.shape = (planets, belt, trail_length)
+        fields = [
+            ('instances', (belt, 8), np.float32),
+            ('planets', (planets, PLANET_FIELDS), np.float64),
+            ('trails', (planets, trail_length, 3), np.float32),
+        ]
+        offset = _aligned(HEADER_WORDS * 8 + 2 * 8)
+        layout = []
+        for _ in range(SLOTS):
+            slot = {}
+            for field, shape, dtype in fields:
+                slot[field] = (offset, shape, dtype)
+                offset = _aligned(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            layout.append(slot)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=offset)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        buffer = self.shm.buf
+        self.header = np.ndarray(HEADER_WORDS, dtype=np.int64, buffer=buffer)
+        self.control = np.ndarray(2, dtype=np.float64, buffer=buffer, offset=HEADER_WORDS * 8)
+        self.slots = [{field: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=start)
+                       for field, (start, shape, dtype) in slot.items()} for slot in layout]
+        if name is None:
+            self.header[:] = 0
+            self.header[READING] = -1
+            self.control[:] = (1.0, 0.0)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    # ---- 物理进程 ----
+    def begin_write(self):
+        header = self.header
+        slot = next(i for i in range(SLOTS) if i != header[LATEST] and i != header[READING])
+        header[SEQUENCE + slot] += 1  # 奇数：写入中
+        return slot
+
+    def end_write(self, slot):
+        header = self.header
+        header[SEQUENCE + slot] += 1
+        header[LATEST] = slot
+        header[WRITTEN] += 1
+
+    # ---- 渲染进程 ----
+    def acquire(self):
+        """占用最新槽位，返回 (槽位, 序号)；还没有任何数据时返回 None"""
+        header = self.header
+        while header[WRITTEN] > 0:
+            slot = int(header[LATEST])
+            header[READING] = slot
+            # 占用标记写入后最新槽位没有变化，物理进程此后就不会再选中它
+            if header[LATEST] != slot:
+                continue
+            sequence = int(header[SEQUENCE + slot])
+            if sequence % 2 == 0:
+                return slot, sequence
+        return None
+
+    def release(self, slot, sequence):
+        """释放槽位，返回这一帧是否完整（期间未被改写）"""
+        intact = self.header[SEQUENCE + slot] == sequence
+        self.header[READING] = -1
+        return intact
+
+    def close(self, unlink=False):
+        # 先释放所有视图，否则 SharedMemory.close 会因缓冲区仍被引用而失败
+        self.header = self.control = self.slots = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+# -------------------- 物理进程 --------------------
+def write_state(solar_system, slot):
+    """把一步模拟结果写入槽位"""
+    np.copyto(slot['instances'], solar_system.belt.instances)
+    rows, trails = slot['planets'], slot['trails']
+    for i, planet in enumerate(solar_system.planets):
+        rows[i] = (planet.x, planet.y, planet.z, planet.angle, planet.rotation_angle,
+                   planet.trail_arc, planet.trail_index, planet.trail_count)
+        if not planet.analytic_trail:
+            trails[i] = planet.trail
+
+def physics_main(name, overrides, rate):
+    for key, value in overrides.items():
+        setattr(Config, key, value)
+    solar_system = SolarSystem()
+    shared = SharedState(len(solar_system.planets), solar_system.belt.count, Config.MAX_TRAIL_LENGTH, name)
+    header, control = shared.header, shared.control
+    period = 1.0 / rate if rate else 0.0
+    next_time = time.perf_counter()
+    try:
+        while not header[STOP]:
+            paused = bool(control[PAUSED])
+            if not paused or header[WRITTEN] == 0:
+                solar_system.update(control[DT], paused)
+                slot = shared.begin_write()
+                write_state(solar_system, shared.slots[slot])
+                shared.end_write(slot)
+            if paused:
+                time.sleep(0.01)
+                next_time = time.perf_counter()
+            elif period:
+                next_time += period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -period:
+                    next_time = time.perf_counter()
+    finally:
+        shared.close()
+
+# -------------------- 渲染进程 --------------------
+class SharedStateViewer(SolarSystemSimulator):
+    """渲染共享内存中最新的一帧，不在本进程步进物理"""
+    def __init__(self, shared, process=None):
+        self.shared = shared
+        self.process = process
+        self.held = None
+        self.frames = 0
+        self.torn = 0
+        super().__init__()
+        planets, belt, _ = shared.shape
+        if planets != len(self.solar_system.planets) or belt != self.solar_system.belt.count:
+            raise ValueError("共享内存布局与本地场景不一致")
+
+    def _update(self):
+        # 物理进程退出后共享内存不再更新，继续渲染只会显示空场景或静止的最后一帧
+        if self.process is not None and not self.process.is_alive():
+            raise RuntimeError(f"物理进程已退出（退出码 {self.process.exitcode}）")
+        shared = self.shared
+        shared.control[:] = (self.dt, float(self.paused))
+        # 上一帧已经显示完毕，释放后再占用最新槽位
+        if self.held is not None:
+            if not shared.release(*self.held):
+                self.torn += 1
+            self.held = None
+        held = shared.acquire()
+        if held is None:
+            return
+        self.held = held
+        self.frames += 1
+        self._apply(shared.slots[held[0]])
+        if self.selection is not None:
+            self._follow_selection()
+
+    def _apply(self, slot):
+        solar_system = self.solar_system
+        # 小行星带直接使用共享内存视图，裁剪和实例上传都从这里读取
+        solar_system.belt.instances = slot['instances']
+        trails = slot['trails']
+        for i, (planet, row) in enumerate(zip(solar_system.planets, slot['planets'].tolist())):
+            (planet.x, planet.y, planet.z, planet.angle, planet.rotation_angle,
+             planet.trail_arc, trail_index, trail_count) = row
+            if planet.trail is not None:
+                planet.trail = trails[i]
+                planet.trail_index, planet.trail_count = int(trail_index), int(trail_count)
+        solar_system.bvh_dirty = True
+
+    def _scene_changed(self, events, camera_state):
+        # 暂停时物理进程可能仍在写入暂停前的最后一步
+        return super()._scene_changed(events, camera_state) or self.frames == 0
+
+def start_physics(shared, rate):
+    overrides = {key: getattr(Config, key)
+                 for key in ('SCENARIO', 'SCENARIO_PLANETS', 'BELT_COUNT', 'TRAIL_MODE', 'MAX_TRAIL_LENGTH')}
+    # spawn 启动的子进程不继承 pygame 和 OpenGL 状态
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=physics_main, args=(shared.name, overrides, rate), daemon=True)
+    process.start()
+    return process
+
+def create_shared_state():
+    """按当前 Config 构造的场景尺寸分配共享内存"""
+    solar_system = SolarSystem()
+    return SharedState(len(solar_system.planets), solar_system.belt.count, Config.MAX_TRAIL_LENGTH)
+
+def main():
+    parser = argparse.ArgumentParser(description="物理与渲染分进程运行")
+    parser.add_argument('--scenario', help="天体目录文件（见 scenario_catalog.py）")
+    parser.add_argument('--rate', type=float, default=Config.FPS, help="物理每秒步数，0 表示不限速")
+    args = parser.parse_args()
+    if args.scenario:
+        Config.SCENARIO = args.scenario
+
+    shared = create_shared_state()
+    process = start_physics(shared, args.rate)
+    try:
+        viewer = SharedStateViewer(shared, process)
+        start = time.perf_counter()
+        viewer.run()
+        elapsed = time.perf_counter() - start
+        written = int(shared.header[WRITTEN])
+        print(f"物理 {written / elapsed:.1f} 步/秒，渲染 {viewer.frames / elapsed:.1f} 帧/秒，"
+              f"撕裂帧 {viewer.torn}")
+    except RuntimeError as error:
+        print(error)
+        return 1
+    finally:
+        shared.header[STOP] = 1
+        process.join(timeout=5)
+        viewer = None
+        shared.close(unlink=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+from solarsim.lazy import pygame, GL, GLU
+import random
+import math
+from solarsim.text_cache import TextCache, begin_overlay, end_overlay
+from solarsim.fonts import load_font
+
+WIDTH, HEIGHT = 1000, 800
+SEED = None  # 星空的随机种子，None 表示每次运行不同
+
+# 初始化（导入本模块时不创建窗口，由 main() 调用）
+def init_display():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.OPENGL)
+
+    # OpenGL设置
+    GLU.gluPerspective(45, (WIDTH/HEIGHT), 0.1, 1000.0)
+    GL.glTranslatef(0, 0, -400)
+    GL.glEnable(GL.GL_DEPTH_TEST)
+    init_lighting()
+
+# 改进的光照初始化
+def init_lighting():
+    GL.glEnable(GL.GL_LIGHTING)
+    GL.glEnable(GL.GL_LIGHT0)
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_POSITION,  (0, 0, 0, 1))  # 光源固定在太阳位置
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_AMBIENT,  (0.2, 0.2, 0.2, 1))
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_DIFFUSE,  (0.8, 0.8, 0.8, 1))
+    GL.glLightfv(GL.GL_LIGHT0, GL.GL_SPECULAR, (0.5, 0.5, 0.5, 1))
+
+    GL.glMaterialfv(GL.GL_FRONT, GL.GL_AMBIENT, (0.2, 0.2, 0.2, 1))
+    GL.glMaterialfv(GL.GL_FRONT, GL.GL_DIFFUSE, (0.8, 0.8, 0.8, 1))
+    GL.glMaterialfv(GL.GL_FRONT, GL.GL_SPECULAR, (0.5, 0.5, 0.5, 1))
+    GL.glMaterialf(GL.GL_FRONT, GL.GL_SHININESS, 50)
+    
+    GL.glColorMaterial(GL.GL_FRONT, GL.GL_AMBIENT_AND_DIFFUSE)
+    GL.glEnable(GL.GL_COLOR_MATERIAL)
+
+# 天体类（带法线生成）
+class CelestialBody:
+    def __init__(self, distance, radius, color):
+        self.distance = distance
+        self.radius = radius
+        self.color = color
+        self.angle = 0
+        self.trail = []
+        self.max_trail = 50
+        self.quad = GLU.gluNewQuadric()
+        GLU.gluQuadricNormals(self.quad, GLU.GLU_SMOOTH)  # 生成法线
+        
+    def update(self, speed):
+        self.angle += speed
+        x = self.distance * math.cos(math.radians(self.angle))
+        z = self.distance * math.sin(math.radians(self.angle))
+        self.trail.append((x, 0, z))
+        if len(self.trail) > self.max_trail:
+            self.trail.pop(0)
+            
+    def draw(self):
+        x = self.distance * math.cos(math.radians(self.angle))
+        z = self.distance * math.sin(math.radians(self.angle))
+        
+        GL.glPushMatrix()
+        GL.glTranslatef(x, 0, z)
+        GL.glColor3fv(self.color)  # 颜色影响材质
+        GLU.gluSphere(self.quad, self.radius, 32, 32)
+        GL.glPopMatrix()
+        
+    def draw_trail(self):
+        if len(self.trail) < 2:
+            return
+            
+        GL.glDisable(GL.GL_LIGHTING)
+        GL.glLineWidth(2.0)
+        GL.glBegin(GL.GL_LINE_STRIP)
+        GL.glColor4f(*self.color, 0.3)
+        for pos in self.trail:
+            GL.glVertex3fv(pos)
+        GL.glEnd()
+
+# 改进的UI类
+class UI:
+    def __init__(self):
+        self.font = load_font('Microsoft YaHei', 24)
+        self.text_cache = TextCache()
+        # # 使用支持中文的字体，尝试多种可能的字体
+        # try:
+        #     # 尝试使用微软雅黑
+        #     self.font = pygame.font.SysFont('Microsoft YaHei', 24)
+        # except:
+        #     try:
+        #         # 尝试使用黑体
+        #         self.font = pygame.font.SysFont('SimHei', 24)
+        #     except:
+        #         try:
+        #             # 如果找不到专门的中文字体，尝试使用系统默认字体
+        #             self.font = pygame.font.Font(pygame.font.get_default_font(), 24)
+        #         except:
+        #             # 如果都失败了，回退到Arial
+        #             self.font = pygame.font.SysFont('Arial', 24)
+        
+    def draw_text(self, text, pos):
+        # 文字纹理按内容缓存，只有新文字才会重新渲染和上传
+        begin_overlay(WIDTH, HEIGHT)
+        self.text_cache.draw_text(text, self.font, pos[0], pos[1], (255,255,255,255))
+        end_overlay()
+
+    def draw_value(self, label, value, pos):
+        # 数值每帧都在变，逐字符绘制，避免每帧生成一张新纹理
+        begin_overlay(WIDTH, HEIGHT)
+        x = pos[0] + self.text_cache.draw_text(label, self.font, pos[0], pos[1], (255,255,255,255)).width
+        self.text_cache.draw_glyphs(value, self.font, x, pos[1], (255,255,255,255))
+        end_overlay()
+
+def draw_stars(stars):
+    GL.glDisable(GL.GL_LIGHTING)
+    GL.glPointSize(1.5)
+    GL.glBegin(GL.GL_POINTS)
+    for star in stars:
+        GL.glColor3f(1,1,1)
+        GL.glVertex3fv(star)
+    GL.glEnd()
+
+def main():
+    init_display()
+
+    # 创建对象
+    sun = CelestialBody(0, 20, (1,1,0))
+    earth = CelestialBody(100, 8, (0,0.5,1))
+    ui = UI()
+
+    # 生成星空
+    rng = random.Random(SEED)
+    stars = [(rng.uniform(-500,500), 
+             rng.uniform(-500,500),
+             rng.uniform(-500,500)) for _ in range(2000)]
+
+    # 主循环
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+
+        # 更新
+        earth.update(0.5)
+
+        # 绘制
+        sun.draw()
+        earth.draw()
+        earth.draw_trail()
+        draw_stars(stars)  # 最后绘制星空
+
+        # UI
+        ui.draw_text("太阳系模拟", (20, 20))
+        ui.draw_value("地球轨道角度: ", f"{earth.angle:.1f}°", (20, 50))
+
+        pygame.display.flip()
+        pygame.time.wait(10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,942 @@
+from solarsim.lazy import pygame, GL, GLU
+import math
+import numpy as np
+from solarsim.camera_math import (translation, rotation, perspective, project_points,
+                                  unproject_ray, frustum_planes, spheres_in_frustum,
+                                  boxes_in_frustum)
+from solarsim.instanced_renderer import InstancedRenderer
+from solarsim.text_cache import TextCache, TextTexture, begin_overlay, end_overlay
+from solarsim.label_layout import LabelPlacer, label_priority
+from solarsim.quality_governor import QualityGovernor, QUALITY_LEVELS
+from solarsim.picking import SphereBVH
+from solarsim.frame_profiler import FrameProfiler
+from solarsim.alloc_tracker import AllocationTracker
+from solarsim.fonts import load_font
+from solarsim.scenario_catalog import load_catalog, detect_kind, elements_from_state
+from solarsim.input_replay import LiveInput
+
+# -------------------- 配置常量 --------------------
+class Config:
+    WIDTH, HEIGHT = 1000, 800
+    FPS = 60
+    FOV, NEAR, FAR = 45, 1.0, 5000.0
+    RENDERER = 'instanced'  # 'instanced' (GLSL 实例化) 或 'legacy' (固定管线)
+    ADAPTIVE_QUALITY = True  # 帧耗时超出 FPS 预算时自动降低画质
+    MAX_TRAIL_LENGTH = 300
+    TRAIL_MODE = 'analytic'  # 'analytic' (绘制时由轨道根数生成) 或 'stored' (逐步记录采样)
+    TRAIL_SEGMENT_PIXELS = 4  # 解析轨迹每段在屏幕上的目标长度
+    BACKGROUND_COLOR = (0.0, 0.0, 0.05, 1.0)
+    STAR_COUNT = 2000
+    DEFAULT_SHOW_NAMES = True
+    DEFAULT_SHOW_ORBITS = True
+    LABEL_BUDGET = 50  # 每帧最多显示的名称标签数
+    CLICK_TOLERANCE = 4  # 按下到松开移动不超过这么多像素视为单击
+    PROFILE = False  # 启动时就开启分阶段帧剖析（运行中按 P 切换）
+    PROFILE_CAPACITY = 600  # 每个阶段保留最近多少次采样
+    SEED = None  # 随机种子（星空、小行星带），None 表示每次运行不同；录制输入时自动选定并写入记录文件
+    PROFILE_MODE = 'time'  # 'time' (各阶段耗时) 或 'alloc' (tracemalloc 分配统计与 GC 停顿，开销很大)
+
+    # 小行星带（NumPy 数组批量更新，可设为 100000 测试大规模渲染）
+    BELT_COUNT = 1500
+    BELT_RANGE = (225, 260)
+    BELT_RADIUS = (0.5, 1.5)
+
+    # 场景目录（CSV/JSONL 轨道根数，见 scenario_catalog.py）；设置后取代 PLANET_PARAMS 和随机小行星带：
+    # 质量最大的 SCENARIO_PLANETS 个天体作为行星，其余全部进入小行星带的 NumPy 数组
+    SCENARIO = None
+    SCENARIO_PLANETS = 8
+    
+    # 颜色定义
+    COLORS = {
+        'YELLOW': (1.0, 1.0, 0.0),
+        'BLUE': (0.1, 0.4, 0.9),
+        'RED': (0.9, 0.2, 0.2),
+        'ORANGE': (1.0, 0.65, 0.0),
+        'GREY': (0.6, 0.6, 0.6),
+        'SATURN': (0.9, 0.8, 0.5),
+        'JUPITER': (0.9, 0.7, 0.4),
+    }
+    
+    # 行星参数
+    PLANET_PARAMS = [
+        # (距离, 半径, 颜色, 质量, 速度, 倾角, 名称)
+        (70, 3, 'GREY', 3.3e23, 0.02, 7.0, "水星"),
+        (100, 6, 'ORANGE', 4.87e24, 0.015, 3.4, "金星"),
+        (150, 7, 'BLUE', 5.97e24, 0.01, 0.0, "地球"),
+        (200, 5, 'RED', 6.42e23, 0.008, 1.8, "火星"),
+        (280, 15, 'JUPITER', 1.898e27, 0.004, 1.3, "木星"),
+        (400, 12, 'SATURN', 5.683e26, 0.003, 2.5, "土星"),
+    ]
+
+# -------------------- 摄像机类 --------------------
+class Camera:
+    def __init__(self):
+        self.reset()
+        
+    def reset(self):
+        self.position = [0.0, 0.0, -600.0]
+        self.rotation = [30.0, 0.0, 0.0]
+        self.zoom_level = 1.0
+        self.focus = [0.0, 0.0, 0.0]  # 视角围绕旋转的中心，跟随天体时随之移动
+        self.dragging = False
+        self.last_mouse_pos = (0, 0)
+
+    def apply(self):
+        GL.glLoadIdentity()
+        GL.glTranslatef(*self.position)
+        GL.glTranslatef(0, 0, 200 * (1 - self.zoom_level))
+        GL.glRotatef(self.rotation[0], 1, 0, 0)
+        GL.glRotatef(self.rotation[1], 0, 1, 0)
+        GL.glRotatef(self.rotation[2], 0, 0, 1)
+        GL.glTranslatef(-self.focus[0], -self.focus[1], -self.focus[2])
+
+    def state(self):
+        """用于判断摄像机是否移动过的快照"""
+        return (tuple(self.position), tuple(self.rotation), float(self.zoom_level),
+                tuple(self.focus))
+
+    def view_matrix(self):
+        """与 apply() 等价的模型视图矩阵"""
+        return (translation(*self.position)
+                @ translation(0, 0, 200 * (1 - self.zoom_level))
+                @ rotation(self.rotation[0], 1, 0, 0)
+                @ rotation(self.rotation[1], 0, 1, 0)
+                @ rotation(self.rotation[2], 0, 0, 1)
+                @ translation(-self.focus[0], -self.focus[1], -self.focus[2]))
+
+    def eye_position(self):
+        return np.linalg.inv(self.view_matrix())[:3, 3]
+
+    @staticmethod
+    def projection_matrix():
+        return perspective(Config.FOV, Config.WIDTH/Config.HEIGHT, Config.NEAR, Config.FAR)
+
+    def handle_input(self, events, keys=None):
+        """keys: 按键状态（可按键码下标取值），默认读取 pygame 的实时状态"""
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        
+        # 键盘旋转控制
+        if keys[pygame.K_LEFT]: self.rotation[1] -= 1
+        if keys[pygame.K_RIGHT]: self.rotation[1] += 1
+        if keys[pygame.K_UP] and (keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL]): 
+            self.rotation[0] -= 1
+        if keys[pygame.K_DOWN] and (keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL]):
+            self.rotation[0] += 1
+        if keys[pygame.K_q]: self.rotation[2] -= 1
+        if keys[pygame.K_e]: self.rotation[2] += 1
+
+        # 鼠标事件处理
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1:
+                    self.start_drag(event.pos)
+                elif event.button == 4: self.zoom(0.1)
+                elif event.button == 5: self.zoom(-0.1)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.end_drag()
+            elif event.type == pygame.MOUSEMOTION:
+                self.drag(event.pos)
+
+    def rotate(self, dx, dy):
+        self.rotation[1] += dx * 0.1
+        self.rotation[0] += dy * 0.1
+
+    def zoom(self, amount):
+        self.zoom_level = np.clip(self.zoom_level + amount, 0.1, 3.0)
+
+    def start_drag(self, pos):
+        self.dragging = True
+        self.last_mouse_pos = pos
+
+    def end_drag(self):
+        self.dragging = False
+
+    def drag(self, pos):
+        if self.dragging:
+            dx = pos[0] - self.last_mouse_pos[0]
+            dy = pos[1] - self.last_mouse_pos[1]
+            self.rotate(dx, dy)
+            self.last_mouse_pos = pos
+
+# -------------------- 天体类 --------------------
+class CelestialBody:
+    def __init__(self, distance, radius, color_name, mass, speed, inclination, name, node=0.0):
+        """inclination: 轨道倾角（度），node: 升交点经度（度），轨道平面先绕 x 轴倾斜再绕 z 轴转动"""
+        self.distance = distance
+        self.radius = radius
+        self.color = Config.COLORS[color_name]
+        # 颜色不会变化，提亮后的颜色只计算一次，绘制时不再每帧生成新元组
+        self.enhanced_color = tuple(min(1.0, c*1.5) for c in self.color)
+        self.mass = mass
+        self.orbital_speed = speed
+        self.inclination = math.radians(inclination)
+        self.cos_node = math.cos(math.radians(node))
+        self.sin_node = math.sin(math.radians(node))
+        self.name = name
+        
+        self.angle = 0
+        self.rotation_angle = 0
+        # 由 SolarSystem.cull 每帧更新
+        self.visible = True
+        self.trail_visible = True
+        self.orbit_visible = True
+        # 自发光天体（太阳）在实例化渲染中不受光照
+        self.emissive = False
+        # 被外部改变位置后相对固定轨道的偏移，之后沿轨道运动时保持这一偏移，轨迹改为记录采样
+        self.offset = None
+        self.trail_colors = None
+        self._init_position()
+        self._init_trail()
+        # GLU 二次曲面在第一次绘制时创建：只做物理计算（基准、物理进程）时不加载 OpenGL
+        self.quadratic = None
+
+    def _init_position(self):
+        self.x = self.distance
+        self.y = self.z = 0.0
+
+    def _init_trail(self):
+        # 解析模式下轨迹只是轨道上最近的一段弧，只记录弧对应的转角，不保存采样
+        self.trail_arc = 0.0
+        self.trail = None
+        self.trail_index = 0
+        self.trail_count = 0
+        if Config.TRAIL_MODE != 'analytic':
+            self._allocate_trail()
+
+    def _allocate_trail(self):
+        self.trail = np.zeros((Config.MAX_TRAIL_LENGTH, 3), dtype=np.float32)
+
+    @property
+    def analytic_trail(self):
+        return self.trail is None
+
+    def has_trail(self):
+        return self.trail_arc > 0 if self.analytic_trail else self.trail_count > 0
+
+    def update_position(self, dt):
+        self.rotation_angle += dt * 10
+        delta = abs(self.orbital_speed * dt)
+        self.angle += self.orbital_speed * dt
+        self._calculate_position()
+        if self.analytic_trail:
+            self.trail_arc = min(self.trail_arc + delta, Config.MAX_TRAIL_LENGTH * delta)
+        else:
+            self._update_trail()
+
+    def set_position(self, x, y, z):
+        """由外部设置位置（扰动）：天体此后带着与固定轨道的偏移继续运动，
+        轨迹改为记录实际经过的采样点"""
+        if self.analytic_trail:
+            self._switch_to_stored_trail()
+        self.offset = None
+        self._calculate_position()
+        self.offset = (x - self.x, y - self.y, z - self.z)
+        self.x, self.y, self.z = x, y, z
+        self._update_trail()
+
+    def perturb(self, dx, dy, dz):
+        self.set_position(self.x + dx, self.y + dy, self.z + dz)
+
+    def _switch_to_stored_trail(self):
+        # 用当前解析弧预填充采样，切换前后轨迹保持连续
+        samples = self._analytic_trail(min(Config.MAX_TRAIL_LENGTH - 1, 64)) if self.has_trail() else []
+        self._allocate_trail()
+        for sample in samples:
+            self.trail[self.trail_index] = sample
+            self.trail_index += 1
+        self.trail_count = self.trail_index
+
+    def _calculate_position(self):
+        x = self.distance * math.cos(self.angle)
+        y = self.distance * math.sin(self.angle) * math.cos(self.inclination)
+        self.x = x * self.cos_node - y * self.sin_node
+        self.y = x * self.sin_node + y * self.cos_node
+        self.z = self.distance * math.sin(self.angle) * math.sin(self.inclination)
+        if self.offset is not None:
+            self.x += self.offset[0]
+            self.y += self.offset[1]
+            self.z += self.offset[2]
+
+    def _update_trail(self):
+        idx = self.trail_index % Config.MAX_TRAIL_LENGTH
+        self.trail[idx] = (self.x, self.y, self.z)
+        self.trail_index += 1
+        self.trail_count = min(self.trail_count + 1, Config.MAX_TRAIL_LENGTH)
+
+    def draw(self, with_body=True, quality=QUALITY_LEVELS[0], pixels_per_unit=1.0, with_trail=True):
+        """pixels_per_unit: 天体附近一个世界单位在屏幕上的像素数，决定解析轨迹的分段数"""
+        if with_body and self.visible:
+            self._draw_body(max(6, int(24 * quality.lod_bias)))
+        if with_trail and self.trail_visible and self.has_trail():
+            if self.analytic_trail:
+                pixels = self.trail_arc * self.distance * pixels_per_unit
+                segments = int(pixels / (Config.TRAIL_SEGMENT_PIXELS * quality.trail_stride))
+                vertices = self._analytic_trail(min(max(segments, 2), Config.MAX_TRAIL_LENGTH))
+            else:
+                vertices = self._stored_trail()[::-1][::quality.trail_stride][::-1]
+            self._draw_trail(vertices)
+
+    def trail_bounds(self):
+        if self.analytic_trail:
+            return self.orbit_bounds()
+        samples = self.trail[:self.trail_count]
+        return samples.min(axis=0), samples.max(axis=0)
+
+    def orbit_bounds(self):
+        cos_i = math.cos(self.inclination)
+        extent = self.distance * np.array([math.hypot(self.cos_node, cos_i * self.sin_node),
+                                           math.hypot(self.sin_node, cos_i * self.cos_node),
+                                           abs(math.sin(self.inclination))])
+        return -extent, extent
+
+    def _draw_body(self, slices=24):
+        GL.glPushMatrix()
+        GL.glTranslatef(self.x, self.y, self.z)
+        GL.glRotatef(self.rotation_angle, 0, 1, 0)
+        GL.glColor3f(*self.enhanced_color)
+        if self.quadratic is None:
+            self.quadratic = GLU.gluNewQuadric()
+        GLU.gluSphere(self.quadratic, self.radius, slices, slices)
+        GL.glPopMatrix()
+
+    def instance_row(self):
+        # 半径取负值标记自发光，见 instanced_renderer
+        return (self.x, self.y, self.z, -self.radius if self.emissive else self.radius,
+                *self.enhanced_color, self.rotation_angle)
+
+    def _analytic_trail(self, segments):
+        """由轨道根数生成最近 trail_arc 弧度的轨迹，从旧到新排列"""
+        direction = 1.0 if self.orbital_speed >= 0 else -1.0
+        angles = self.angle - direction * np.linspace(self.trail_arc, 0.0, segments + 1)
+        return self.orbit_points(angles)
+
+    def orbit_points(self, angles):
+        """轨道上给定角度处的点 (N, 3)"""
+        x = self.distance * np.cos(angles)
+        sin_a = self.distance * np.sin(angles)
+        y = sin_a * math.cos(self.inclination)
+        return np.stack([x * self.cos_node - y * self.sin_node,
+                         x * self.sin_node + y * self.cos_node,
+                         sin_a * math.sin(self.inclination)], axis=-1)
+
+    def _stored_trail(self):
+        """环形缓冲中的采样，从旧到新排列"""
+        start = self.trail_index - self.trail_count
+        order = np.arange(start, self.trail_index) % Config.MAX_TRAIL_LENGTH
+        return self.trail[order]
+
+    def _draw_trail(self, vertices):
+        if len(vertices) < 2: return
+        
+        # 越旧的点越透明；顶点数不变时复用上一帧的颜色数组
+        colors = self.trail_colors
+        if colors is None or len(colors) != len(vertices):
+            colors = self.trail_colors = np.empty((len(vertices), 4), dtype=np.float32)
+            colors[:, :3] = self.enhanced_color
+            colors[:, 3] = np.linspace(0.0, 1.0, len(vertices))
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        
+        GL.glDisable(GL.GL_LIGHTING)
+        GL.glLineWidth(2.0)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+        GL.glVertexPointer(3, GL.GL_FLOAT, 0, vertices)
+        GL.glColorPointer(4, GL.GL_FLOAT, 0, colors)
+        GL.glDrawArrays(GL.GL_LINE_STRIP, 0, len(vertices))
+        GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnable(GL.GL_LIGHTING)
+
+# -------------------- 小行星带 --------------------
+class AsteroidBelt:
+    """大量小天体，全部状态保存在 NumPy 数组中批量更新"""
+    def __init__(self, count, elements=None, rng=None):
+        """elements: 可选的轨道根数目录（scenario_catalog.ELEMENTS_DTYPE），给定时忽略 count"""
+        if rng is None:
+            rng = np.random.default_rng(Config.SEED)
+        if elements is not None:
+            count = len(elements)
+        self.count = count
+        if elements is None:
+            self.distance = rng.uniform(*Config.BELT_RANGE, count)
+            self.angle = rng.uniform(0, 2*np.pi, count)
+            # 开普勒第三定律：角速度 ∝ r^-1.5，以地球轨道为基准
+            self.orbital_speed = 0.01 * (150.0 / self.distance) ** 1.5
+            self.inclination = np.radians(rng.normal(0, 3.0, count))
+        else:
+            self.distance = np.array(elements['distance'], dtype=np.float64)
+            # 目录未给出初始角度的天体沿轨道随机分布
+            phase = np.radians(elements['phase'])
+            self.angle = np.where(np.isnan(phase), rng.uniform(0, 2*np.pi, count), phase)
+            self.orbital_speed = np.array(elements['speed'], dtype=np.float64)
+            self.inclination = np.radians(np.asarray(elements['inclination'], dtype=np.float64))
+        self.cos_inclination = np.cos(self.inclination)
+        self.sin_inclination = np.sin(self.inclination)
+        # 升交点经度全为 0 时（随机小行星带和大多数目录）跳过绕 z 轴的转动
+        node = None if elements is None else np.radians(np.asarray(elements['node'], dtype=np.float64))
+        if node is not None and node.any():
+            self.cos_node, self.sin_node = np.cos(node), np.sin(node)
+            self._rotated = np.empty((2, count))
+        else:
+            self.cos_node = None
+        # 每步更新使用的临时数组，预先分配，避免每帧申请内存
+        self._sin = np.empty(count)
+        self._cos = np.empty(count)
+        # 实例数据 x, y, z, 半径, r, g, b, 自转角，可直接上传给实例化渲染器
+        self.instances = np.zeros((count, 8), dtype=np.float32)
+        if elements is None:
+            self.instances[:, 3] = rng.uniform(*Config.BELT_RADIUS, count)
+            self.instances[:, 4:7] = rng.uniform(0.5, 0.8, (count, 1))
+        else:
+            self.instances[:, 3] = elements['radius']
+            self.instances[:, 4:7] = self._catalog_colors(elements['color'])
+        self.instances[:, 7] = rng.uniform(0, 360, count)
+        self.visible = np.ones(count, dtype=bool)
+        self._calculate_positions()
+
+    @staticmethod
+    def _catalog_colors(names):
+        # 颜色名种类很少，按种类查表后一次性展开
+        kinds, inverse = np.unique(names, return_inverse=True)
+        palette = np.array([Config.COLORS.get(kind.decode(errors='replace'), Config.COLORS['GREY']) for kind in kinds])
+        return palette.reshape(-1, 3)[inverse.ravel()]
+
+    @property
+    def positions(self):
+        return self.instances[:, :3]
+
+    def cull(self, planes):
+        self.visible = spheres_in_frustum(planes, self.positions, self.instances[:, 3])
+
+    def visible_instances(self):
+        return self.instances[self.visible]
+
+    def update(self, dt):
+        np.multiply(self.orbital_speed, dt, out=self._sin)
+        self.angle += self._sin
+        self.instances[:, 7] += dt * 10
+        self._calculate_positions()
+
+    def _calculate_positions(self):
+        sin_a, cos_a = np.sin(self.angle, out=self._sin), np.cos(self.angle, out=self._cos)
+        sin_a *= self.distance
+        np.multiply(sin_a, self.sin_inclination, out=self.instances[:, 2], casting='same_kind')
+        if self.cos_node is None:
+            np.multiply(self.distance, cos_a, out=self.instances[:, 0], casting='same_kind')
+            np.multiply(sin_a, self.cos_inclination, out=self.instances[:, 1], casting='same_kind')
+            return
+        # 轨道平面内的坐标 (x, y) 绕 z 轴转过升交点经度
+        cos_a *= self.distance
+        sin_a *= self.cos_inclination
+        a, b = self._rotated
+        np.multiply(cos_a, self.cos_node, out=a)
+        np.multiply(sin_a, self.sin_node, out=b)
+        np.subtract(a, b, out=self.instances[:, 0], casting='same_kind')
+        np.multiply(cos_a, self.sin_node, out=a)
+        np.multiply(sin_a, self.cos_node, out=b)
+        np.add(a, b, out=self.instances[:, 1], casting='same_kind')
+
+    def draw_points(self):
+        """固定管线回退路径：以点的形式绘制"""
+        instances = self.visible_instances()
+        if len(instances) == 0: return
+        GL.glDisable(GL.GL_LIGHTING)
+        GL.glPointSize(1.5)
+        GL.glColor3f(0.7, 0.7, 0.7)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glVertexPointer(3, GL.GL_FLOAT, instances.strides[0], instances)
+        GL.glDrawArrays(GL.GL_POINTS, 0, len(instances))
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnable(GL.GL_LIGHTING)
+
+# -------------------- 太阳系类 --------------------
+class SolarSystem:
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng(Config.SEED)
+        self.sun = CelestialBody(0, 20, 'YELLOW', 1.989e30, 0, 0, "太阳")
+        self.sun.emissive = True
+        if Config.SCENARIO:
+            self.planets, self.belt = self._load_scenario(Config.SCENARIO)
+        else:
+            self.planets = [self._create_planet(*params) for params in Config.PLANET_PARAMS]
+            self.belt = AsteroidBelt(Config.BELT_COUNT, rng=self.rng)
+        self.show_orbits = Config.DEFAULT_SHOW_ORBITS
+        self.show_names = Config.DEFAULT_SHOW_NAMES
+        self.quality = QUALITY_LEVELS[0]
+        self.bvh = None
+        self.bvh_dirty = False
+        self.instance_buffer = np.zeros((1 + len(self.planets) + self.belt.count, 8), dtype=np.float32)
+        self.profiler = FrameProfiler(())
+
+    def _create_planet(self, *args):
+        return CelestialBody(*args)
+
+    def _load_scenario(self, path):
+        catalog = load_catalog(path)
+        if detect_kind(catalog.dtype.names) == 'state':
+            catalog = elements_from_state(catalog)
+        count = min(Config.SCENARIO_PLANETS, len(catalog))
+        heaviest = np.argsort(-catalog['mass'], kind='stable')[:count]
+        rest = np.ones(len(catalog), dtype=bool)
+        rest[heaviest] = False
+        planets = []
+        for row in catalog[np.sort(heaviest)]:
+            color = row['color'].decode(errors='replace')
+            planet = self._create_planet(row['distance'], row['radius'],
+                                         color if color in Config.COLORS else 'GREY', row['mass'],
+                                         row['speed'], row['inclination'],
+                                         row['name'].decode(errors='replace'), row['node'])
+            if not np.isnan(row['phase']):
+                planet.angle = math.radians(row['phase'])
+                planet._calculate_position()
+            planets.append(planet)
+        return planets, AsteroidBelt(0, catalog[rest], self.rng)
+
+    def update(self, dt, paused):
+        if not paused:
+            for planet in self.planets:
+                planet.update_position(dt)
+            self.belt.update(dt)
+            # 拾取结构在下次查询时才重新拟合，平时不占用帧时间
+            self.bvh_dirty = True
+
+    def pick(self, origin, direction):
+        """返回射线最先命中的天体下标（太阳和行星在前，小行星在后），未命中返回 None"""
+        centers, radii = self._pick_spheres()
+        if self.bvh is None:
+            self.bvh = SphereBVH(centers, radii)
+        elif self.bvh_dirty:
+            self.bvh.refit(centers, radii)
+        self.bvh_dirty = False
+        return self.bvh.intersect(origin, direction)[0]
+
+    def _pick_spheres(self):
+        bodies = self.bodies
+        centers = np.concatenate([np.array([(b.x, b.y, b.z) for b in bodies]), self.belt.positions])
+        radii = np.concatenate([[b.radius for b in bodies], self.belt.instances[:, 3]])
+        return centers, radii
+
+    def position_of(self, index):
+        bodies = self.bodies
+        if index < len(bodies):
+            body = bodies[index]
+            return [body.x, body.y, body.z]
+        return [float(v) for v in self.belt.positions[index - len(bodies)]]
+
+    def name_of(self, index):
+        bodies = self.bodies
+        if index < len(bodies):
+            return bodies[index].name
+        return f"小行星 #{index - len(bodies)}"
+
+    @property
+    def bodies(self):
+        return [self.sun] + self.planets
+
+    def instance_data(self):
+        """可见天体的实例数组（太阳和行星在前，小行星带在后）"""
+        # 写入预先分配的缓冲区，返回其中有效部分的视图，不再每帧拼接新数组
+        buffer = self.instance_buffer
+        count = 0
+        for body in self.bodies:
+            if body.visible:
+                buffer[count] = body.instance_row()
+                count += 1
+        belt = self.belt
+        end = count + np.count_nonzero(belt.visible)
+        np.compress(belt.visible, belt.instances, axis=0, out=buffer[count:end])
+        return buffer[:end]
+
+    def cull(self, camera):
+        """视锥体裁剪：一次向量化测试所有包围球和包围盒，结果保存在各天体上"""
+        planes = frustum_planes(camera.projection_matrix() @ camera.view_matrix())
+        bodies = self.bodies
+        visible = spheres_in_frustum(planes, [(b.x, b.y, b.z) for b in bodies],
+                                     [b.radius for b in bodies])
+        for body, flag in zip(bodies, visible):
+            body.visible = flag
+
+        # 轨迹和轨道线都用轴对齐包围盒，合并成一次测试
+        with_trail = [p for p in self.planets if p.has_trail()]
+        boxes = [p.trail_bounds() for p in with_trail] + [p.orbit_bounds() for p in self.planets]
+        for body in bodies:
+            body.trail_visible = False
+        if boxes:
+            mins, maxs = zip(*boxes)
+            visible = boxes_in_frustum(planes, mins, maxs)
+            for body, flag in zip(with_trail, visible[:len(with_trail)]):
+                body.trail_visible = flag
+            for body, flag in zip(self.planets, visible[len(with_trail):]):
+                body.orbit_visible = flag
+        self.belt.cull(planes)
+
+    def draw(self, camera, renderer=None):
+        profiler = self.profiler
+        with profiler.phase('orbits'):
+            self._draw_orbits()
+        with profiler.phase('trails'):
+            for planet, scale in zip(self.planets, self._pixels_per_unit(camera)):
+                planet.draw(with_body=False, quality=self.quality, pixels_per_unit=scale)
+        with profiler.phase('bodies'):
+            if renderer is None:
+                for body in self.bodies:
+                    body.draw(quality=self.quality, with_trail=False)
+                self.belt.draw_points()
+            else:
+                renderer.draw(self.instance_data(), camera.view_matrix(), camera.projection_matrix())
+
+    def _pixels_per_unit(self, camera):
+        """每个行星附近一个世界单位对应的屏幕像素数"""
+        focal = Config.HEIGHT / (2.0 * math.tan(math.radians(Config.FOV) / 2.0))
+        positions = np.array([(p.x, p.y, p.z) for p in self.planets]).reshape(-1, 3)
+        distances = np.linalg.norm(positions - camera.eye_position(), axis=1)
+        return focal / np.maximum(distances, Config.NEAR)
+
+    def _draw_orbits(self):
+        if not self.show_orbits: return
+        
+        GL.glDisable(GL.GL_LIGHTING)
+        GL.glLineWidth(1.0)
+        for planet in self.planets:
+            if not planet.orbit_visible: continue
+            GL.glBegin(GL.GL_LINE_LOOP)
+            for x, y, z in planet.orbit_points(np.linspace(0, 2*np.pi, self.quality.orbit_segments)):
+                GL.glVertex3f(x, y, z)
+            GL.glEnd()
+        GL.glEnable(GL.GL_LIGHTING)
+
+# -------------------- 用户界面类 --------------------
+class UserInterface:
+    def __init__(self):
+        self.font = load_font('Arial', 24)
+        self.text_cache = TextCache()
+        self.panels = {}        # 面板位置 → (内容, 纹理)
+        self.label_placer = LabelPlacer(Config.WIDTH, Config.HEIGHT, budget=Config.LABEL_BUDGET)
+        self.governor = None
+        self.profiler = None
+        self.follow_name = None
+        self.show_info = True
+        self.show_help = False
+
+    def toggle_display(self, key):
+        if key == pygame.K_i: self.show_info = not self.show_info
+        elif key == pygame.K_h: self.show_help = not self.show_help
+
+    def render(self, solar_system, camera, dt, paused):
+        labels = []
+        if not self.show_help and solar_system.show_names:
+            labels = self._project_names(solar_system, camera)
+
+        begin_overlay(Config.WIDTH, Config.HEIGHT)
+        if self.show_help:
+            self._render_help()
+        else:
+            if self.show_info: 
+                self._render_info(dt, paused, camera)
+            for name, x, y in labels:
+                self._draw_text(name, x, y)
+            if self.profiler and self.profiler.enabled:
+                self._render_profile()
+        end_overlay()
+
+    def _render_info(self, dt, paused, camera):
+        lines = [
+            f"时间步长: {dt:.2f}",
+            f"缩放: {camera.zoom_level:.1f}x",
+            f"状态: {'暂停' if paused else '运行'}",
+            "控制: 空格-暂停 I-信息 O-轨道 N-名称",
+            "方向键: 旋转 Q/E-Z轴旋转",
+            "鼠标拖拽/滚轮: 视角控制"
+        ]
+        if self.governor:
+            # 显示的帧耗时按 1ms 取整、每 refresh 帧才更新，避免面板纹理每帧重建
+            lines.insert(3, f"画质: {self.governor.settings.name} "
+                            f"({self.governor.shown_frame_time * 1000:.0f}ms)")
+        if self.follow_name:
+            lines.insert(3, f"跟随: {self.follow_name}")
+        self._draw_panel(lines)
+
+    def _render_profile(self):
+        self._draw_panel(self.profiler.summary(), x=Config.WIDTH - 340, width=320)
+
+    def _render_help(self):
+        self._draw_panel([
+            "=== 帮助 ===",
+            "空格: 暂停/继续",
+            "I: 显示/隐藏信息",
+            "O: 显示/隐藏轨道",
+            "N: 显示/隐藏名称",
+            "H: 显示帮助",
+            "R: 重置视角",
+            "鼠标单击: 选择并跟随天体",
+            "P: 帧剖析面板 T: 保存 Chrome 跟踪",
+            "+/-: 调整时间步长",
+            "ESC: 退出"
+        ], width=400)
+
+    def _draw_panel(self, lines, x=20, y=20, width=300, alpha=150):
+        # 每个位置的面板只保留一张纹理，内容变化时原地替换：旧面板不进文字缓存，
+        # 不会挤掉标签文字，也不会在显存里堆积
+        key = (tuple(lines), width, alpha)
+        cached = self.panels.get((x, y))
+        if cached is None or cached[0] != key:
+            if cached is not None:
+                cached[1].delete()
+            cached = self.panels[(x, y)] = (key, TextTexture(self._build_panel(lines, width, alpha)))
+        cached[1].draw(x, y)
+
+    def _build_panel(self, lines, width, alpha):
+        panel = pygame.Surface((width, len(lines)*25 + 20), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, alpha))
+        for i, text in enumerate(lines):
+            panel.blit(self.font.render(text, True, (255, 255, 255)), (10, 10 + i*25))
+        return panel
+
+    def _project_names(self, solar_system, camera):
+        """用摄像机的 NumPy 矩阵一次投影所有可见天体，不读回任何 GL 状态，
+        再按优先级放置互不重叠的标签"""
+        bodies = [body for body in solar_system.bodies if body.visible]
+        if not bodies:
+            return []
+        positions = np.array([(body.x, body.y, body.z) for body in bodies])
+        view = camera.view_matrix()
+        window, in_front = project_points(positions, camera.projection_matrix() @ view,
+                                          Config.WIDTH, Config.HEIGHT)
+        on_screen = np.flatnonzero(in_front
+                                   & (window[:, 0] >= 0) & (window[:, 0] <= Config.WIDTH)
+                                   & (window[:, 1] >= 0) & (window[:, 1] <= Config.HEIGHT))
+
+        eye = camera.eye_position()
+        priority = label_priority([bodies[i].mass for i in on_screen],
+                                  [bodies[i].radius for i in on_screen],
+                                  np.linalg.norm(positions[on_screen] - eye, axis=1))
+        order = self.label_placer.candidates(priority)
+        rects = np.zeros((len(on_screen), 4))
+        for k in order:
+            i = on_screen[k]
+            texture = self.text_cache.text(bodies[i].name, self.font)
+            x, y = window[i, 0], Config.HEIGHT - window[i, 1] - 30
+            rects[k] = (x, y, x + texture.width, y + texture.height)
+        return [(bodies[on_screen[k]].name, *rects[k, :2])
+                for k in self.label_placer.place(rects, order)]
+
+    def _draw_text(self, text, x, y, color=(255,255,255)):
+        self.text_cache.draw_text(text, self.font, x, y, color)
+
+# -------------------- 主程序类 --------------------
+# 帧剖析的阶段，frame 为更新、渲染和 flip 的总耗时（不含事件处理和 clock.tick 的等待）
+PROFILE_PHASES = ('frame', 'events', 'update', 'stars', 'orbits', 'trails', 'bodies', 'ui')
+
+# 会改变界面显示、因而需要重绘的事件（pygame 常量名，导入本模块时 pygame 尚未加载）
+REDRAW_EVENTS = ('KEYDOWN', 'VIDEOEXPOSE', 'VIDEORESIZE', 'WINDOWEXPOSED', 'WINDOWRESTORED')
+
+class SolarSystemSimulator:
+    def __init__(self):
+        pygame.init()
+        self._init_opengl()
+        self.rng = np.random.default_rng(Config.SEED)
+        self.input = LiveInput()
+        self.camera = Camera()
+        self.solar_system = SolarSystem(self.rng)
+        self.ui = UserInterface()
+        self.clock = pygame.time.Clock()
+        self.dt = 1.0
+        self.paused = False
+        self.stars = self._generate_stars()
+        self.renderer = self._create_renderer()
+        self.governor = QualityGovernor(Config.FPS) if Config.ADAPTIVE_QUALITY else None
+        self.ui.governor = self.governor
+        self.profiler = self._create_profiler()
+        self.solar_system.profiler = self.ui.profiler = self.profiler
+        self.selection = None
+        self.press_pos = None
+
+    def _init_opengl(self):
+        pygame.display.set_mode((Config.WIDTH, Config.HEIGHT), pygame.DOUBLEBUF|pygame.OPENGL)
+        self._init_gl_state()
+
+    def _init_gl_state(self):
+        GL.glMatrixMode(GL.GL_PROJECTION)
+        GLU.gluPerspective(Config.FOV, Config.WIDTH/Config.HEIGHT, Config.NEAR, Config.FAR)
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glEnable(GL.GL_BLEND)
+        GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+        self._setup_lighting()
+
+    def _setup_lighting(self):
+        GL.glEnable(GL.GL_LIGHTING)
+        GL.glEnable(GL.GL_LIGHT0)
+        GL.glLightfv(GL.GL_LIGHT0, GL.GL_AMBIENT, (0.6, 0.6, 0.6, 1))
+        GL.glLightfv(GL.GL_LIGHT0, GL.GL_DIFFUSE, (1.0, 1.0, 1.0, 1))
+        GL.glLightfv(GL.GL_LIGHT0, GL.GL_POSITION, (0,0,0,1))
+
+    def _create_profiler(self):
+        profiler = AllocationTracker if Config.PROFILE_MODE == 'alloc' else FrameProfiler
+        return profiler(PROFILE_PHASES, Config.PROFILE_CAPACITY, enabled=Config.PROFILE)
+
+    def _create_renderer(self):
+        if Config.RENDERER != 'instanced':
+            return None
+        return InstancedRenderer.create(Config.HEIGHT, Config.FOV)
+
+    def _generate_stars(self):
+        # 随机顺序生成，画质降低时只绘制前一部分仍然均匀分布
+        theta = self.rng.uniform(0, 2*np.pi, Config.STAR_COUNT)
+        phi = np.arccos(self.rng.uniform(-1, 1, Config.STAR_COUNT))
+        r = 900
+        return np.ascontiguousarray(np.stack([r*np.sin(phi)*np.cos(theta),
+                                              r*np.sin(phi)*np.sin(theta),
+                                              r*np.cos(phi)], axis=-1), dtype=np.float32)
+
+    def run(self):
+        changed = first_frame = True
+        while True:
+            # 上一帧什么都没变时阻塞等待输入，不再空转重绘
+            events = self._poll_events(block=not changed)
+            frame_start = pygame.time.get_ticks()
+            camera_state = self.camera.state()
+            with self.profiler.phase('events'):
+                running = self._handle_events(events)
+            if not running:
+                break
+            changed = first_frame or self._scene_changed(events, camera_state)
+            first_frame = False
+            if not changed:
+                continue
+            with self.profiler.phase('frame'):
+                with self.profiler.phase('update'):
+                    self._update()
+                self._render()
+                self._present()
+            self.profiler.end_frame()
+            self._adjust_quality((pygame.time.get_ticks() - frame_start) / 1000.0)
+            self.clock.tick(Config.FPS)
+        pygame.quit()
+
+    def _present(self):
+        pygame.display.flip()
+
+    def _poll_events(self, block):
+        return self.input.poll(block)
+
+    def _scene_changed(self, events, camera_state):
+        """模拟在运行、摄像机移动过或有按键/窗口事件时才需要重绘"""
+        redraw = {getattr(pygame, name) for name in REDRAW_EVENTS}
+        return (not self.paused
+                or self.camera.state() != camera_state
+                or any(event.type in redraw for event in events))
+
+    def _adjust_quality(self, frame_time):
+        """frame_time 只包含本帧的工作时间，不含 clock.tick 的等待"""
+        if self.governor and self.governor.record(frame_time):
+            self._apply_quality(self.governor.settings)
+
+    def _apply_quality(self, quality):
+        self.solar_system.quality = quality
+        self.ui.label_placer.budget = min(quality.label_budget, Config.LABEL_BUDGET)
+        if self.renderer:
+            self.renderer.lod_bias = quality.lod_bias
+
+    def _handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                self._handle_keydown(event)
+        self.camera.handle_input(events, self.input.pressed())
+        self._handle_clicks(events)
+        return True
+
+    def _handle_clicks(self, events):
+        """左键按下后几乎没有移动就松开视为单击，与拖拽旋转区分"""
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.press_pos = event.pos
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.press_pos:
+                dx = event.pos[0] - self.press_pos[0]
+                dy = event.pos[1] - self.press_pos[1]
+                if abs(dx) + abs(dy) <= Config.CLICK_TOLERANCE:
+                    self._select_at(event.pos)
+                self.press_pos = None
+
+    def _select_at(self, pos):
+        # 鼠标坐标原点在左上角，窗口坐标原点在左下角
+        view_proj = self.camera.projection_matrix() @ self.camera.view_matrix()
+        origin, direction = unproject_ray(pos[0], Config.HEIGHT - pos[1], view_proj,
+                                          Config.WIDTH, Config.HEIGHT)
+        self.selection = self.solar_system.pick(origin, direction)
+        self._follow_selection()
+
+    def _follow_selection(self):
+        if self.selection is None:
+            self.camera.focus = [0.0, 0.0, 0.0]
+            self.ui.follow_name = None
+        else:
+            self.camera.focus = self.solar_system.position_of(self.selection)
+            self.ui.follow_name = self.solar_system.name_of(self.selection)
+
+    def _handle_keydown(self, event):
+        key = event.key
+        if key == pygame.K_ESCAPE: 
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        elif key == pygame.K_SPACE: 
+            self.paused = not self.paused
+        elif key in (pygame.K_PLUS, pygame.K_KP_PLUS): 
+            self.dt *= 1.2
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS): 
+            self.dt /= 1.2
+        elif key == pygame.K_o: 
+            self.solar_system.show_orbits = not self.solar_system.show_orbits
+        elif key == pygame.K_n: 
+            self.solar_system.show_names = not self.solar_system.show_names
+        elif key == pygame.K_r: 
+            self.camera.reset()
+            self.selection = None
+            self._follow_selection()
+        elif key == pygame.K_p:
+            self.profiler.toggle()
+        elif key == pygame.K_t:
+            self._dump_trace()
+        else: 
+            self.ui.toggle_display(key)
+
+    def _dump_trace(self):
+        if not self.profiler.enabled:
+            print("帧剖析未开启，按 P 开启后再保存")
+            return
+        print(f"已保存到 {self.profiler.dump()}")
+
+    def _update(self):
+        self.solar_system.update(self.dt, self.paused)
+        if self.selection is not None:
+            self._follow_selection()
+
+    def _render(self):
+        GL.glClearColor(*Config.BACKGROUND_COLOR)
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT|GL.GL_DEPTH_BUFFER_BIT)
+        self.camera.apply()
+        with self.profiler.phase('stars'):
+            self._draw_stars()
+        self.solar_system.cull(self.camera)
+        self.solar_system.draw(self.camera, self.renderer)
+        with self.profiler.phase('ui'):
+            self.ui.render(self.solar_system, self.camera, self.dt, self.paused)
+
+    def _draw_stars(self):
+        count = int(len(self.stars) * self.solar_system.quality.star_fraction)
+        GL.glDisable(GL.GL_LIGHTING)
+        GL.glPointSize(2.0)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glVertexPointer(3, GL.GL_FLOAT, 0, self.stars)
+        GL.glDrawArrays(GL.GL_POINTS, 0, count)
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnable(GL.GL_LIGHTING)
+
+def main():
+    simulator = SolarSystemSimulator()
+    simulator.run()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
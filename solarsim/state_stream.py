@@ -0,0 +1,298 @@
+"""局域网状态广播：一个无窗口的模拟进程把天体位置推送给多个显示端
+
+用法:
+    python -m solarsim stream serve --port 8765           # 模拟并广播（只监听本机）
+    python -m solarsim stream serve --host 0.0.0.0        # 局域网内其他机器也可连接
+    python -m solarsim stream view --host 192.168.1.10    # 接收并渲染
+
+协议（TCP，小端）：每条消息是 FRAME_HEADER + 数据。
+    INFO      连接后首先发送，JSON：行星名称、小行星数、关键帧间隔
+    KEYFRAME  全部位置，float32 (N, 3)
+    DELTA     相对最近关键帧的位移，按本帧最大位移缩放后量化为 int16 (N, 3)，约为关键帧一半大小
+每个客户端有自己的有界发送队列：队列满时丢弃差量帧，关键帧到达时清空积压，
+慢客户端只会降低自己的帧率，模拟循环从不等待任何客户端。
+显示端与服务器须使用相同的场景（Config.SCENARIO），天体的半径、颜色等只在本地构造。
+协议没有认证，服务器默认只监听 127.0.0.1，须显式指定 --host 0.0.0.0 才对局域网开放。
+"""
+import argparse
+import asyncio
+import json
+import socket
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from solarsim.solar_system_simulator import Config, SolarSystem, SolarSystemSimulator
+
+# -------------------- 协议 --------------------
+# 数据字节数, 类型, 帧序号, 关键帧序号, 天体数, 差量缩放系数
+FRAME_HEADER = struct.Struct('<IBIIIf')
+INFO, KEYFRAME, DELTA = range(3)
+DEFAULT_PORT = 8765
+
+def _positions_buffer(solar_system):
+    return np.zeros((len(solar_system.planets) + solar_system.belt.count, 3), dtype=np.float32)
+
+def gather_positions(solar_system, out):
+    """行星在前、小行星带在后，写入预先分配的 float32 数组（太阳固定在原点，不发送）"""
+    for i, planet in enumerate(solar_system.planets):
+        out[i] = planet.x, planet.y, planet.z
+    out[len(solar_system.planets):] = solar_system.belt.positions
+    return out
+
+class FrameEncoder:
+    def __init__(self, count, keyframe_interval):
+        self.keyframe_interval = keyframe_interval
+        self.key = np.zeros((count, 3), dtype=np.float32)
+        self.delta = np.zeros((count, 3), dtype=np.float32)
+        self.quantized = np.zeros((count, 3), dtype=np.int16)
+        self.sequence = 0
+        self.key_sequence = 0
+
+    def encode(self, positions):
+        """返回 (消息字节, 是否关键帧)"""
+        sequence = self.sequence
+        self.sequence += 1
+        if sequence % self.keyframe_interval == 0:
+            self.key[:] = positions
+            self.key_sequence = sequence
+            header = FRAME_HEADER.pack(positions.nbytes, KEYFRAME, sequence, sequence, len(positions), 0.0)
+            return header + positions.tobytes(), True
+        delta = np.subtract(positions, self.key, out=self.delta)
+        peak = max(float(delta.max()), -float(delta.min())) if len(delta) else 0.0
+        scale = peak / 32767.0 or 1.0
+        delta *= 1.0 / scale
+        np.rint(delta, out=delta)
+        np.copyto(self.quantized, delta, casting='unsafe')
+        header = FRAME_HEADER.pack(self.quantized.nbytes, DELTA, sequence, self.key_sequence,
+                                   len(positions), scale)
+        return header + self.quantized.tobytes(), False
+
+class FrameDecoder:
+    def __init__(self, count):
+        self.key = np.zeros((count, 3), dtype=np.float32)
+        self.positions = np.zeros((count, 3), dtype=np.float32)
+        self.key_sequence = None
+        self.sequence = None
+
+    def decode(self, kind, sequence, key_sequence, scale, payload):
+        """更新 positions，返回是否得到了新的一帧"""
+        if kind == KEYFRAME:
+            self.key[:] = np.frombuffer(payload, dtype=np.float32).reshape(-1, 3)
+            self.positions[:] = self.key
+            self.key_sequence = sequence
+        elif kind == DELTA and key_sequence == self.key_sequence:
+            quantized = np.frombuffer(payload, dtype=np.int16).reshape(-1, 3)
+            np.multiply(quantized, scale, out=self.positions)
+            self.positions += self.key
+        else:
+            # 缺少对应的关键帧，等待下一个关键帧
+            return False
+        self.sequence = sequence
+        return True
+
+# -------------------- 服务器 --------------------
+class _Client:
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.address = writer.get_extra_info('peername')
+        self.queue = asyncio.Queue(queue_size)
+        self.sent = 0
+        self.dropped = 0
+
+    def push(self, message, keyframe):
+        if self.queue.full():
+            if not keyframe:
+                self.dropped += 1
+                return
+            # 关键帧使积压的旧帧全部失效
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+        self.queue.put_nowait(message)
+
+class StateServer:
+    """在 asyncio 事件循环中按固定帧率步进模拟，把每一步的状态推送到各客户端的队列"""
+    def __init__(self, solar_system, dt=1.0, fps=Config.FPS, keyframe_interval=30, queue_size=8):
+        self.solar_system = solar_system
+        self.dt = dt
+        self.fps = fps
+        self.queue_size = queue_size
+        self.positions = _positions_buffer(solar_system)
+        self.encoder = FrameEncoder(len(self.positions), keyframe_interval)
+        self.clients = set()
+        self.last_keyframe = None
+        self.info = json.dumps({
+            "planets": [planet.name for planet in solar_system.planets],
+            "belt": solar_system.belt.count,
+            "keyframe_interval": keyframe_interval,
+        }, ensure_ascii=False).encode('utf-8')
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, frames=None):
+        server = await asyncio.start_server(self._handle_client, host, port)
+        print(f"广播 {len(self.positions)} 个天体，监听 {host}:{port}")
+        async with server:
+            await self._simulate(frames)
+
+    async def _simulate(self, frames):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.fps
+        next_time = loop.time()
+        step = 0
+        while frames is None or step < frames:
+            self.solar_system.update(self.dt, False)
+            self.broadcast()
+            step += 1
+            next_time += period
+            now = loop.time()
+            # 落后超过一帧时不补帧，直接从当前时刻重新计时
+            if next_time < now - period:
+                next_time = now
+            await asyncio.sleep(max(0.0, next_time - now))
+
+    def broadcast(self):
+        message, keyframe = self.encoder.encode(gather_positions(self.solar_system, self.positions))
+        if keyframe:
+            self.last_keyframe = message
+        for client in self.clients:
+            client.push(message, keyframe)
+
+    async def _handle_client(self, reader, writer):
+        client = _Client(writer, self.queue_size)
+        # 缩小传输层缓冲，drain() 才能及时反映客户端的接收速度
+        writer.transport.set_write_buffer_limits(high=1 << 16)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        writer.write(FRAME_HEADER.pack(len(self.info), INFO, 0, 0, 0, 0.0) + self.info)
+        if self.last_keyframe:
+            client.push(self.last_keyframe, True)
+        self.clients.add(client)
+        print(f"客户端 {client.address} 已连接")
+        try:
+            while True:
+                message = await client.queue.get()
+                writer.write(message)
+                await writer.drain()
+                client.sent += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+            print(f"客户端 {client.address} 断开：发送 {client.sent} 帧，丢弃 {client.dropped} 帧")
+
+# -------------------- 显示端 --------------------
+def _recv_exact(sock, buffer):
+    view = memoryview(buffer)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            raise ConnectionError("服务器已断开")
+        view = view[received:]
+    return buffer
+
+class StateReceiver:
+    """后台线程接收并解码，渲染线程每帧取最新的一帧"""
+    def __init__(self, host, port=DEFAULT_PORT):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.header = bytearray(FRAME_HEADER.size)
+        size, kind, *_ = FRAME_HEADER.unpack(_recv_exact(self.sock, self.header))
+        if kind != INFO:
+            raise ConnectionError("服务器没有发送场景信息")
+        self.info = json.loads(_recv_exact(self.sock, bytearray(size)).decode('utf-8'))
+        count = len(self.info["planets"]) + self.info["belt"]
+        self.decoder = FrameDecoder(count)
+        self.payload = bytearray(count * 3 * 4)
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._receive, daemon=True)
+        self.thread.start()
+
+    def check_scene(self, solar_system):
+        if (self.info["planets"] != [planet.name for planet in solar_system.planets]
+                or self.info["belt"] != solar_system.belt.count):
+            raise ValueError("服务器与本地场景不一致，两端须使用相同的 Config.SCENARIO")
+
+    def _receive(self):
+        try:
+            while True:
+                size, kind, sequence, key_sequence, count, scale = FRAME_HEADER.unpack(
+                    _recv_exact(self.sock, self.header))
+                payload = _recv_exact(self.sock, memoryview(self.payload)[:size])
+                with self.lock:
+                    if self.decoder.decode(kind, sequence, key_sequence, scale, payload):
+                        self.frames += 1
+        except (ConnectionError, OSError) as error:
+            self.error = error
+
+    def copy_to(self, solar_system, last_sequence):
+        """有新帧时写入模拟状态并返回其序号，否则返回 last_sequence"""
+        with self.lock:
+            sequence = self.decoder.sequence
+            if sequence is None or sequence == last_sequence:
+                return last_sequence
+            positions = self.decoder.positions
+            for planet, (x, y, z) in zip(solar_system.planets, positions.tolist()):
+                planet.set_position(x, y, z)
+            solar_system.belt.positions[:] = positions[len(solar_system.planets):]
+        solar_system.bvh_dirty = True
+        return sequence
+
+    def close(self):
+        self.sock.close()
+
+class StreamViewer(SolarSystemSimulator):
+    """客户端模式：渲染接收到的状态，不再调用 SolarSystem.update"""
+    def __init__(self, receiver):
+        # 在打开窗口之前确认两端场景一致
+        receiver.check_scene(SolarSystem())
+        self.receiver = receiver
+        self.sequence = None
+        super().__init__()
+
+    def _update(self):
+        self.sequence = self.receiver.copy_to(self.solar_system, self.sequence)
+        if self.selection is not None:
+            self._follow_selection()
+
+def main():
+    parser = argparse.ArgumentParser(description="局域网状态广播")
+    parser.add_argument('mode', choices=('serve', 'view'))
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="serve: 监听地址，0.0.0.0 对局域网开放；view: 服务器地址")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--scenario', help="天体目录文件（见 scenario_catalog.py），两端须一致")
+    parser.add_argument('--fps', type=float, default=Config.FPS, help="serve: 模拟步进频率")
+    parser.add_argument('--dt', type=float, default=1.0, help="serve: 每步的模拟时间")
+    parser.add_argument('--keyframe', type=int, default=30, help="serve: 关键帧间隔（帧）")
+    parser.add_argument('--queue', type=int, default=8, help="serve: 每个客户端的队列长度")
+    parser.add_argument('--frames', type=int, help="serve: 步进这么多帧后退出")
+    args = parser.parse_args()
+    if args.scenario:
+        Config.SCENARIO = args.scenario
+
+    if args.mode == 'serve':
+        server = StateServer(SolarSystem(), args.dt, args.fps, args.keyframe, args.queue)
+        try:
+            asyncio.run(server.serve(args.host, args.port, args.frames))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    receiver = StateReceiver(args.host, args.port)
+    viewer = StreamViewer(receiver)
+    start = time.perf_counter()
+    viewer.run()
+    elapsed = time.perf_counter() - start
+    print(f"接收 {receiver.frames} 帧，平均 {receiver.frames / elapsed:.1f} 帧/秒")
+    receiver.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
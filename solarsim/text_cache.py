@@ -0,0 +1,93 @@
+from solarsim.lazy import pygame, GL
+from collections import OrderedDict
+
+# -------------------- 2D 覆盖层 --------------------
+def begin_overlay(width, height):
+    """切换到左上角为原点的像素坐标系，用于绘制文字和面板"""
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glPushMatrix()
+    GL.glLoadIdentity()
+    GL.glOrtho(0, width, height, 0, -1, 1)
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glPushMatrix()
+    GL.glLoadIdentity()
+    GL.glPushAttrib(GL.GL_ENABLE_BIT | GL.GL_CURRENT_BIT)
+    GL.glDisable(GL.GL_DEPTH_TEST)
+    GL.glDisable(GL.GL_LIGHTING)
+    GL.glEnable(GL.GL_BLEND)
+    GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+    GL.glEnable(GL.GL_TEXTURE_2D)
+    GL.glColor4f(1.0, 1.0, 1.0, 1.0)
+
+def end_overlay():
+    GL.glPopAttrib()
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glPopMatrix()
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glPopMatrix()
+
+# -------------------- 文字纹理缓存 --------------------
+class TextTexture:
+    def __init__(self, surface):
+        self.width, self.height = surface.get_size()
+        self.texture = GL.glGenTextures(1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA, self.width, self.height, 0,
+                        GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, pygame.image.tostring(surface, "RGBA"))
+
+    def draw(self, x, y):
+        """以 (x, y) 为左上角绘制纹理四边形，需在 begin_overlay 之后调用"""
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        GL.glBegin(GL.GL_QUADS)
+        GL.glTexCoord2f(0, 0); GL.glVertex2f(x, y)
+        GL.glTexCoord2f(1, 0); GL.glVertex2f(x + self.width, y)
+        GL.glTexCoord2f(1, 1); GL.glVertex2f(x + self.width, y + self.height)
+        GL.glTexCoord2f(0, 1); GL.glVertex2f(x, y + self.height)
+        GL.glEnd()
+
+    def delete(self):
+        GL.glDeleteTextures([self.texture])
+
+class TextCache:
+    """按 (文字, 字体, 颜色) 缓存已渲染的纹理，超过容量时淘汰最久未使用的条目"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key, build_surface):
+        """取出 key 对应的纹理；未命中时调用 build_surface() 生成表面并上传"""
+        texture = self.entries.get(key)
+        if texture is not None:
+            self.entries.move_to_end(key)
+            return texture
+        texture = TextTexture(build_surface())
+        self.entries[key] = texture
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)[1].delete()
+        return texture
+
+    def text(self, text, font, color=(255, 255, 255)):
+        return self.get((text, font, color), lambda: font.render(text, True, color))
+
+    def draw_text(self, text, font, x, y, color=(255, 255, 255)):
+        texture = self.text(text, font, color)
+        texture.draw(x, y)
+        return texture
+
+    def draw_glyphs(self, text, font, x, y, color=(255, 255, 255)):
+        """逐字符绘制，每个字符单独缓存；用于每帧都在变化的数值，缓存条目数只取决于字符集
+
+        返回绘制结束处的 x 坐标
+        """
+        for char in text:
+            x += self.draw_text(char, font, x, y, color).width
+        return x
+
+    def clear(self):
+        for texture in self.entries.values():
+            texture.delete()
+        self.entries.clear()
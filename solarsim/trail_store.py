@@ -0,0 +1,124 @@
+import math
+import numpy as np
+
+# -------------------- 自适应轨迹 --------------------
+class TrailLevel:
+    """单一分辨率的轨迹环形缓冲：只在路径偏离直线超过角度容差时保留采样点"""
+    def __init__(self, capacity, tolerance):
+        self.capacity = capacity
+        self.cos_tolerance = math.cos(tolerance)
+        self.points = np.zeros((capacity, 3), dtype=np.float32)
+        self.stamps = np.zeros(capacity, dtype=np.int64)
+        self.start = 0
+        self.count = 0
+        self.anchor = None      # 最近一个保留的点
+        self.direction = None   # 从 anchor 出发的当前线段方向
+        self.head = None        # 最新采样点，尚未决定是否保留
+        self.head_stamp = 0
+
+    def append(self, point, stamp):
+        if self.anchor is None:
+            self._commit(point, stamp)
+            return
+        dx, dy, dz = point[0] - self.anchor[0], point[1] - self.anchor[1], point[2] - self.anchor[2]
+        length = math.sqrt(dx*dx + dy*dy + dz*dz)
+        if length == 0.0:
+            return
+        direction = (dx / length, dy / length, dz / length)
+        if self.direction is None:
+            self.direction = direction
+        elif (direction[0] * self.direction[0] + direction[1] * self.direction[1]
+              + direction[2] * self.direction[2]) < self.cos_tolerance:
+            # 偏离超过容差：上一个采样点成为新的折点
+            self._commit(self.head, self.head_stamp)
+            hx, hy, hz = point[0] - self.anchor[0], point[1] - self.anchor[1], point[2] - self.anchor[2]
+            length = math.sqrt(hx*hx + hy*hy + hz*hz) or 1.0
+            self.direction = (hx / length, hy / length, hz / length)
+        self.head = point
+        self.head_stamp = stamp
+
+    def _commit(self, point, stamp):
+        index = (self.start + self.count) % self.capacity
+        self.points[index] = point
+        self.stamps[index] = stamp
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self.anchor = point
+        self.direction = None
+        self.head = None
+
+    def oldest_stamp(self):
+        return self.stamps[self.start] if self.count else None
+
+    def ordered(self):
+        """按时间顺序返回 (点, 时间戳)，不含尚未保留的 head"""
+        order = (self.start + np.arange(self.count)) % self.capacity
+        return self.points[order], self.stamps[order]
+
+class AdaptiveTrail:
+    """多分辨率自适应轨迹
+
+    每一级接收全部采样，但角度容差依次放大 level_factor 倍，因此在相同容量下
+    越粗的级别覆盖越长的历史。绘制时近期部分取细级别、更早的部分依次取粗级别拼接，
+    顶点数和内存都以 levels * capacity 为上限。
+    """
+    def __init__(self, capacity=4096, tolerance=0.02, levels=4, level_factor=2.5):
+        self.tolerances = [tolerance * level_factor ** k for k in range(levels)]
+        self.levels = [TrailLevel(capacity, t) for t in self.tolerances]
+        self.stamp = 0
+        self.last = None
+        self._cache = (None, None)   # ((最细级别, 时间戳), 顶点)，暂停时每帧绘制不必重新拼接
+
+    def __len__(self):
+        return self.stamp
+
+    def append(self, point):
+        point = (float(point[0]), float(point[1]), float(point[2]))
+        for level in self.levels:
+            level.append(point, self.stamp)
+        self.stamp += 1
+        self.last = point
+
+    def level_for(self, pixel_size, curvature_radius):
+        """选择屏幕上看不出折线的最粗级别
+
+        半径为 R 的圆弧按转角 θ 分段时，弦高约为 R·θ²/8，不超过一个像素即可。
+        """
+        level = 0
+        for k, tolerance in enumerate(self.tolerances):
+            if curvature_radius * tolerance * tolerance / 8.0 <= pixel_size:
+                level = k
+        return level
+
+    def vertices(self, finest_level=0):
+        """拼接各级别，返回按时间顺序的 (N, 3) float32 顶点数组
+
+        finest_level 越大越粗，用于缩小视图时减少顶点数。
+        """
+        key = (finest_level, self.stamp)
+        if self._cache[0] == key:
+            return self._cache[1]
+        vertices = self._stitch(finest_level)
+        self._cache = (key, vertices)
+        return vertices
+
+    def _stitch(self, finest_level):
+        pieces = []
+        newer_start = None
+        for level in self.levels[finest_level:]:
+            points, stamps = level.ordered()
+            if newer_start is not None:
+                points = points[stamps < newer_start]
+            if len(points):
+                pieces.append(points)
+            oldest = level.oldest_stamp()
+            if oldest is not None:
+                newer_start = oldest if newer_start is None else min(newer_start, oldest)
+        pieces.reverse()
+        if self.last is not None:
+            pieces.append(np.array([self.last], dtype=np.float32))
+        if not pieces:
+            return np.zeros((0, 3), dtype=np.float32)
+        return np.ascontiguousarray(np.concatenate(pieces))
@@ -0,0 +1,333 @@
+"""积分器与引力求解器的精度-开销基准
+
+对每个标准场景，在 积分器 × 时间步长 × 引力求解器 的组合上运行，记录：
+    能量误差   max |E(t) - E0| / |E0|
+    位置误差   终态相对高精度参考解（RK4 + 直接求和 + 更小步长）的均方根偏差 / 场景尺度
+    耗时       墙钟时间
+并输出精度-开销表（可选 matplotlib 图），用于选出满足精度目标的最便宜配置。
+
+用法:
+    python -m solarsim work-precision              # 全部场景
+    python -m solarsim work-precision --scenario planets --target 1e-4 --plot planets.png
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+from solarsim.pm_gravity import pm_accel, p3m_accel, uniform_cloud
+
+# -------------------- 场景 --------------------
+class Scenario:
+    def __init__(self, name, positions, velocities, masses, G, duration, steps, scale,
+                 softening=0.0, central_rs=0.0, solvers=None):
+        self.name = name
+        self.positions = np.asarray(positions, dtype=np.float64)
+        self.velocities = np.asarray(velocities, dtype=np.float64)
+        self.masses = np.asarray(masses, dtype=np.float64)
+        self.G = G
+        self.duration = duration
+        self.steps = steps            # 测试的时间步长
+        self.scale = scale            # 位置误差的归一化尺度
+        self.softening = softening
+        self.central_rs = central_rs  # 0 号天体与其他天体之间的相对论修正 (1 + 3 rs / r)，0 表示纯牛顿
+        self.solvers = solvers or list(SOLVERS)
+        self.cache = {}               # 求解器与场景相关的预计算结果（如 PM 网格）
+
+def planets_scenario():
+    """Config.PLANET_PARAMS 的六颗行星与太阳，彼此之间也有引力
+
+    以地球轨道 (r = 150, ω = 0.01) 定出 GM☉，行星质量按与太阳的质量比换算，初速为圆轨道速度。
+    """
+    from solarsim.solar_system_simulator import Config
+    sun_mass = 1.989e30
+    gm_sun = 0.01 ** 2 * 150.0 ** 3
+    positions, velocities, masses = [[0.0, 0.0, 0.0]], [[0.0, 0.0, 0.0]], [gm_sun]
+    for distance, _, _, mass, _, inclination, _ in Config.PLANET_PARAMS:
+        incl = math.radians(inclination)
+        speed = math.sqrt(gm_sun / distance)
+        positions.append([distance, 0.0, 0.0])
+        velocities.append([0.0, speed * math.cos(incl), speed * math.sin(incl)])
+        masses.append(gm_sun * mass / sun_mass)
+    # 抵消太阳的初始动量，使质心静止
+    masses = np.array(masses)
+    velocities = np.array(velocities)
+    velocities[0] = -(masses[1:, None] * velocities[1:]).sum(axis=0) / masses[0]
+    return Scenario("planets", positions, velocities, masses, G=1.0, duration=2000.0,
+                    steps=[4.0, 2.0, 1.0, 0.5, 0.25], scale=150.0, solvers=['direct', 'central'])
+
+def black_hole_scenario(seed=0):
+    """黑洞场景：半径 30 的黑洞、四颗行星和 15 个光子
+
+    原脚本的质量和引力常数组合会让行星直接飞出，这里按水星初速恰为圆轨道速度定出 GM，
+    力的形式保持脚本中的 GM/r² · (1 + 3 rs / r)。光子改为带 40~200 的冲击参数掠过黑洞，
+    以免落入奇点。
+    """
+    rng = np.random.default_rng(seed)
+    gm = 2.0 ** 2 * 120.0
+    positions, velocities, masses = [[0.0, 0.0, 0.0]], [[0.0, 0.0, 0.0]], [gm]
+    for distance, speed, mass in ((120, 2.0, 3.3e23), (180, 1.6, 4.87e24),
+                                  (250, 1.3, 5.97e24), (320, 1.1, 6.42e23)):
+        positions.append([distance, 0.0, 0.0])
+        velocities.append([0.0, 0.0, speed])
+        masses.append(gm * mass / 1e31)
+    for i in range(15):
+        angle = i * math.pi / 7
+        inward = -np.array([math.cos(angle), 0.0, math.sin(angle)])
+        across = np.array([-inward[2], 0.0, inward[0]])
+        positions.append(list(-400.0 * inward + rng.uniform(40, 200) * across))
+        velocities.append(list(4.0 * inward))
+        masses.append(1e-10)
+    return Scenario("black_hole", positions, velocities, masses, G=1.0, duration=200.0,
+                    steps=[1.0, 0.5, 0.25, 0.125], scale=120.0, softening=1.0, central_rs=3.0,
+                    solvers=['direct', 'central'])
+
+def plummer_scenario(count=64, seed=0):
+    """Plummer 球星团（Aarseth, Hénon & Wielen 1974 采样），N 体单位 G = M = 1"""
+    rng = np.random.default_rng(seed)
+    a = 3.0 * math.pi / 16.0
+    radius = a / np.sqrt(rng.uniform(0, 1, count) ** (-2.0 / 3.0) - 1.0)
+    positions = radius[:, None] * _random_unit(rng, count)
+    # 速度大小按 q² (1 - q²)^3.5 的分布拒绝采样
+    q = np.empty(count)
+    filled = 0
+    while filled < count:
+        x, y = rng.uniform(0, 1, count), rng.uniform(0, 0.1, count)
+        accepted = x[y < x * x * (1 - x * x) ** 3.5][:count - filled]
+        q[filled:filled + len(accepted)] = accepted
+        filled += len(accepted)
+    escape = np.sqrt(2.0) * (1.0 + (radius / a) ** 2) ** -0.25 / math.sqrt(a)
+    velocities = (q * escape)[:, None] * _random_unit(rng, count)
+    positions -= positions.mean(axis=0)
+    velocities -= velocities.mean(axis=0)
+    return Scenario("plummer", positions, velocities, np.full(count, 1.0 / count), G=1.0,
+                    duration=2.0, steps=[0.02, 0.01, 0.005, 0.0025], scale=1.0,
+                    softening=0.01, solvers=['direct'])
+
+def cloud_scenario(count=1000, seed=0):
+    """均匀球内的稠密粒子云（PM/P3M 面向的分布），N 体单位 G = M = R = 1
+
+    速度为各向同性高斯分布，动能取均匀球势能 -3GM²/5R 的一半（位力平衡）。
+    PM 和 P3M 的力不是由一个守恒的势导出的，它们的能量误差同时包含力的近似误差。
+    """
+    positions, masses = uniform_cloud(count, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    velocities = rng.normal(0.0, math.sqrt(0.2), (count, 3))
+    positions -= positions.mean(axis=0)
+    velocities -= velocities.mean(axis=0)
+    return Scenario("cloud", positions, velocities, masses, G=1.0, duration=0.5,
+                    steps=[0.05, 0.025, 0.0125], scale=1.0, softening=0.05,
+                    solvers=['direct', 'pm', 'p3m'])
+
+def _random_unit(rng, count):
+    v = rng.normal(size=(count, 3))
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+SCENARIOS = {
+    'planets': planets_scenario,
+    'black_hole': black_hole_scenario,
+    'plummer': plummer_scenario,
+    'cloud': cloud_scenario,
+}
+
+# -------------------- 引力求解器 --------------------
+def _pair_terms(positions, scenario):
+    diff = positions[None, :, :] - positions[:, None, :]   # diff[i, j] = x_j - x_i
+    r2 = np.einsum('ijk,ijk->ij', diff, diff) + scenario.softening ** 2
+    np.fill_diagonal(r2, np.inf)
+    return diff, r2
+
+def direct_accel(positions, scenario):
+    """O(N²) 直接求和"""
+    diff, r2 = _pair_terms(positions, scenario)
+    weight = scenario.G * scenario.masses[None, :] * r2 ** -1.5
+    if scenario.central_rs:
+        # 修正作用在 0 号天体与其他天体的每一对上，双方受力等大反向，动量和能量守恒
+        factor = 1.0 + 3.0 * scenario.central_rs / np.sqrt(r2[:, 0])
+        weight[:, 0] *= factor
+        weight[0, :] *= factor
+    return np.einsum('ij,ijk->ik', weight, diff)
+
+def central_accel(positions, scenario):
+    """只计算 0 号中心天体的引力（与 relativity 脚本相同），中心天体保持不动（run 中速度置零）"""
+    diff = positions[0] - positions
+    r2 = np.einsum('ij,ij->i', diff, diff) + scenario.softening ** 2
+    r2[0] = np.inf
+    weight = scenario.G * scenario.masses[0] * r2 ** -1.5
+    if scenario.central_rs:
+        weight *= 1.0 + 3.0 * scenario.central_rs / np.sqrt(r2)
+    return weight[:, None] * diff
+
+SOLVERS = {
+    'direct': direct_accel,
+    'central': central_accel,
+    'pm': pm_accel,
+    'p3m': p3m_accel,
+}
+
+def energy(positions, velocities, scenario):
+    """总能量；势能与 direct_accel 的力一致（含中心天体的 -1.5·GMm·rs/r² 修正项）"""
+    kinetic = 0.5 * np.sum(scenario.masses * np.einsum('ij,ij->i', velocities, velocities))
+    _, r2 = _pair_terms(positions, scenario)
+    r = np.sqrt(r2)
+    pair_mass = scenario.G * scenario.masses[:, None] * scenario.masses[None, :]
+    potential = -pair_mass / r
+    if scenario.central_rs:
+        potential[:, 0] -= 1.5 * pair_mass[:, 0] * scenario.central_rs / r2[:, 0]
+        potential[0, :] = potential[:, 0]
+    return kinetic + 0.5 * np.sum(potential[np.isfinite(potential)])
+
+def central_energy(positions, velocities, scenario):
+    """与 central_accel 一致的能量：中心天体固定不动，只有各天体在其引力场中的动能和势能"""
+    masses = scenario.masses[1:]
+    kinetic = 0.5 * np.sum(masses * np.einsum('ij,ij->i', velocities[1:], velocities[1:]))
+    diff = positions[1:] - positions[0]
+    r2 = np.einsum('ij,ij->i', diff, diff) + scenario.softening ** 2
+    pair_mass = scenario.G * scenario.masses[0] * masses
+    potential = -pair_mass / np.sqrt(r2)
+    if scenario.central_rs:
+        potential -= 1.5 * pair_mass * scenario.central_rs / r2
+    return kinetic + np.sum(potential)
+
+# 能量须与求解器的力模型一致，否则能量误差反映的是模型差异而不是积分误差
+ENERGIES = {
+    'central': central_energy,
+}
+
+# -------------------- 积分器 --------------------
+def euler(x, v, accel, dt):
+    """半隐式欧拉（两个模拟脚本使用的方式）：先更新速度再更新位置"""
+    v = v + accel(x) * dt
+    return x + v * dt, v
+
+def leapfrog(x, v, accel, dt):
+    """KDK 蛙跳"""
+    v = v + 0.5 * dt * accel(x)
+    x = x + dt * v
+    return x, v + 0.5 * dt * accel(x)
+
+def rk4(x, v, accel, dt):
+    a1 = accel(x)
+    x2, v2 = x + 0.5 * dt * v, v + 0.5 * dt * a1
+    a2 = accel(x2)
+    x3, v3 = x + 0.5 * dt * v2, v + 0.5 * dt * a2
+    a3 = accel(x3)
+    x4, v4 = x + dt * v3, v + dt * a3
+    a4 = accel(x4)
+    return (x + dt / 6.0 * (v + 2 * v2 + 2 * v3 + v4),
+            v + dt / 6.0 * (a1 + 2 * a2 + 2 * a3 + a4))
+
+INTEGRATORS = {
+    'euler': euler,
+    'leapfrog': leapfrog,
+    'rk4': rk4,
+}
+
+def run(scenario, integrator, solver, dt, energy_samples=100):
+    """返回 (终态位置, 最大相对能量误差, 墙钟时间)"""
+    step = INTEGRATORS[integrator]
+    force = SOLVERS[solver]
+    accel = lambda x: force(x, scenario)
+    steps = max(1, int(round(scenario.duration / dt)))
+    sample_every = max(1, steps // energy_samples)
+    x, v = scenario.positions.copy(), scenario.velocities.copy()
+    energy_of = ENERGIES.get(solver, energy)
+    if solver == 'central':
+        v[0] = 0.0
+    e0 = energy_of(x, v, scenario)
+    worst = 0.0
+    elapsed = 0.0
+    for i in range(steps):
+        start = time.perf_counter()
+        x, v = step(x, v, accel, dt)
+        elapsed += time.perf_counter() - start
+        if (i + 1) % sample_every == 0:
+            worst = max(worst, abs(energy_of(x, v, scenario) - e0) / abs(e0))
+    return x, worst, elapsed
+
+# -------------------- 精度-开销表 --------------------
+def benchmark(scenario, integrators, reference_factor=8):
+    dt_ref = min(scenario.steps) / reference_factor
+    print(f"\n== {scenario.name}: {len(scenario.masses)} 个天体，时长 {scenario.duration}，"
+          f"参考解 rk4/direct dt={dt_ref:g}")
+    reference, _, _ = run(scenario, 'rk4', 'direct', dt_ref)
+
+    rows = []
+    print(f"{'积分器':<10}{'求解器':<9}{'dt':>9}{'耗时(s)':>11}{'能量误差':>12}{'位置误差':>12}")
+    for integrator in integrators:
+        for solver in scenario.solvers:
+            for dt in scenario.steps:
+                x, energy_error, elapsed = run(scenario, integrator, solver, dt)
+                position_error = float(np.sqrt(np.mean(np.sum((x - reference) ** 2, axis=1)))
+                                       / scenario.scale)
+                rows.append({"scenario": scenario.name, "integrator": integrator, "solver": solver,
+                             "dt": dt, "time": elapsed, "energy_error": energy_error,
+                             "position_error": position_error})
+                print(f"{integrator:<10}{solver:<9}{dt:>9g}{elapsed:>11.3f}"
+                      f"{energy_error:>12.2e}{position_error:>12.2e}")
+    return rows
+
+def cheapest(rows, target, key='position_error'):
+    """满足精度目标的最省时配置"""
+    feasible = [row for row in rows if row[key] <= target]
+    return min(feasible, key=lambda row: row["time"]) if feasible else None
+
+def plot(rows, path):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("未安装 matplotlib，跳过绘图（pip install matplotlib）")
+        return
+    scenarios = sorted({row["scenario"] for row in rows})
+    figure, axes = plt.subplots(1, len(scenarios), figsize=(6 * len(scenarios), 5), squeeze=False)
+    for axis, name in zip(axes[0], scenarios):
+        groups = {}
+        for row in rows:
+            if row["scenario"] == name:
+                groups.setdefault((row["integrator"], row["solver"]), []).append(row)
+        for (integrator, solver), group in sorted(groups.items()):
+            axis.loglog([r["time"] for r in group], [max(r["position_error"], 1e-16) for r in group],
+                        'o-', label=f"{integrator}/{solver}")
+        axis.set_title(name)
+        axis.set_xlabel("wall time (s)")
+        axis.set_ylabel("position error")
+        axis.grid(True, which='both', alpha=0.3)
+        axis.legend()
+    figure.tight_layout()
+    figure.savefig(path, dpi=120)
+    print(f"精度-开销图已保存到 {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="积分器与引力求解器的精度-开销基准")
+    parser.add_argument('--scenario', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--integrator', nargs='+', choices=list(INTEGRATORS), default=list(INTEGRATORS))
+    parser.add_argument('--target', type=float, default=1e-3, help="位置误差目标")
+    parser.add_argument('--out', help="结果 JSON 路径")
+    parser.add_argument('--plot', help="精度-开销图路径（需要 matplotlib）")
+    args = parser.parse_args()
+
+    rows = []
+    for name in args.scenario:
+        scenario_rows = benchmark(SCENARIOS[name](), args.integrator)
+        rows += scenario_rows
+        best = cheapest(scenario_rows, args.target)
+        if best:
+            print(f"满足位置误差 ≤ {args.target:g} 的最省时配置: {best['integrator']}/{best['solver']} "
+                  f"dt={best['dt']:g}（{best['time']:.3f}s）")
+        else:
+            print(f"没有配置满足位置误差 ≤ {args.target:g}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    if args.plot:
+        plot(rows, args.plot)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())